@@ -0,0 +1,574 @@
+"""
+Uji beban sesi bersamaan terhadap server Streamlit sungguhan: main.py
+dijalankan dengan `streamlit run` (headless) di proses terpisah, lalu N
+pengguna virtual tersambung lewat websocket seperti browser dan menjalankan
+alur halaman. Semua sesi berbagi satu proses server (thread per sesi, cache &
+resource bersama), persis seperti di produksi.
+
+Skenario (alur pengguna):
+- analisis: buka halaman analisis, ganti tahun / rincian / ukuran
+- prediksi: geser slider 1-7 hari, jalankan prediksi, tunggu grafik tampil
+- sentimen_teks: analisis satu teks
+- sentimen_csv: unggah CSV kecil, jalankan job analisis, tunggu hasil tampil
+- campuran: tiap pengguna memilih alur acak dengan bobot CAMPURAN
+
+Tiap skenario dijalankan bergantian selama --durasi detik. Laporan per
+skenario: latensi rerun akibat interaksi (p50/p95/p99), waktu sampai hasil
+job tampil, CPU dan RSS (rata-rata & puncak) proses server beserta worker
+anaknya. Polling fragment (run_every) dicatat terpisah dari persentil rerun.
+
+Klien hanya mengerti bagian protokol yang dipakai halaman aplikasi ini
+(radio, selectbox, slider, text_area, button, file_uploader, fragment).
+
+Jalankan dari root repo (skenario sentimen butuh folder model_nlp):
+    python -m benchmarks.bench_beban
+    python -m benchmarks.bench_beban --pengguna 16 --durasi 60 --skenario analisis campuran
+    APP_WARMUP=1 python -m benchmarks.bench_beban --simpan benchmarks/beban_history.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import psutil
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient
+from tornado.websocket import websocket_connect
+
+from benchmarks.bench_sentiment import teks_sintetis
+
+HALAMAN = {
+    "analisis": "Analisis Data Historis",
+    "prediksi": "Prediksi Jumlah Permohonan",
+    "sentimen": "Analisis Sentimen",
+}
+SKENARIO_SENTIMEN = ["sentimen_teks", "sentimen_csv"]
+SKENARIO = ["analisis", "prediksi"] + SKENARIO_SENTIMEN + ["campuran"]
+# Perkiraan porsi alur pada pemakaian nyata (paling banyak melihat analisis)
+CAMPURAN = {"analisis": 0.45, "prediksi": 0.3, "sentimen_teks": 0.2, "sentimen_csv": 0.05}
+BARIS_CSV = 200
+INTERVAL_POLLING = 0.5
+INTERVAL_SAMPEL = 0.2
+
+
+# ============================================================
+# 1. SERVER
+# ============================================================
+class Server:
+    """`streamlit run main.py` di port bebas; log server ditulis ke file sementara."""
+
+    def __init__(self, batas=120):
+        self.batas = batas
+
+    def __enter__(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.log = tempfile.NamedTemporaryFile("w+", suffix=".log", prefix="bench_beban-")
+        self.proses = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", "main.py",
+                "--server.headless", "true", "--server.port", str(self.port),
+                "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+                # Klien uji mengunggah file tanpa cookie XSRF
+                "--server.enableXsrfProtection", "false",
+            ],
+            stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        akhir = time.time() + self.batas
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=2) as r:
+                    if r.read() == b"ok":
+                        return self
+            except OSError:
+                pass
+            if self.proses.poll() is not None or time.time() > akhir:
+                self.__exit__()
+                raise RuntimeError(f"Server Streamlit tidak bisa dijalankan:\n{self.ekor_log()}")
+            time.sleep(0.5)
+
+    def ekor_log(self, n=20):
+        self.log.seek(0)
+        return "".join(self.log.readlines()[-n:])
+
+    def __exit__(self, *exc):
+        self.proses.terminate()
+        try:
+            self.proses.wait(30)
+        except subprocess.TimeoutExpired:
+            self.proses.kill()
+        self.log.close()
+
+
+# ============================================================
+# 2. KLIEN (SATU SESI BROWSER)
+# ============================================================
+class Klien:
+    """
+    Sesi browser minimal: menyimpan elemen hasil run terakhir, nilai widget
+    (dikirim ulang tiap rerun seperti browser) dan fragment run_every.
+    """
+
+    def __init__(self, alamat, catatan, batas):
+        self.alamat = alamat
+        self.catatan = catatan
+        self.batas = batas
+        self.alur = None
+        self.ws = None
+        self.session_id = None
+        self.halaman = None
+        self.elemen = {}
+        self.nilai = {}
+        self.fragment = {}
+        self._simpanan = {}
+        self._hasil = None
+        self._urls = {}
+
+    async def sambung(self):
+        self.ws = await websocket_connect(f"ws://{self.alamat}/_stcore/stream")
+        self._pembaca = asyncio.ensure_future(self._baca())
+        self.halaman = HALAMAN["analisis"]
+        await self.rerun("buka")
+
+    def tutup(self):
+        if self.ws is not None:
+            self.ws.close()
+            self.ws = None
+
+    async def _baca(self):
+        ws = self.ws
+        while True:
+            data = await ws.read_message()
+            if data is None:
+                if self._hasil is not None and not self._hasil.done():
+                    self._hasil.set_exception(ConnectionError("websocket server terputus"))
+                return
+            self._proses(ForwardMsg.FromString(data))
+
+    def _proses(self, msg):
+        meta = msg.metadata
+        if msg.WhichOneof("type") == "ref_hash":
+            # Pesan besar yang pernah dikirim ke sesi ini hanya dikirim ulang sebagai hash
+            msg = self._simpanan[msg.ref_hash]
+        elif meta.cacheable:
+            self._simpanan[msg.hash] = msg
+
+        jenis = msg.WhichOneof("type")
+        if jenis == "new_session":
+            self.session_id = msg.new_session.initialize.session_id
+            if not msg.new_session.fragment_ids_this_run:
+                self.elemen, self.fragment = {}, {}
+        elif jenis == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            self.elemen[tuple(meta.delta_path)] = msg.delta.new_element
+        elif jenis == "auto_rerun":
+            self.fragment[msg.auto_rerun.fragment_id] = msg.auto_rerun.interval
+        elif jenis == "script_finished":
+            # Run yang dihentikan untuk rerun (mis. st.rerun di fragment) belum selesai
+            if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN and self._hasil and not self._hasil.done():
+                self._hasil.set_result(msg.script_finished)
+        elif jenis == "file_urls_response":
+            fut = self._urls.pop(msg.file_urls_response.response_id, None)
+            if fut is not None:
+                fut.set_result(msg.file_urls_response)
+
+    async def _kirim(self, pesan):
+        await self.ws.write_message(pesan.SerializeToString(), binary=True)
+
+    async def rerun(self, jenis="interaksi", picu=None, fragment_id=""):
+        """Kirim rerun_script dan tunggu script_finished; pengecualian di skrip dianggap error."""
+        pesan = BackMsg()
+        state = pesan.rerun_script
+        state.widget_states.widgets.extend(self.nilai.values())
+        if picu is not None:
+            state.widget_states.widgets.add(id=picu.id, trigger_value=True)
+        state.fragment_id = fragment_id
+        state.is_auto_rerun = bool(fragment_id)
+
+        self._hasil = asyncio.get_running_loop().create_future()
+        mulai = time.perf_counter()
+        await self._kirim(pesan)
+        await asyncio.wait_for(self._hasil, self.batas)
+        self.catatan.tambah(self.alur, jenis, time.perf_counter() - mulai)
+
+        galat = [e.exception.message for e in self.elemen.values() if e.WhichOneof("type") == "exception"]
+        if galat:
+            raise RuntimeError(galat[0])
+
+    async def tunggu(self, selesai):
+        """Polling seperti browser (fragment run_every, atau rerun penuh) sampai selesai()."""
+        mulai = time.perf_counter()
+        while not selesai():
+            if time.perf_counter() - mulai > self.batas:
+                raise TimeoutError("hasil tidak tampil dalam batas waktu")
+            fragment_id, interval = next(iter(self.fragment.items()), ("", INTERVAL_POLLING))
+            await asyncio.sleep(interval)
+            await self.rerun("polling", fragment_id=fragment_id)
+
+    async def unggah(self, uploader, nama, isi):
+        """Alur file_uploader browser: minta URL, PUT multipart, lalu set state widget."""
+        pesan = BackMsg()
+        pesan.file_urls_request.request_id = uuid.uuid4().hex
+        pesan.file_urls_request.file_names.append(nama)
+        pesan.file_urls_request.session_id = self.session_id
+        fut = self._urls[pesan.file_urls_request.request_id] = asyncio.get_running_loop().create_future()
+        await self._kirim(pesan)
+        urls = (await asyncio.wait_for(fut, self.batas)).file_urls[0]
+
+        batas = uuid.uuid4().hex
+        body = (
+            f'--{batas}\r\nContent-Disposition: form-data; name="file"; filename="{nama}"\r\n'
+            f"Content-Type: text/csv\r\n\r\n"
+        ).encode() + isi + f"\r\n--{batas}--\r\n".encode()
+        await AsyncHTTPClient().fetch(
+            f"http://{self.alamat}{urls.upload_url}", method="PUT", body=body,
+            headers={"Content-Type": f"multipart/form-data; boundary={batas}"},
+        )
+
+        state = WidgetState(id=uploader.id)
+        info = state.file_uploader_state_value.uploaded_file_info.add(file_id=urls.file_id, name=nama, size=len(isi))
+        info.file_urls.CopyFrom(urls)
+        self.nilai[uploader.id] = state
+
+    # --- membaca & mengubah halaman ---
+    def _jenis(self, jenis):
+        return [getattr(e, jenis) for _, e in sorted(self.elemen.items()) if e.WhichOneof("type") == jenis]
+
+    def widget(self, jenis, label=""):
+        return [w for w in self._jenis(jenis) if w.label.startswith(label)]
+
+    def ada(self, jenis):
+        return bool(self._jenis(jenis))
+
+    def markdown(self):
+        return [m.body for m in self._jenis("markdown")]
+
+    def alert(self, format):
+        return [a.body for a in self._jenis("alert") if a.format == format]
+
+    def atur(self, widget, **nilai):
+        self.nilai[widget.id] = WidgetState(id=widget.id, **nilai)
+
+    async def buka(self, nama):
+        if self.ws is None:
+            await self.sambung()
+        if self.halaman != HALAMAN[nama]:
+            radio = self.widget("radio")[0]
+            self.atur(radio, int_value=list(radio.options).index(HALAMAN[nama]))
+            self.halaman = HALAMAN[nama]
+            await self.rerun()
+
+
+# ============================================================
+# 3. ALUR PENGGUNA
+# ============================================================
+async def alur_analisis(k, rng):
+    await k.buka("analisis")
+    # Tahun, Rincian, Ukuran: masing-masing satu interaksi
+    kotak = k.widget("selectbox")
+    for i in rng.permutation(len(kotak)):
+        k.atur(kotak[i], int_value=int(rng.integers(len(kotak[i].options))))
+        await k.rerun()
+
+
+async def alur_prediksi(k, rng):
+    await k.buka("prediksi")
+    k.atur(k.widget("slider")[0], double_array_value={"data": [int(rng.integers(1, 8))]})
+    await k.rerun()
+    mulai = time.perf_counter()
+    await k.rerun(picu=k.widget("button", "🚀")[0])
+    await k.tunggu(lambda: k.ada("plotly_chart"))
+    k.catatan.tambah(k.alur, "hasil", time.perf_counter() - mulai)
+
+
+def _model_siap(k):
+    galat = k.alert(Alert.ERROR)
+    assert not galat, galat
+    return k.ada("text_area")
+
+
+async def alur_sentimen_teks(k, rng):
+    await k.buka("sentimen")
+    await k.tunggu(lambda: _model_siap(k))
+    # Teks baru tiap kali agar tidak selalu diambil dari cache sentimen
+    teks = f"{teks_sintetis(1, seed=int(rng.integers(2**31)))[0]} {time.time_ns()}"
+    k.atur(k.widget("text_area")[0], string_value=teks)
+    await k.rerun()
+    await k.rerun(picu=k.widget("button", "🔍")[0])
+    assert any("Prediksi Sentimen" in m for m in k.markdown()), "hasil sentimen tidak tampil"
+
+
+async def alur_sentimen_csv(k, rng):
+    await k.buka("sentimen")
+    await k.tunggu(lambda: _model_siap(k))
+
+    # Separuh teks berulang antar pengguna (cache sentimen), separuh baru
+    teks = teks_sintetis(BARIS_CSV, seed=int(rng.integers(4)))[: BARIS_CSV // 2]
+    teks += teks_sintetis(BARIS_CSV - len(teks), seed=int(rng.integers(2**31)))
+    isi = pd.DataFrame({"ulasan": teks}).to_csv(index=False).encode()
+    await k.unggah(k.widget("file_uploader")[0], "ulasan.csv", isi)
+    await k.rerun()
+
+    mulai = time.perf_counter()
+    await k.rerun(picu=k.widget("button", "🚀")[0])
+    await k.tunggu(lambda: any("Analisis selesai" in a for a in k.alert(Alert.SUCCESS)))
+    k.catatan.tambah(k.alur, "hasil", time.perf_counter() - mulai)
+
+
+ALUR = {
+    "analisis": alur_analisis,
+    "prediksi": alur_prediksi,
+    "sentimen_teks": alur_sentimen_teks,
+    "sentimen_csv": alur_sentimen_csv,
+}
+
+
+# ============================================================
+# 4. PENCATATAN & PEMANTAUAN SUMBER DAYA
+# ============================================================
+class Catatan:
+    """Latensi (detik) per (alur, jenis): buka | interaksi | polling | hasil."""
+
+    def __init__(self):
+        self.latensi = defaultdict(list)
+        self.selesai = defaultdict(int)
+        self.error = defaultdict(list)
+
+    def tambah(self, alur, jenis, detik):
+        self.latensi[(alur, jenis)].append(detik)
+
+
+class PemantauSumberDaya:
+    """RSS proses server + anak (worker pool sentimen) disampel berkala; CPU dari selisih cpu_times."""
+
+    def __init__(self, pid, interval=INTERVAL_SAMPEL):
+        self.proses = psutil.Process(pid)
+        self.interval = interval
+        self.rss = []
+
+    def _semua(self):
+        return [self.proses] + self.proses.children(recursive=True)
+
+    def _cpu(self):
+        hasil = {}
+        for p in self._semua():
+            try:
+                t = p.cpu_times()
+                hasil[p.pid] = t.user + t.system
+            except psutil.Error:
+                pass
+        return hasil
+
+    async def _sampel(self):
+        while True:
+            total = 0
+            for p in self._semua():
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.rss.append(total)
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self):
+        self._cpu_awal = self._cpu()
+        self._mulai = time.perf_counter()
+        self._tugas = asyncio.ensure_future(self._sampel())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._tugas.cancel()
+        self.detik = time.perf_counter() - self._mulai
+        # Anak yang baru muncul dihitung dari nol; yang sudah berhenti tidak terlihat lagi
+        self.cpu_detik = sum(v - self._cpu_awal.get(pid, 0.0) for pid, v in self._cpu().items())
+
+
+# ============================================================
+# 5. MENJALANKAN SKENARIO
+# ============================================================
+async def _istirahat(berhenti, detik):
+    try:
+        await asyncio.wait_for(berhenti.wait(), detik)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def pengguna(alamat, alur_dipilih, catatan, berhenti, seed, jeda, batas):
+    rng = np.random.default_rng(seed)
+    k = Klien(alamat, catatan, batas)
+    # Kedatangan pengguna tersebar, bukan serentak di detik pertama
+    await _istirahat(berhenti, rng.uniform(0, jeda))
+    while not berhenti.is_set():
+        nama = alur_dipilih(rng)
+        k.alur = nama
+        try:
+            await ALUR[nama](k, rng)
+            catatan.selesai[nama] += 1
+        except Exception as e:
+            catatan.error[nama].append(f"{type(e).__name__}: {e}")
+            # Sesi baru untuk alur berikutnya: state sesi yang rusak tidak diteruskan
+            k.tutup()
+            k = Klien(alamat, catatan, batas)
+        # Waktu "berpikir" pengguna sebelum interaksi berikutnya
+        await _istirahat(berhenti, rng.exponential(jeda))
+    k.tutup()
+
+
+async def jalankan(server, skenario, n_pengguna, durasi, jeda, batas, seed):
+    if skenario == "campuran":
+        nama, bobot = list(CAMPURAN), np.array(list(CAMPURAN.values()))
+        alur_dipilih = lambda rng: nama[rng.choice(len(nama), p=bobot / bobot.sum())]
+    else:
+        alur_dipilih = lambda rng: skenario
+
+    alamat = f"127.0.0.1:{server.port}"
+    catatan = Catatan()
+    berhenti = asyncio.Event()
+    async with PemantauSumberDaya(server.proses.pid) as pantau:
+        tugas = [
+            asyncio.ensure_future(pengguna(alamat, alur_dipilih, catatan, berhenti, seed + i, jeda, batas))
+            for i in range(n_pengguna)
+        ]
+        await asyncio.sleep(durasi)
+        berhenti.set()
+        # Alur yang sedang berjalan dibiarkan selesai agar tidak terhitung gagal
+        await asyncio.wait(tugas, timeout=batas)
+    return catatan, pantau
+
+
+async def pemanasan(server, skenario, batas, seed):
+    """Satu sesi menjalankan tiap alur sekali: yang diukur keadaan server yang sudah berjalan."""
+    k = Klien(f"127.0.0.1:{server.port}", Catatan(), batas)
+    rng = np.random.default_rng(seed)
+    try:
+        for nama in skenario:
+            if nama in ALUR:
+                k.alur = nama
+                await ALUR[nama](k, rng)
+    finally:
+        k.tutup()
+
+
+def ringkas(skenario, catatan, pantau):
+    """Baris laporan per alur (untuk campuran) dan satu baris total skenario."""
+    def persentil(nilai, q):
+        return float(np.percentile(nilai, q) * 1000) if nilai else float("nan")
+
+    alur = sorted({a for a, _ in catatan.latensi} | set(catatan.error))
+    kelompok = {f"{skenario}/{a}": [a] for a in alur} if skenario == "campuran" else {}
+    kelompok[skenario] = alur
+
+    baris = []
+    for label, anggota in kelompok.items():
+        def latensi(jenis):
+            return [d for a in anggota for d in catatan.latensi[(a, jenis)]]
+
+        rerun, hasil = latensi("interaksi"), latensi("hasil")
+        baris.append({
+            "skenario": label,
+            "alur_selesai": sum(catatan.selesai[a] for a in anggota),
+            "error": sum(len(catatan.error[a]) for a in anggota),
+            "rerun": len(rerun),
+            "p50_ms": persentil(rerun, 50),
+            "p95_ms": persentil(rerun, 95),
+            "p99_ms": persentil(rerun, 99),
+            "buka_p50_ms": persentil(latensi("buka"), 50),
+            "polling_p50_ms": persentil(latensi("polling"), 50),
+            "hasil_p50_s": persentil(hasil, 50) / 1000,
+            "hasil_p95_s": persentil(hasil, 95) / 1000,
+        })
+    # CPU & RSS diukur per skenario (semua alurnya berbagi proses server)
+    baris[-1].update({
+        "detik": pantau.detik,
+        "cpu_persen": 100 * pantau.cpu_detik / pantau.detik,
+        "rss_rata_mb": float(np.mean(pantau.rss)) / 2**20 if pantau.rss else float("nan"),
+        "rss_puncak_mb": max(pantau.rss, default=0) / 2**20,
+    })
+    return baris
+
+
+def cetak_judul():
+    print(
+        f"{'skenario':<28} {'alur':>5} {'err':>4} {'rerun':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'hasil p50/p95 s':>16} {'CPU %':>7} {'RSS rata/puncak MB':>19}"
+    )
+
+
+def cetak(baris):
+    for b in baris:
+        hasil = f"{b['hasil_p50_s']:.2f}/{b['hasil_p95_s']:.2f}" if not np.isnan(b["hasil_p50_s"]) else "-"
+        sumber = (f"{b['cpu_persen']:>7.0f} {b['rss_rata_mb']:>9.0f}/{b['rss_puncak_mb']:<9.0f}"
+                  if "cpu_persen" in b else "")
+        print(
+            f"{b['skenario']:<28} {b['alur_selesai']:>5} {b['error']:>4} {b['rerun']:>6} {b['p50_ms']:>8.1f} "
+            f"{b['p95_ms']:>8.1f} {b['p99_ms']:>8.1f} {hasil:>16} {sumber}",
+            flush=True,
+        )
+
+
+def sentimen_tersedia():
+    from src.artifacts import get_artifacts
+
+    return get_artifacts().siap()
+
+
+async def uji(args, skenario):
+    semua = []
+    with Server(args.batas) as server:
+        await pemanasan(server, skenario, args.batas, args.seed)
+        print(f"{args.pengguna} pengguna bersamaan, {args.durasi:.0f} detik per skenario, CPU: {os.cpu_count()}\n")
+        cetak_judul()
+        for nama in skenario:
+            catatan, pantau = await jalankan(server, nama, args.pengguna, args.durasi, args.jeda, args.batas, args.seed)
+            baris = ringkas(nama, catatan, pantau)
+            cetak(baris)
+            for alur, pesan in catatan.error.items():
+                if pesan:
+                    print(f"   ⚠️  {alur}: {len(pesan)} error, mis. {pesan[0]}", file=sys.stderr)
+            semua += baris
+    return semua
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban sesi Streamlit bersamaan.")
+    parser.add_argument("--pengguna", type=int, default=8, help="Jumlah sesi bersamaan")
+    parser.add_argument("--durasi", type=float, default=30, help="Detik per skenario")
+    parser.add_argument("--skenario", nargs="+", default=SKENARIO, choices=SKENARIO)
+    parser.add_argument("--jeda", type=float, default=1.0, help="Rata-rata waktu berpikir pengguna (detik)")
+    parser.add_argument("--batas", type=float, default=120, help="Batas waktu satu rerun/hasil (detik)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--simpan", default=None, help="Tambahkan hasil ke file JSONL")
+    args = parser.parse_args()
+
+    skenario = args.skenario
+    if not sentimen_tersedia():
+        skenario = [s for s in skenario if s not in SKENARIO_SENTIMEN]
+        CAMPURAN.update({s: 0.0 for s in SKENARIO_SENTIMEN})
+        print("ℹ️  Skenario sentimen dilewati (model_nlp belum siap)", file=sys.stderr)
+
+    semua = asyncio.run(uji(args, skenario))
+
+    if args.simpan:
+        with open(args.simpan, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"), "pengguna": args.pengguna, "durasi": args.durasi,
+                "cpu": os.cpu_count(), "env_warmup": os.environ.get("APP_WARMUP", "0"), "hasil": semua,
+            }) + "\n")
+    return 1 if any(b["error"] for b in semua) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
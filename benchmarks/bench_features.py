@@ -0,0 +1,61 @@
+"""
+Micro-benchmark FeatureEngine terhadap pembuatan fitur gaya pandas lama.
+Paritas nilai diuji di tests/test_fitur_baseline.py terhadap keluaran kode
+baseline yang dibekukan; di sini hanya waktu yang diukur.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_features
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_forecast import riwayat_sintetis
+from src.features import SPEC, FeatureEngine
+from src.prediction import FEATURES, HARI_LIBUR
+
+
+def fitur_pandas(df, rolling_shift):
+    """Pembanding waktu: fitur dengan operasi pandas (shift/rolling) per kolom."""
+    df = df.copy()
+    x = df["jumlah_permohonan"]
+    for lag in SPEC["lags"]:
+        df[f"jumlah_permohonan_lag{lag}"] = x.shift(lag)
+    for w in SPEC["windows"]:
+        sumber = x.shift(rolling_shift)
+        df[f"permohonan_mean{w}"] = sumber.rolling(w).mean()
+        df[f"permohonan_std{w}"] = sumber.rolling(w).std()
+    df["hari"] = df["tanggal"].dt.day
+    df["bulan"] = df["tanggal"].dt.month
+    df["tahun"] = df["tanggal"].dt.year
+    df["dayofweek"] = df["tanggal"].dt.dayofweek
+    df["quarter"] = df["tanggal"].dt.quarter
+    df["is_weekend"] = df["dayofweek"].isin([5, 6]).astype(int)
+    df["is_holiday"] = df["tanggal"].isin(pd.to_datetime(HARI_LIBUR, unit="D")).astype(int)
+    return df[FEATURES].to_numpy(dtype=np.float64)
+
+
+def ukur(fungsi, ulang=5):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik, hasil
+
+
+def main():
+    engine = FeatureEngine(SPEC, hari_libur=HARI_LIBUR)
+
+    print(f"{'baris':>9} {'shift':>5} {'pandas (ms)':>12} {'numpy (ms)':>11} {'speedup':>8}")
+    for n in [1_500, 20_000, 50_000]:
+        df = riwayat_sintetis(n)
+        for shift in [1, 0]:
+            t_pd, _ = ukur(lambda: fitur_pandas(df, shift))
+            t_np, _ = ukur(lambda: engine.batch(df["jumlah_permohonan"], df["tanggal"], rolling_shift=shift, dtype=np.float64))
+            print(f"{n:>9} {shift:>5} {t_pd * 1e3:>12.2f} {t_np * 1e3:>11.2f} {t_pd / t_np:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
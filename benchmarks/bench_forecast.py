@@ -0,0 +1,91 @@
+"""
+Benchmark prediksi rekursif: loop lama (concat + buat_fitur ulang) vs ring buffer.
+Paritas hasil diuji di tests/test_fitur_baseline.py terhadap prediksi kode
+baseline yang dibekukan; di sini hanya waktu yang diukur.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_forecast
+"""
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.prediction import FEATURES, buat_fitur, prediksi_rekursif
+
+
+def riwayat_sintetis(n_hari, seed=0):
+    """Riwayat harian sintetis sepanjang n_hari dengan pola mingguan."""
+    rng = np.random.default_rng(seed)
+    tanggal = pd.date_range("2000-01-01", periods=n_hari, freq="D")
+    pola = np.where(tanggal.dayofweek >= 5, 2, 6)
+    return pd.DataFrame({"tanggal": tanggal, "jumlah_permohonan": pola + rng.integers(0, 4, n_hari)})
+
+
+def predict_future_lama(df_harian, best_model, scaler_x, scaler_y, n_forecast=7):
+    """
+    Struktur loop lama (concat + buat_fitur ulang tiap langkah, O(horizon x riwayat)),
+    sebagai pembanding waktu; fiturnya memakai buat_fitur saat ini.
+    """
+    df_pred = df_harian.sort_values("tanggal").reset_index(drop=True).copy()
+    hasil_prediksi = []
+
+    for i in range(1, n_forecast + 1):
+        tanggal_pred = df_pred["tanggal"].max() + pd.Timedelta(days=1)
+
+        # Tambahkan baris kosong untuk tanggal baru
+        df_pred = pd.concat([
+            df_pred,
+            pd.DataFrame({"tanggal": [tanggal_pred], "jumlah_permohonan": [np.nan]})
+        ], ignore_index=True)
+
+        # Siapkan data sementara untuk feature generation
+        df_temp = df_pred.copy()
+        df_temp["jumlah_permohonan"] = df_temp["jumlah_permohonan"].ffill()
+        df_temp = buat_fitur(df_temp)
+
+        # Ambil baris fitur tanggal prediksi
+        X_new = df_temp.loc[df_temp["tanggal"] == tanggal_pred, FEATURES]
+        if X_new.isna().sum().sum() > 0:
+            break
+
+        y_pred_scaled = best_model.predict(scaler_x.transform(X_new))
+        y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1)).ravel()[0]
+        hasil_prediksi.append((tanggal_pred, y_pred))
+
+        # Masukkan hasil prediksi ke df_pred untuk prediksi hari berikutnya
+        df_pred.loc[df_pred["tanggal"] == tanggal_pred, "jumlah_permohonan"] = y_pred
+
+    return pd.DataFrame(hasil_prediksi, columns=["tanggal", "jumlah_permohonan_prediksi"])
+
+
+def ukur(fungsi, ulang=3):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik, hasil
+
+
+def main():
+    model_path = Path("models")
+    model = joblib.load(model_path / "svr_model.pkl")
+    scaler_x = joblib.load(model_path / "scaler_x.pkl")
+    scaler_y = joblib.load(model_path / "scaler_y.pkl")
+
+    print(f"{'riwayat':>8} {'horizon':>8} {'lama (s)':>10} {'baru (s)':>10} {'speedup':>8}")
+    for n_hari in [1_000, 10_000, 50_000]:
+        df = riwayat_sintetis(n_hari)
+        for horizon in [7, 30]:
+            t_lama, _ = ukur(lambda: predict_future_lama(df, model, scaler_x, scaler_y, horizon), ulang=1)
+            t_baru, _ = ukur(lambda: prediksi_rekursif(
+                model, scaler_x, scaler_y, df["jumlah_permohonan"].to_numpy(float), df["tanggal"].max(), horizon
+            ))
+            print(f"{n_hari:>8} {horizon:>8} {t_lama:>10.3f} {t_baru:>10.4f} {t_lama / t_baru:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark interaksi halaman analisis (ganti tahun): groupby ulang df_harian
+per rerun (cara lama) vs slice kubus agregat, untuk riwayat yang makin panjang.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_kubus
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.kubus import bangun_kubus
+
+
+def agregat_sintetis(n_hari, n_layanan=2, seed=0):
+    """Agregat per (tanggal, id_jenis_layanan) sintetis seperti _agregasi_per_layanan."""
+    rng = np.random.default_rng(seed)
+    tanggal = pd.date_range(end="2025-07-01", periods=n_hari, freq="D")
+    idx = pd.MultiIndex.from_product([tanggal, np.arange(1, n_layanan + 1, dtype="int16")],
+                                     names=["tanggal", "id_jenis_layanan"])
+    jumlah = rng.integers(0, 10, len(idx))
+    return pd.DataFrame({"jumlah_permohonan": jumlah, "total_harga": jumlah * 175_000}, index=idx)
+
+
+def cara_lama(df_harian, tahun):
+    df = df_harian.copy()
+    df["tanggal"] = pd.to_datetime(df["tanggal"])
+    df["tahun"] = df["tanggal"].dt.year
+    df["bulan"] = df["tanggal"].dt.month
+    df = df.groupby(["tahun", "bulan"])["jumlah_permohonan"].sum().reset_index()
+    df["bulan_nama"] = df["bulan"].apply(lambda x: pd.to_datetime(str(x), format="%m").strftime("%b"))
+    return df[df["tahun"] == tahun]
+
+
+def ukur(fungsi, ulang=5):
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik * 1000
+
+
+def main():
+    print(f"{'hari':>8} {'sel kubus':>10} {'bangun (ms)':>12} {'lama (ms)':>10} {'kubus (ms)':>11}")
+    for n_hari in [1_000, 10_000, 50_000]:
+        agregat = agregat_sintetis(n_hari)
+        df_harian = agregat.groupby(level="tanggal").sum().reset_index()
+
+        mulai = time.perf_counter()
+        kubus = bangun_kubus(agregat)
+        t_bangun = (time.perf_counter() - mulai) * 1000
+
+        t_lama = ukur(lambda: cara_lama(df_harian, 2024))
+        t_kubus = ukur(lambda: kubus.rollup(["bulan"], tahun=2024))
+        print(f"{n_hari:>8} {len(kubus.dasar):>10} {t_bangun:>12.1f} {t_lama:>10.2f} {t_kubus:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
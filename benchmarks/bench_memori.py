@@ -0,0 +1,128 @@
+"""
+Laporan memori produk data yang dibagikan ke sesi Streamlit: byte per kolom
+df_harian (skema ringkas vs dtype lama), jejak per sesi, dan proyeksi untuk
+riwayat panjang & banyak sesi, sebagai acuan ukuran host.
+
+Model jejak (lihat src.app_cache):
+- bersama: st.cache_data menyimpan satu salinan ter-pickle df_harian & kubus
+  per versi file data;
+- per sesi aktif: tiap rerun menerima salinan hasil unpickle sendiri, jadi
+  setiap sesi yang sedang rerun memegang df_harian + kubus + tabel tampilan.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_memori
+    python -m benchmarks.bench_memori --data /tmp/permohonan_1m.csv --tahun 10 30 --sesi 1 10 50 200
+"""
+import argparse
+import pickle
+
+from src.app_cache import JUMLAH_TABEL
+from src.features import SPEC
+from src.kubus import load_kubus
+from src.preprocessing import load_and_prepare_data
+
+DATA_PATH = "data/tbl_permohonan_202507221101.csv"
+# dtype df_harian sebelum skema ringkas (FITUR_VERSION 3), untuk pembanding
+DTYPE_LAMA = {
+    "jumlah_permohonan": "int64",
+    "total_harga": "int64",
+    **{k: "int32" for k in SPEC["kalender"]},
+    **{k: "int64" for k in SPEC["flags"]},
+}
+
+
+# ============================================================
+# 1. UKURAN
+# ============================================================
+def byte_frame(df):
+    """Byte memori df termasuk indeks (deep: isi string ikut dihitung)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def byte_pickle(obj):
+    """Ukuran salinan ter-pickle seperti yang disimpan st.cache_data."""
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def skema_lama(df):
+    dtype = {k: DTYPE_LAMA.get(k, "float64") for k in df.columns if df[k].dtype.kind in "iuf"}
+    return df.astype(dtype)
+
+
+def per_kolom(df, df_lama):
+    """Baris (kolom, dtype, byte, dtype lama, byte lama) untuk setiap kolom df."""
+    baru = df.memory_usage(index=False, deep=True)
+    lama = df_lama.memory_usage(index=False, deep=True)
+    return [(k, str(df[k].dtype), int(baru[k]), str(df_lama[k].dtype), int(lama[k])) for k in df.columns]
+
+
+def jejak(df_harian, kubus):
+    """Byte per komponen: bersama (cache ter-pickle) dan per sesi aktif."""
+    tabel = df_harian.tail(JUMLAH_TABEL)
+    return {
+        "bersama": byte_pickle(df_harian) + byte_pickle(kubus),
+        "df_harian": byte_frame(df_harian),
+        "kubus": byte_frame(kubus.dasar) + byte_frame(kubus.mingguan),
+        "tabel": byte_frame(tabel),
+    }
+
+
+# ============================================================
+# 2. LAPORAN
+# ============================================================
+def _mb(n):
+    return n / 2**20
+
+
+def cetak_kolom(df, df_lama):
+    print(f"{'kolom':<28} {'dtype':>14} {'byte':>10} {'dtype lama':>14} {'byte lama':>10}")
+    for kolom, dtype, byte, dtype_lama, byte_lama in per_kolom(df, df_lama):
+        print(f"{kolom:<28} {dtype:>14} {byte:>10,} {dtype_lama:>14} {byte_lama:>10,}")
+    total, total_lama = byte_frame(df), byte_frame(df_lama)
+    print(f"{'total (dengan indeks)':<28} {'':>14} {total:>10,} {'':>14} {total_lama:>10,}"
+          f"  (-{100 * (1 - total / total_lama):.0f}%)")
+    print(f"byte per hari riwayat: {total / len(df):.1f} (lama {total_lama / len(df):.1f})")
+
+
+def cetak_proyeksi(jejak_baru, jejak_lama, n_hari, daftar_tahun, daftar_sesi):
+    """
+    Jejak total = bersama + sesi x per_sesi, diskalakan linear dengan panjang
+    riwayat (df_harian per hari, kubus per tahun x bulan x hari).
+    """
+    per_sesi = {nama: j["df_harian"] + j["kubus"] + j["tabel"] for nama, j in
+                (("baru", jejak_baru), ("lama", jejak_lama))}
+    print(f"\nPer sesi aktif: {_mb(per_sesi['baru']):.2f} MB (lama {_mb(per_sesi['lama']):.2f} MB); "
+          f"cache bersama: {_mb(jejak_baru['bersama']):.2f} MB (lama {_mb(jejak_lama['bersama']):.2f} MB)")
+
+    print(f"\n{'riwayat':>10} {'sesi':>6} {'total MB':>10} {'lama MB':>10}")
+    for tahun in daftar_tahun:
+        skala = tahun * 365.25 / n_hari
+        for sesi in daftar_sesi:
+            baru = skala * (jejak_baru["bersama"] + sesi * per_sesi["baru"])
+            lama = skala * (jejak_lama["bersama"] + sesi * per_sesi["lama"])
+            print(f"{f'{tahun:g} thn':>10} {sesi:>6} {_mb(baru):>10.1f} {_mb(lama):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laporan memori df_harian per kolom & per sesi.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--tahun", type=float, nargs="+", default=[4, 10, 30], help="Panjang riwayat proyeksi")
+    parser.add_argument("--sesi", type=int, nargs="+", default=[1, 10, 50, 200], help="Jumlah sesi aktif proyeksi")
+    args = parser.parse_args()
+
+    df_harian = load_and_prepare_data(args.data)
+    df_lama = skema_lama(df_harian)
+    kubus = load_kubus(args.data)
+    n_hari = len(df_harian)
+
+    print(f"df_harian: {n_hari} hari, {df_harian.shape[1]} kolom ({args.data})\n")
+    cetak_kolom(df_harian, df_lama)
+
+    # Kubus tidak berubah skemanya; pembanding hanya mengganti df_harian
+    jejak_baru = jejak(df_harian, kubus)
+    jejak_lama = jejak(df_lama, kubus)
+    cetak_proyeksi(jejak_baru, jejak_lama, n_hari, args.tahun, args.sesi)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Waktu run pertama & rerun tiap halaman Streamlit (AppTest). Cache hit saat
+rerun, keutuhan df_harian dan invalidasi cache diuji di tests/test_app_cache.py;
+di sini hanya waktu yang diukur.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_rerun
+    python -m benchmarks.bench_rerun --rerun 20 --sentimen   # butuh folder model_nlp
+"""
+import argparse
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+HALAMAN = ["Analisis Data Historis", "Prediksi Jumlah Permohonan"]
+
+
+def tunggu(at, selesai, batas=60):
+    """Rerun sampai kondisi selesai(at) terpenuhi (job latar/fragment)."""
+    akhir = time.time() + batas
+    while not selesai(at):
+        if time.time() > akhir:
+            raise TimeoutError("Halaman tidak selesai dalam batas waktu")
+        time.sleep(0.3)
+        at.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Waktu rerun halaman Streamlit.")
+    parser.add_argument("--rerun", type=int, default=10)
+    parser.add_argument("--sentimen", action="store_true", help="Ikut ukur halaman sentimen (butuh model_nlp)")
+    args = parser.parse_args()
+
+    halaman = HALAMAN + (["Analisis Sentimen"] if args.sentimen else [])
+    at = AppTest.from_file("main.py", default_timeout=120)
+    at.run()
+
+    print(f"{'halaman':<28} {'run pertama (ms)':>17} {'rerun p50 (ms)':>15}")
+    for nama in halaman:
+        mulai = time.perf_counter()
+        at.radio[0].set_value(nama).run()
+        if nama == "Prediksi Jumlah Permohonan":
+            # Jalankan prediksi sekali agar grafik (riwayat_grafik) ikut dirender
+            at.button[0].click().run()
+            tunggu(at, lambda a: a.get("plotly_chart"))
+        elif nama == "Analisis Sentimen":
+            tunggu(at, lambda a: a.text_area)
+        t_pertama = (time.perf_counter() - mulai) * 1000
+
+        durasi = []
+        for i in range(args.rerun):
+            mulai = time.perf_counter()
+            if nama == "Analisis Data Historis" and at.selectbox:
+                opsi = at.selectbox[0].options
+                at.selectbox[0].set_value(opsi[i % len(opsi)])
+            at.run()
+            durasi.append((time.perf_counter() - mulai) * 1000)
+        print(f"{nama:<28} {t_pertama:>17.1f} {np.median(durasi):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
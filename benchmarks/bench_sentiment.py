@@ -0,0 +1,68 @@
+"""
+Benchmark analisis sentimen massal: per baris (jalur lama) vs batch bucket panjang.
+
+Jalankan dari root repo (butuh folder model_nlp):
+    python -m benchmarks.bench_sentiment
+    python -m benchmarks.bench_sentiment --n 5000 --batch-size 16 32 64
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.sentiment import MODEL_DIR, muat_model, prediksi_batch, prediksi_teks, sidik_model
+from src.sentiment_cache import SentimenCache
+
+KATA = (
+    "pelayanan sangat bagus cepat ramah petugas membantu puas mantap terima kasih "
+    "buruk lambat antri lama sekali kecewa tidak jelas sistem error biaya mahal oke"
+).split()
+
+
+def teks_sintetis(n, seed=0):
+    """Komentar sintetis dengan panjang bervariasi (1-60 kata, ekor panjang)."""
+    rng = np.random.default_rng(seed)
+    panjang = np.minimum(rng.geometric(0.08, n), 60)
+    return [" ".join(rng.choice(KATA, k)) for k in panjang]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model-dir", default=str(MODEL_DIR))
+    parser.add_argument("--n", type=int, default=2000, help="Jumlah teks")
+    parser.add_argument("--n-per-baris", type=int, default=500, help="Jumlah teks untuk jalur per baris")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[8, 32, 64])
+    args = parser.parse_args()
+
+    tokenizer, model = muat_model(args.model_dir)
+    teks = teks_sintetis(args.n)
+
+    # Jalur lama lambat: ukur pada subset lalu bandingkan baris/detik
+    sub = teks[:args.n_per_baris]
+    mulai = time.perf_counter()
+    acuan = np.array([prediksi_teks(tokenizer, model, t) for t in sub])
+    rps_lama = len(sub) / (time.perf_counter() - mulai)
+
+    print(f"{'mode':>14} {'baris/detik':>12} {'speedup':>8} {'label sama':>11}")
+    print(f"{'per baris':>14} {rps_lama:>12.1f} {'1x':>8} {'-':>11}")
+    for bs in args.batch_size:
+        hasil = prediksi_batch(tokenizer, model, teks, batch_size=bs)
+        rps = len(teks) / hasil.detik
+        sama = (hasil.pred[:len(sub)] == acuan).mean()
+        print(f"{f'batch {bs}':>14} {rps:>12.1f} {rps / rps_lama:>7.1f}x {sama:>10.2%}")
+
+    # Cache SQLite: putaran pertama mengisi, putaran kedua seharusnya tanpa model sama sekali
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SentimenCache(sidik_model(args.model_dir), path=Path(tmp) / "sentimen.sqlite")
+        for putaran in ("dingin", "hangat"):
+            hasil = prediksi_batch(tokenizer, model, teks, cache=cache)
+            rps = len(teks) / hasil.detik
+            sama = (hasil.pred[:len(sub)] == acuan).mean()
+            print(f"{f'cache {putaran}':>14} {rps:>12.1f} {rps / rps_lama:>7.1f}x {sama:>10.2%}"
+                  f"   unik={hasil.n_unik} dari cache={hasil.n_cache}")
+
+
+if __name__ == "__main__":
+    main()
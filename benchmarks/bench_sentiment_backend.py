@@ -0,0 +1,86 @@
+"""
+Perbandingan backend inferensi sentimen di CPU: PyTorch fp32, PyTorch int8
+(kuantisasi dinamis), dan ONNX Runtime.
+
+Setiap backend diukur di proses terpisah agar angka memori tidak saling
+memengaruhi. Kesesuaian label dihitung terhadap fp32 pada set teks uji.
+
+Jalankan dari root repo (butuh folder model_nlp):
+    python -m benchmarks.bench_sentiment_backend
+    python -m benchmarks.bench_sentiment_backend --csv data/ulasan.csv --kolom komentar
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import psutil
+
+from benchmarks.bench_sentiment import teks_sintetis
+from src.sentiment import BACKEND, MODEL_DIR, muat_model, prediksi_batch, prediksi_teks
+
+
+def ukur_backend(model_dir, backend, teks, n_latensi, batch_size):
+    proses = psutil.Process()
+    rss_awal = proses.memory_info().rss
+
+    mulai = time.perf_counter()
+    tokenizer, model = muat_model(model_dir, backend)
+    t_muat = time.perf_counter() - mulai
+
+    latensi = []
+    for t in teks[:n_latensi]:
+        mulai = time.perf_counter()
+        prediksi_teks(tokenizer, model, t)
+        latensi.append(time.perf_counter() - mulai)
+
+    hasil = prediksi_batch(tokenizer, model, teks, batch_size=batch_size)
+    return {
+        "backend": backend,
+        "muat_s": t_muat,
+        "p50_ms": np.percentile(latensi, 50) * 1000,
+        "p95_ms": np.percentile(latensi, 95) * 1000,
+        "baris_per_detik": len(teks) / hasil.detik,
+        "rss_mb": (proses.memory_info().rss - rss_awal) / 2**20,
+        "pred": hasil.pred,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perbandingan backend inferensi sentimen (CPU).")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR))
+    parser.add_argument("--backend", nargs="+", default=list(BACKEND), choices=BACKEND)
+    parser.add_argument("--csv", default=None, help="CSV berisi teks uji (default: teks sintetis)")
+    parser.add_argument("--kolom", default=None, help="Kolom teks pada --csv")
+    parser.add_argument("--n", type=int, default=2000, help="Jumlah teks uji")
+    parser.add_argument("--n-latensi", type=int, default=200, help="Jumlah teks untuk latensi per teks")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    if args.csv:
+        df = pd.read_csv(args.csv, usecols=[args.kolom], dtype=str, keep_default_na=False, nrows=args.n)
+        teks = df[args.kolom].tolist()
+    else:
+        # seed berbeda dari bench_sentiment agar set uji terpisah
+        teks = teks_sintetis(args.n, seed=1)
+
+    hasil = []
+    for backend in args.backend:
+        # Proses baru per backend: memori & inisialisasi library terisolasi
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            hasil.append(pool.submit(
+                ukur_backend, args.model_dir, backend, teks, args.n_latensi, args.batch_size
+            ).result())
+
+    acuan = next((h["pred"] for h in hasil if h["backend"] == "torch"), hasil[0]["pred"])
+    print(f"{'backend':>8} {'muat (s)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'baris/detik':>12} "
+          f"{'RSS (MB)':>9} {'label sama':>11}")
+    for h in hasil:
+        sama = (h["pred"] == acuan).mean()
+        print(f"{h['backend']:>8} {h['muat_s']:>9.2f} {h['p50_ms']:>9.2f} {h['p95_ms']:>9.2f} "
+              f"{h['baris_per_detik']:>12.1f} {h['rss_mb']:>9.1f} {sama:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
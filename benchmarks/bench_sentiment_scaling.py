@@ -0,0 +1,66 @@
+"""
+Skala throughput analisis sentimen terhadap jumlah core:
+- satu proses dengan k thread PyTorch (mode latensi / tanpa pool)
+- pool k worker x 1 thread (SentimenPool)
+Juga latensi teks tunggal per jumlah thread.
+
+Jalankan dari root repo (butuh folder model_nlp):
+    python -m benchmarks.bench_sentiment_scaling
+    python -m benchmarks.bench_sentiment_scaling --core 1 2 4 8 --n 20000
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.bench_sentiment import teks_sintetis
+from src.sentiment import MODEL_DIR, muat_model, prediksi_batch, prediksi_teks
+from src.sentiment_pool import SentimenPool, atur_thread, jumlah_core
+
+
+def ukur_satu_proses(model_dir, teks, n_threads, n_latensi):
+    atur_thread(n_threads)
+    tokenizer, model = muat_model(model_dir)
+    latensi = []
+    for t in teks[:n_latensi]:
+        mulai = time.perf_counter()
+        prediksi_teks(tokenizer, model, t)
+        latensi.append(time.perf_counter() - mulai)
+    hasil = prediksi_batch(tokenizer, model, teks)
+    return len(teks) / hasil.detik, np.percentile(latensi, 50) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skala throughput analisis sentimen terhadap jumlah core.")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR))
+    parser.add_argument("--core", type=int, nargs="+", default=None, help="Daftar jumlah core yang diuji")
+    parser.add_argument("--n", type=int, default=10_000, help="Jumlah teks")
+    parser.add_argument("--n-latensi", type=int, default=100)
+    args = parser.parse_args()
+
+    core = args.core or sorted({1, 2, 4, 8, jumlah_core()} & set(range(1, jumlah_core() + 1)))
+    teks = teks_sintetis(args.n)
+    tokenizer, model = muat_model(args.model_dir)
+    spawn = multiprocessing.get_context("spawn")
+
+    print(f"core tersedia: {jumlah_core()}")
+    print(f"{'core':>5} {'1 proses (baris/s)':>19} {'p50 teks (ms)':>14} {'pool (baris/s)':>15} {'start pool (s)':>15}")
+    for k in core:
+        # Thread PyTorch bersifat global per proses: ukur di proses baru
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as ex:
+            rps_satu, p50 = ex.submit(ukur_satu_proses, args.model_dir, teks, k, args.n_latensi).result()
+
+        pool = SentimenPool(args.model_dir, n_workers=k, threads_per_worker=1)
+        mulai = time.perf_counter()
+        pool.mulai()
+        t_start = time.perf_counter() - mulai
+        hasil = prediksi_batch(tokenizer, model, teks, pool=pool)
+        pool.tutup()
+
+        print(f"{k:>5} {rps_satu:>19.1f} {p50:>14.2f} {len(teks) / hasil.detik:>15.1f} {t_start:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cold start aplikasi:
+- profil waktu impor per modul entry (python -X importtime), dikelompokkan per paket
+- time-to-first-render: proses baru sampai main.py selesai dirender pertama kali
+- time-to-first-sentiment: sampai hasil analisis teks tunggal pertama tampil,
+  tanpa dan dengan warm-up (APP_WARMUP=1)
+
+Tiap pengukuran memakai proses Python baru agar benar-benar dingin.
+
+Jalankan dari root repo (butuh folder model_nlp atau mirror-nya untuk sentimen):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --jeda 5 --simpan benchmarks/startup_history.jsonl
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+MODUL_ENTRY = [
+    "src.preprocessing", "src.prediction", "src.forecast_cache", "src.sentiment",
+    "pages.analisis", "pages.prediksi", "pages.sentimen",
+]
+
+# Dijalankan di proses baru; mencetak timestamp (time.time) tiap tahap sebagai JSON
+KODE_SESI = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+jeda, sentimen = float(sys.argv[1]), sys.argv[2] == "1"
+t = {"mulai": time.time()}
+at = AppTest.from_file("main.py", default_timeout=600)
+at.run()
+assert not at.exception, at.exception
+t["render"] = time.time()
+
+if sentimen:
+    # Waktu "berpikir" pengguna sebelum membuka halaman sentimen
+    time.sleep(jeda)
+    t["buka_sentimen"] = time.time()
+    at.radio[0].set_value("Analisis Sentimen").run()
+    while not at.text_area:
+        assert not at.error, [e.value for e in at.error]
+        time.sleep(0.5)
+        at.run()
+    at.text_area[0].input(f"pelayanan sangat memuaskan {time.time_ns()}")
+    at.button[0].click().run()
+    assert any("Prediksi Sentimen" in m.value for m in at.markdown), "hasil sentimen tidak tampil"
+    t["sentimen"] = time.time()
+print(json.dumps(t))
+"""
+
+
+# ============================================================
+# 1. PROFIL WAKTU IMPOR
+# ============================================================
+def profil_impor(modul, baseline=("streamlit", "pandas", "numpy")):
+    """
+    (total_ms, {paket: ms}) waktu impor modul di proses baru. Paket dasar yang
+    selalu dimuat aplikasi diimpor lebih dulu agar tidak ikut terhitung.
+    """
+    kode = f"import {', '.join(baseline)}; import {modul}"
+    proses = subprocess.run([sys.executable, "-X", "importtime", "-c", kode], capture_output=True, text=True)
+    per_paket = defaultdict(float)
+    total = 0.0
+    for baris in proses.stderr.splitlines():
+        if not baris.startswith("import time:") or "self [us]" in baris:
+            continue
+        self_us, kumulatif_us, nama = baris[len("import time:"):].split("|")
+        if nama.strip() in baseline and not nama.startswith("  "):
+            # Baris induk dicetak setelah anak-anaknya: buang semua hitungan baseline
+            per_paket.clear()
+            continue
+        per_paket[nama.strip().split(".")[0]] += int(self_us) / 1000
+        if nama.strip() == modul:
+            total = int(kumulatif_us) / 1000
+    return total, dict(per_paket)
+
+
+# ============================================================
+# 2. SESI DINGIN (APPTEST DI PROSES BARU)
+# ============================================================
+def sesi_dingin(sentimen=False, warmup=False, jeda=0.0):
+    env = dict(os.environ, APP_WARMUP="1" if warmup else "0")
+    mulai = time.time()
+    proses = subprocess.run(
+        [sys.executable, "-c", KODE_SESI, str(jeda), "1" if sentimen else "0"],
+        capture_output=True, text=True, env=env,
+    )
+    if proses.returncode != 0:
+        raise RuntimeError(proses.stderr.strip().splitlines()[-1])
+    t = json.loads(proses.stdout.strip().splitlines()[-1])
+    hasil = {"first_render_s": t["render"] - mulai}
+    if sentimen:
+        hasil["first_sentiment_s"] = t["sentimen"] - mulai
+        hasil["sentimen_setelah_buka_s"] = t["sentimen"] - t["buka_sentimen"]
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil impor & waktu cold start aplikasi.")
+    parser.add_argument("--top", type=int, default=5, help="Jumlah paket terberat per modul")
+    parser.add_argument("--jeda", type=float, default=3.0, help="Detik antara render pertama dan membuka halaman sentimen")
+    parser.add_argument("--tanpa-sentimen", action="store_true", help="Lewati pengukuran sentimen (tanpa model_nlp)")
+    parser.add_argument("--simpan", default=None, help="Tambahkan hasil (JSON per baris) ke file ini")
+    args = parser.parse_args()
+
+    print(f"{'modul':<20} {'impor (ms)':>11}  paket terberat (ms, self)")
+    profil = {}
+    for modul in MODUL_ENTRY:
+        total, per_paket = profil_impor(modul)
+        profil[modul] = total
+        terberat = sorted(per_paket.items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+        print(f"{modul:<20} {total:>11.1f}  " + ", ".join(f"{p} {ms:.0f}" for p, ms in terberat))
+
+    print()
+    print(f"{'skenario':<12} {'first render (s)':>17} {'first sentimen (s)':>19} {'setelah buka (s)':>17}")
+    skenario = {}
+    for nama, warmup in [("dingin", False), ("warm-up", True)]:
+        hasil = sesi_dingin(sentimen=not args.tanpa_sentimen, warmup=warmup, jeda=args.jeda)
+        skenario[nama] = hasil
+        print(
+            f"{nama:<12} {hasil['first_render_s']:>17.2f} "
+            f"{hasil.get('first_sentiment_s', float('nan')):>19.2f} "
+            f"{hasil.get('sentimen_setelah_buka_s', float('nan')):>17.2f}"
+        )
+
+    if args.simpan:
+        try:
+            commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+        except OSError:
+            commit = None
+        catatan = {"waktu": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "jeda_s": args.jeda,
+                   "impor_ms": profil, "skenario": skenario}
+        with open(args.simpan, "a", encoding="utf-8") as f:
+            f.write(json.dumps(catatan) + "\n")
+        print(f"\nHasil ditambahkan ke {args.simpan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Generator data sintetis dengan skema ekspor tbl_permohonan
+(id_jenis_layanan, tanggal_permohonan, total_harga, status).
+
+Distribusi layanan, harga, status, jam dan hari dalam minggu meniru data asli;
+rentang tanggal tetap sehingga jumlah hari di df_harian sama untuk semua ukuran
+dan hanya jumlah baris per hari yang bertambah.
+
+Jalankan dari root repo:
+    python -m benchmarks.sintetis --baris 1000000 --output /tmp/permohonan_1m.csv
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cache import CACHE_DIR
+
+# Naikkan jika bentuk data sintetis berubah (file lama di cache tidak dipakai lagi)
+VERSI = "1"
+TANGGAL_AWAL = "2020-01-01"
+TANGGAL_AKHIR = "2025-07-21"
+UKURAN_CHUNK = 1_000_000
+SINTETIS_DIR = CACHE_DIR / "bench"
+
+LAYANAN = {1: 0.87, 2: 0.13}
+HARGA = {
+    1: {175_000: 0.55, 75_000: 0.16, 350_000: 0.08, 185_000: 0.06, 750_000: 0.05, 525_000: 0.05, 1_000_000: 0.05},
+    2: {400_000: 0.25, 1_150_000: 0.25, 0: 0.1, 800_000: 0.15, 735_000: 0.1, 2_240_000: 0.1, 9_500_000: 0.05},
+}
+STATUS = {7: 0.78, 10: 0.205, 6: 0.015}
+# Bobot per jam (jam kerja dominan) dan per hari (Senin..Minggu)
+BOBOT_JAM = np.array([40, 7, 6, 15, 4, 16, 30, 101, 462, 846, 1153, 1008, 449, 797, 1103, 876,
+                      584, 330, 100, 75, 86, 61, 64, 53], dtype=float)
+BOBOT_HARI = np.array([1796, 1853, 1564, 1583, 1276, 109, 85], dtype=float)
+
+
+def _pilih(rng, pilihan, n):
+    nilai = np.array(list(pilihan))
+    p = np.array(list(pilihan.values()), dtype=float)
+    return rng.choice(nilai, size=n, p=p / p.sum())
+
+
+def _hari():
+    return pd.date_range(TANGGAL_AWAL, TANGGAL_AKHIR, freq="D")
+
+
+def buat_chunk(idx_hari, rng):
+    """DataFrame dengan skema tbl_permohonan, satu baris per elemen idx_hari (indeks hari, terurut)."""
+    n = len(idx_hari)
+    jam = rng.choice(24, size=n, p=BOBOT_JAM / BOBOT_JAM.sum())
+    detik = jam * 3600 + rng.integers(0, 3600, n)
+    # Ekspor asli terurut waktu
+    urutan = np.lexsort((detik, idx_hari))
+    waktu = _hari().values[idx_hari[urutan]] + detik[urutan].astype("timedelta64[s]")
+
+    layanan = _pilih(rng, LAYANAN, n)
+    harga = np.empty(n, dtype=np.int64)
+    for kode, distribusi in HARGA.items():
+        m = layanan == kode
+        harga[m] = _pilih(rng, distribusi, int(m.sum()))
+
+    return pd.DataFrame({
+        "id_jenis_layanan": layanan,
+        "tanggal_permohonan": waktu,
+        "total_harga": harga,
+        "status": _pilih(rng, STATUS, n),
+    })
+
+
+def tulis_csv(path, n_baris, seed=0, ukuran_chunk=UKURAN_CHUNK):
+    """
+    Tulis n_baris data sintetis ke path CSV, terurut waktu. Jumlah baris per
+    hari diundi sekaligus, lalu hari-hari berurutan ditulis per chunk
+    (sekitar ukuran_chunk baris) sehingga memori tetap kecil.
+    """
+    rng = np.random.default_rng(seed)
+    hari = _hari()
+    bobot = BOBOT_HARI[hari.dayofweek]
+    per_hari = rng.multinomial(n_baris, bobot / bobot.sum())
+    # Batas chunk di antara hari: kumulatif baris dibagi ukuran_chunk
+    nomor_chunk = np.cumsum(per_hari) // ukuran_chunk
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        for i, k in enumerate(np.unique(nomor_chunk)):
+            hari_chunk = np.flatnonzero(nomor_chunk == k)
+            idx_hari = np.repeat(hari_chunk, per_hari[hari_chunk])
+            chunk = buat_chunk(idx_hari, rng)
+            chunk.to_csv(f, index=False, header=i == 0, date_format="%Y-%m-%d %H:%M:%S")
+    tmp.replace(path)
+    return path
+
+
+def file_sintetis(n_baris, seed=0):
+    """Path CSV sintetis n_baris (dibuat sekali, disimpan di cache/bench)."""
+    path = SINTETIS_DIR / f"tbl_permohonan-v{VERSI}-{n_baris}-{seed}.csv"
+    if not path.exists():
+        tulis_csv(path, n_baris, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat CSV sintetis dengan skema tbl_permohonan.")
+    parser.add_argument("--baris", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    print(f"✅ {tulis_csv(args.output, args.baris, args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
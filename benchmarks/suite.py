@@ -0,0 +1,200 @@
+"""
+Suite benchmark skala: waktu & puncak memori untuk jalur utama aplikasi pada
+data sintetis 10 ribu - 10 juta baris, dibandingkan dengan baseline tersimpan.
+
+Kasus:
+- load_and_prepare_data (tanpa cache & dari cache Parquet) per ukuran data
+- predict_future untuk tiap horizon 1-7
+- analisis_deskriptif, pembuatan figure plot_interaktif
+- inferensi sentimen batch (jika folder model_nlp ada)
+
+Hasil yang lebih lambat/lebih boros dari baseline melebihi toleransi dianggap
+regresi: tabel menandainya dan proses keluar dengan kode 1.
+
+Jalankan dari root repo:
+    python -m benchmarks.suite                              # bandingkan dengan baseline
+    python -m benchmarks.suite --ukuran 10000 100000 1000000 10000000
+    python -m benchmarks.suite --perbarui-baseline          # simpan hasil sebagai baseline
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.sintetis import file_sintetis
+
+BASELINE_PATH = Path("benchmarks/baseline.json")
+UKURAN_DEFAULT = [10_000, 100_000, 1_000_000]
+HORIZON = range(1, 8)
+# Waktu di bawah selisih ini dianggap derau pengukuran, bukan regresi
+SELISIH_MIN_DETIK = 0.005
+SELISIH_MIN_MB = 1.0
+
+
+# ============================================================
+# 1. PENGUKURAN
+# ============================================================
+def ukur(fungsi, ulang=3, memori=True):
+    """
+    {detik: terbaik dari `ulang` run, peak_mb: puncak alokasi Python/NumPy}.
+    tracemalloc tidak melihat alokasi Arrow (baca Parquet), jadi peak_mb kasus
+    cache hanya mencakup sisi pandas/NumPy.
+    """
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    hasil = {"detik": terbaik}
+    if memori:
+        # Run terpisah: tracemalloc memperlambat eksekusi
+        tracemalloc.start()
+        try:
+            fungsi()
+            hasil["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return hasil
+
+
+def _diam(fungsi, *args):
+    """Jalankan fungsi tanpa mencetak ke stdout (predict_future mencetak hasilnya)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fungsi(*args)
+
+
+def kasus(ukuran_data, n_sentimen, ulang, memori):
+    """Generator (nama_kasus, hasil) untuk semua kasus suite."""
+    from src.forecast_cache import MAX_HORIZON
+    from src.model_registry import get_registry
+    from src.prediction import predict_future
+    from src.preprocessing import load_and_prepare_data
+    from src.visualization import analisis_deskriptif, plot_interaktif
+
+    df_harian = None
+    for n in ukuran_data:
+        path = file_sintetis(n)
+        yield f"load_and_prepare_data[{n}]", ukur(
+            lambda: load_and_prepare_data(path, use_cache=False), ulang=1 if n >= 1_000_000 else ulang, memori=memori
+        )
+        load_and_prepare_data(path)
+        yield f"load_and_prepare_data_cache[{n}]", ukur(lambda: load_and_prepare_data(path), ulang, memori)
+        if df_harian is None:
+            df_harian = load_and_prepare_data(path)
+
+    # Jumlah hari sama untuk semua ukuran (rentang tanggal tetap): cukup satu df_harian
+    get_registry("models").get()
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "prediksi.csv")
+        for h in HORIZON:
+            yield f"predict_future[h={h}]", ukur(lambda: _diam(predict_future, df_harian, h, output), ulang, memori)
+        df_pred = _diam(predict_future, df_harian, MAX_HORIZON, output)
+
+    yield "analisis_deskriptif", ukur(lambda: analisis_deskriptif(df_harian), ulang, memori)
+    yield "plot_interaktif", ukur(lambda: plot_interaktif(df_harian, df_pred), ulang, memori)
+
+    yield from kasus_sentimen(n_sentimen, ulang, memori)
+
+
+def kasus_sentimen(n, ulang, memori):
+    from src.sentiment import MODEL_DIR, file_hilang
+
+    if n <= 0 or not MODEL_DIR.exists() or file_hilang(MODEL_DIR):
+        print("ℹ️  Sentimen dilewati (folder model_nlp tidak lengkap)", file=sys.stderr)
+        return
+    from benchmarks.bench_sentiment import teks_sintetis
+    from src.sentiment import muat_model, prediksi_batch
+
+    tokenizer, model = muat_model(MODEL_DIR)
+    teks = teks_sintetis(n)
+    prediksi_batch(tokenizer, model, teks[:32])
+    yield f"sentimen_batch[{n}]", ukur(lambda: prediksi_batch(tokenizer, model, teks), ulang, memori)
+
+
+# ============================================================
+# 2. BASELINE
+# ============================================================
+def bandingkan(nama, hasil, baseline, tol_waktu, tol_memori):
+    """Status kasus terhadap baseline: 'OK', 'BARU' atau 'REGRESI (...)'."""
+    acuan = baseline.get(nama)
+    if acuan is None:
+        return "BARU"
+    alasan = []
+    if hasil["detik"] > acuan["detik"] * (1 + tol_waktu) and hasil["detik"] - acuan["detik"] > SELISIH_MIN_DETIK:
+        alasan.append(f"waktu x{hasil['detik'] / acuan['detik']:.2f}")
+    if "peak_mb" in hasil and "peak_mb" in acuan and hasil["peak_mb"] > acuan["peak_mb"] * (1 + tol_memori) \
+            and hasil["peak_mb"] - acuan["peak_mb"] > SELISIH_MIN_MB:
+        alasan.append(f"memori x{hasil['peak_mb'] / acuan['peak_mb']:.2f}")
+    return f"REGRESI ({', '.join(alasan)})" if alasan else "OK"
+
+
+def meta():
+    return {
+        "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark skala dengan baseline.")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN_DEFAULT, help="Jumlah baris data sintetis")
+    parser.add_argument("--n-sentimen", type=int, default=2000, help="Jumlah teks sentimen (0 = lewati)")
+    parser.add_argument("--ulang", type=int, default=3)
+    parser.add_argument("--tanpa-memori", action="store_true", help="Lewati pengukuran memori (lebih cepat)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--toleransi-waktu", type=float, default=0.5, help="Batas lambat relatif (0.5 = +50%%)")
+    parser.add_argument("--toleransi-memori", type=float, default=0.2)
+    parser.add_argument("--perbarui-baseline", action="store_true", help="Tulis hasil ke file baseline")
+    parser.add_argument("--output", default=None, help="Simpan hasil run ini (JSON)")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {"hasil": {}}
+
+    hasil = {}
+    regresi = []
+    print(f"{'kasus':<38} {'detik':>9} {'baseline':>9} {'peak MB':>9} {'baseline':>9}  status")
+    for nama, h in kasus(args.ukuran, args.n_sentimen, args.ulang, not args.tanpa_memori):
+        hasil[nama] = h
+        acuan = baseline["hasil"].get(nama, {})
+        status = bandingkan(nama, h, baseline["hasil"], args.toleransi_waktu, args.toleransi_memori)
+        if status.startswith("REGRESI"):
+            regresi.append(f"{nama}: {status}")
+        print(
+            f"{nama:<38} {h['detik']:>9.4f} {acuan.get('detik', float('nan')):>9.4f} "
+            f"{h.get('peak_mb', float('nan')):>9.1f} {acuan.get('peak_mb', float('nan')):>9.1f}  {status}",
+            flush=True,
+        )
+
+    laporan = {"meta": meta(), "hasil": hasil}
+    if args.output:
+        Path(args.output).write_text(json.dumps(laporan, indent=1) + "\n", encoding="utf-8")
+    if args.perbarui_baseline:
+        # Kasus yang tidak dijalankan kali ini tetap dipertahankan
+        laporan["hasil"] = {**baseline["hasil"], **hasil}
+        baseline_path.write_text(json.dumps(laporan, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\n📌 Baseline diperbarui: {baseline_path}")
+        return 0
+
+    if regresi:
+        print("\n" + "=" * 60, file=sys.stderr)
+        print(f"❌ REGRESI PERFORMA pada {len(regresi)} kasus:", file=sys.stderr)
+        for r in regresi:
+            print(f"   - {r}", file=sys.stderr)
+        print("=" * 60, file=sys.stderr)
+        return 1
+    print("\n✅ Tidak ada regresi terhadap baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
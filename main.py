@@ -1,12 +1,7 @@
 import streamlit as st
-import pandas as pd
-import io
-import plotly.express as px
-import os
-import gdown
-from src.preprocessing import load_and_prepare_data
-from src.prediction import predict_future
-from src.visualization import plot_interaktif
+from src import app_cache, instrumen, warmup
+
+# Modul berat (plotly, transformers/torch) diimpor oleh halaman yang membutuhkannya
 
 # ======================================================
 # 🧭 KONFIGURASI HALAMAN
@@ -17,6 +12,9 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Opsional (APP_PROFIL=1): rincian waktu per tahap untuk rerun ini
+profil = instrumen.mulai_rerun()
+
 # --- Hilangkan menu dan footer Streamlit ---
 st.markdown("""
 <style>
@@ -92,29 +90,18 @@ section[data-testid="stMarkdownContainer"] h3 {
 # 📂 LOAD DATA HISTORIS
 # ======================================================
 data_path = "data/tbl_permohonan_202507221101.csv"
-df_harian = load_and_prepare_data(data_path)
+# Di-cache lintas rerun & sesi (st.cache_data); halaman tidak boleh mengubahnya di tempat
+with instrumen.span("app.muat_df_harian"):
+    df_harian = app_cache.muat_df_harian(data_path)
+
+# Opsional (APP_WARMUP=1): siapkan prediksi default & model NLP di latar
+warmup.mulai(df_harian)
 
 # ======================================================
-# 🧠 SIAPKAN MODEL NLP DARI GOOGLE DRIVE
+# 🧠 MODEL NLP
 # ======================================================
-model_folder = "model_nlp"
-os.makedirs(model_folder, exist_ok=True)
-
-# --- File hasil fine-tuning kamu di Google Drive ---
-files = {
-    "model.safetensors": "15A8wnWNUrnMaYiRqS7m8DWk39otabKY5",
-    "config.json": "1Bzfu0gz6l4tjnCqp2A_CajOnDaCaBgpp",
-    "vocab.txt": "1fIk8GsRBg0dknuSCG5q4x7AnB1cCOpqa",
-    "tokenizer_config.json": "1OG40ey5Eq53k6w-LiegBVq5ZbifYeFEl",
-    "special_tokens_map.json": "1m-3nmTaaZ0kj2R2Peo1odlzOlGHBUryr"
-}
-
-# --- Unduh semua file model kalau belum ada (tanpa tulisan apa pun) ---
-for filename, file_id in files.items():
-    url = f"https://drive.google.com/uc?id={file_id}"
-    output_path = os.path.join(model_folder, filename)
-    if not os.path.exists(output_path):
-        gdown.download(url, output_path, quiet=True)
+# Tidak diunduh di sini: halaman sentimen menyiapkan model_nlp lewat
+# src.artifacts (manifest + verifikasi) saat pertama kali dibuka.
 
 # ======================================================
 # 📊 PILIH HALAMAN
@@ -129,14 +116,20 @@ menu_choice = st.radio(
 # ======================================================
 # 🧩 TAMPILKAN HALAMAN SESUAI PILIHAN
 # ======================================================
-if menu_choice == "Analisis Data Historis":
-    import pages.analisis as analisis
-    analisis.show(df_harian)
+# Panel profil tetap tampil walau halaman berhenti lebih awal (st.stop)
+try:
+    if menu_choice == "Analisis Data Historis":
+        import pages.analisis as analisis
+        with instrumen.span("app.muat_kubus"):
+            kubus = app_cache.muat_kubus(data_path)
+        analisis.show(df_harian, kubus)
 
-elif menu_choice == "Prediksi Jumlah Permohonan":
-    import pages.prediksi as prediksi
-    prediksi.show(df_harian)
+    elif menu_choice == "Prediksi Jumlah Permohonan":
+        import pages.prediksi as prediksi
+        prediksi.show(df_harian)
 
-elif menu_choice == "Analisis Sentimen":
-    import pages.sentimen as sentimen
-    sentimen.show(df_harian)
+    elif menu_choice == "Analisis Sentimen":
+        import pages.sentimen as sentimen
+        sentimen.show(df_harian)
+finally:
+    instrumen.selesai_rerun(profil, menu_choice)
@@ -1,12 +1,29 @@
 # pages/analisis.py
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from src import app_cache, instrumen
 
-def show(df_harian):
+# Rincian grafik: label -> (dimensi kubus, kolom label, filter tahun)
+RINCIAN = {
+    "Bulan": ("bulan", "bulan_nama", "tahun"),
+    "Minggu": ("minggu", "minggu", "tahun_iso"),
+    "Hari": ("dayofweek", "hari_nama", "tahun"),
+    "Libur": ("is_holiday", "libur", "tahun"),
+    "Jenis Layanan": ("id_jenis_layanan", "layanan", "tahun"),
+}
+# Ukuran grafik: label -> kolom kubus. "Jumlah Permohonan" adalah banyaknya baris
+# sebenarnya; angka tertimbang ID layanan (definisi df_harian) hanya metrik lama.
+UKURAN = {
+    "Jumlah Permohonan": "jumlah_baris",
+    "Total Harga": "total_harga",
+    "Metrik Lama (tertimbang ID layanan)": "jumlah_permohonan",
+}
+
+def show(df_harian, kubus):
     """
     Menampilkan halaman Analisis Data Historis.
     df_harian: DataFrame hasil load dan preprocessing data historis
+    kubus: Kubus agregat (src.kubus) untuk grafik & drill-down
     """
 
     # --- CSS Tabel ---
@@ -45,16 +62,8 @@ def show(df_harian):
     """, unsafe_allow_html=True)
 
     # --- Format Tabel untuk Tampilan ---
-    df_tampil = df_harian.copy()
-    df_tampil["tahun"] = df_tampil["tahun"].astype(str)
-    df_tampil["tanggal"] = pd.to_datetime(df_tampil["tanggal"]).dt.strftime("%d %b %Y")
-    df_tampil = df_tampil.rename(columns={
-        "tanggal":"Tanggal","jumlah_permohonan":"Jumlah","hari":"Hari","bulan":"Bulan","tahun":"Tahun",
-        "is_weekend":"Weekend?","is_holiday":"Holiday?","dayofweek":"Hari ke","quarter":"Quarter",
-        "jumlah_permohonan_lag10":"Lag10","jumlah_permohonan_lag20":"Lag20","jumlah_permohonan_lag30":"Lag30",
-        "permohonan_mean10":"Mean10","permohonan_std10":"Std10","permohonan_mean20":"Mean20","permohonan_std20":"Std20",
-        "permohonan_mean30":"Mean30","permohonan_std30":"Std30"
-    })
+    # df_harian dipakai bersama (cache): jangan diubah di tempat
+    df_tampil = app_cache.tabel_historis(df_harian)
 
     # --- Judul Data Historis (lebih rapat ke atas) ---
     st.markdown("""
@@ -72,16 +81,8 @@ def show(df_harian):
     """, unsafe_allow_html=True)
 
     # --- Tabel Data Historis ---
-    st.markdown(df_tampil.tail(10).to_html(classes="custom-table", index=False), unsafe_allow_html=True)
-
-    # --- Analisis Jumlah Permohonan per Tahun ---
-    df_harian["tanggal"] = pd.to_datetime(df_harian["tanggal"])
-    df_harian["tahun"] = df_harian["tanggal"].dt.year
-    df_harian["bulan"] = df_harian["tanggal"].dt.month
-    df_pertahun_bulan = df_harian.groupby(["tahun","bulan"])["jumlah_permohonan"].sum().reset_index()
-    df_pertahun_bulan["bulan_nama"] = df_pertahun_bulan["bulan"].apply(
-        lambda x: pd.to_datetime(str(x), format="%m").strftime("%b")
-    )
+    with instrumen.span("render.tabel_html"):
+        st.markdown(df_tampil.to_html(classes="custom-table", index=False), unsafe_allow_html=True)
 
     st.markdown("""
     <h2 style="
@@ -101,34 +102,41 @@ def show(df_harian):
     col1, col2 = st.columns([3,1])
 
     with col2:
-        tahun_list = sorted(df_pertahun_bulan["tahun"].unique())
-        selected_year = st.selectbox("Pilih Tahun:", tahun_list)
+        selected_year = st.selectbox("Pilih Tahun:", kubus.tahun())
+        rincian = st.selectbox("Rincian:", list(RINCIAN))
+        ukuran_label = st.selectbox("Ukuran:", list(UKURAN))
 
     with col1:
-        df_tahun = df_pertahun_bulan[df_pertahun_bulan["tahun"] == selected_year]
+        # --- Slice kubus agregat: biaya tidak bergantung pada panjang riwayat ---
+        dimensi, x, kolom_tahun = RINCIAN[rincian]
+        ukuran = UKURAN[ukuran_label]
+        with instrumen.span("analisis.rollup"):
+            df_tahun = kubus.rollup([dimensi], **{kolom_tahun: selected_year})
+        df_tahun[x] = df_tahun[x].astype(str)
 
-        fig = px.bar(
-            df_tahun,
-            x="bulan_nama",
-            y="jumlah_permohonan",
-            text="jumlah_permohonan",
-            color="jumlah_permohonan",
-            color_continuous_scale=[
-                "rgb(220,20,60)", "rgb(135,206,250)", "rgb(0,0,205)"
-            ],
-            labels={"jumlah_permohonan": "Jumlah Permohonan", "bulan_nama": "Bulan"},
-            title=f"Jumlah Permohonan per Bulan Tahun {selected_year}"
-        )
+        with instrumen.span("render.plotly_figure"):
+            fig = px.bar(
+                df_tahun,
+                x=x,
+                y=ukuran,
+                text=ukuran,
+                color=ukuran,
+                color_continuous_scale=[
+                    "rgb(220,20,60)", "rgb(135,206,250)", "rgb(0,0,205)"
+                ],
+                labels={ukuran: ukuran_label, x: rincian},
+                title=f"{ukuran_label} per {rincian} Tahun {selected_year}"
+            )
 
         # --- Atur tampilan teks batang ---
         fig.update_traces(
             textposition="outside",
-            texttemplate="%{text}",
+            texttemplate="%{text:,.0f}" if ukuran == "total_harga" else "%{text}",
             textfont=dict(color="rgb(50,50,50)", size=12)
         )
 
         # --- Sumbu Y diperpanjang ---
-        y_max = df_tahun["jumlah_permohonan"].max() * 1.4  # diperbesar dari 1.15 ke 1.4
+        y_max = df_tahun[ukuran].max() * 1.4  # diperbesar dari 1.15 ke 1.4
 
         # --- Layout ---
         fig.update_layout(
@@ -155,4 +163,5 @@ def show(df_harian):
             )]
         )
 
-        st.plotly_chart(fig, use_container_width=True)
+        with instrumen.span("render.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
@@ -2,8 +2,9 @@ import streamlit as st
 import pandas as pd
 import io
 import base64
-import plotly.express as px
-from src.prediction import predict_future
+from src import app_cache, instrumen
+from src.forecast_cache import id_job_prediksi, tugas_prediksi
+from src.jobs import get_jobs
 
 def show(df_harian):
     # =============================
@@ -110,11 +111,33 @@ def show(df_harian):
         n_forecast = st.slider("Berapa hari ke depan yang ingin diprediksi?", 1, 7, 7)
         predict_btn = st.button("🚀 Jalankan Prediksi", use_container_width=True)
 
+    # Prediksi berjalan sebagai job latar belakang; rerun karena widget lain
+    # tidak mengulang atau mematikan pekerjaan yang sedang berjalan
+    jobs = get_jobs()
+    if predict_btn:
+        job_id = id_job_prediksi(df_harian, n_forecast)
+        jobs.submit("prediksi", tugas_prediksi, df_harian, n_forecast, job_id=job_id, param={"n_forecast": n_forecast})
+        # Disimpan juga di URL agar hasil tetap tampil setelah browser di-refresh
+        st.session_state["job_prediksi"] = job_id
+        st.query_params["job_prediksi"] = job_id
+        st.session_state["df_pred"] = None
+
+    @st.fragment(run_every=0.5)
+    def pantau_job(job_id):
+        job = jobs.get(job_id)
+        if job is None or not job.aktif:
+            st.rerun()
+        st.progress(job.progress, text=f"🔮 Sedang memprediksi {job.param['n_forecast']} hari ke depan...")
+
     with col_table:
         st.markdown("<div style='margin-top:-5px'></div>", unsafe_allow_html=True)
-        if predict_btn:
-            with st.spinner(f"🔮 Sedang memprediksi {n_forecast} hari ke depan..."):
-                df_pred = predict_future(df_harian, n_forecast=n_forecast)
+        job = jobs.get(st.session_state.get("job_prediksi") or st.query_params.get("job_prediksi", ""))
+        if job is not None and job.aktif:
+            pantau_job(job.id)
+        elif job is not None and job.status == "selesai":
+            # Salinan: hasil job dipakai bersama sesi lain
+            df_pred = job.hasil.copy() if job.hasil is not None else None
+            n_forecast = job.param["n_forecast"]
 
             if df_pred is not None and not df_pred.empty:
                 df_pred["tanggal"] = pd.to_datetime(df_pred["tanggal"])
@@ -126,17 +149,21 @@ def show(df_harian):
                 })
 
                 # Tombol download
-                csv_buffer = io.StringIO()
-                df_tampil.to_csv(csv_buffer, index=False)
-                b64 = base64.b64encode(csv_buffer.getvalue().encode()).decode()
-                table_html = df_tampil.to_html(index=False, classes="custom-table", justify="center", border=0)
-                download_link = f'<a href="data:text/csv;base64,{b64}" download="prediksi_{n_forecast}_hari.csv" class="download-icon" title="Download CSV">⬇️</a>'
-                st.markdown(f"<div class='table-wrapper'>{table_html}{download_link}</div>", unsafe_allow_html=True)
+                with instrumen.span("render.tabel_html"):
+                    csv_buffer = io.StringIO()
+                    df_tampil.to_csv(csv_buffer, index=False)
+                    b64 = base64.b64encode(csv_buffer.getvalue().encode()).decode()
+                    table_html = df_tampil.to_html(index=False, classes="custom-table", justify="center", border=0)
+                    download_link = f'<a href="data:text/csv;base64,{b64}" download="prediksi_{n_forecast}_hari.csv" class="download-icon" title="Download CSV">⬇️</a>'
+                    st.markdown(f"<div class='table-wrapper'>{table_html}{download_link}</div>", unsafe_allow_html=True)
+                st.caption(f"Versi model: {df_pred.attrs.get('versi_model', '-')}")
 
                 st.session_state["df_pred"] = df_pred
                 st.session_state["n_forecast"] = n_forecast
             else:
                 st.warning("❗ Data hasil prediksi kosong atau tidak valid.")
+        elif job is not None and job.status == "gagal":
+            st.error(f"❌ Gagal menjalankan prediksi: {job.error}")
         else:
             st.info("Pilih jumlah hari dan tekan **🚀 Jalankan Prediksi** untuk melihat hasil.")
 
@@ -165,31 +192,29 @@ def show(df_harian):
         """, unsafe_allow_html=True)
 
         # --- Data untuk grafik ---
-        df_harian["tanggal"] = pd.to_datetime(df_harian["tanggal"])
-        df_2025 = df_harian[df_harian['tanggal'].dt.year == 2025].copy()
-
-        if not df_2025.empty:
-            df_recent = df_2025[df_2025['tanggal'] >= (df_2025['tanggal'].max() - pd.Timedelta(days=30))]
-        else:
-            df_recent = df_harian.tail(30)
+        # df_harian dipakai bersama (cache): jangan diubah di tempat
+        df_recent = app_cache.riwayat_grafik(df_harian)
 
         df_plot = pd.concat([
-            df_recent[['tanggal', 'jumlah_permohonan']].rename(columns={'jumlah_permohonan': 'Jumlah'}),
+            df_recent,
             df_pred[['tanggal', 'jumlah_permohonan_prediksi']].rename(columns={'jumlah_permohonan_prediksi': 'Jumlah'})
         ], axis=0)
         df_plot['Tipe'] = ['Aktual'] * len(df_recent) + ['Prediksi'] * len(df_pred)
 
-        # --- Grafik Plotly ---
-        fig = px.line(
-            df_plot,
-            x='tanggal',
-            y='Jumlah',
-            color='Tipe',
-            markers=True,
-            text='Jumlah',
-            labels={'tanggal': 'Tanggal', 'Jumlah': 'Jumlah Permohonan'},
-            hover_data={'tanggal': True, 'Jumlah': True, 'Tipe': True}
-        )
+        # --- Grafik Plotly (diimpor di sini: hanya perlu setelah ada hasil prediksi) ---
+        with instrumen.span("render.plotly_figure"):
+            import plotly.express as px
+
+            fig = px.line(
+                df_plot,
+                x='tanggal',
+                y='Jumlah',
+                color='Tipe',
+                markers=True,
+                text='Jumlah',
+                labels={'tanggal': 'Tanggal', 'Jumlah': 'Jumlah Permohonan'},
+                hover_data={'tanggal': True, 'Jumlah': True, 'Tipe': True}
+            )
 
         # --- Tampilkan angka & pertebal garis ---
         fig.update_traces(
@@ -230,4 +255,5 @@ def show(df_harian):
             ]
         )
 
-        st.plotly_chart(fig, use_container_width=True)
+        with instrumen.span("render.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
@@ -1,8 +1,15 @@
 import streamlit as st
 import pandas as pd
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
 import os
+import tempfile
+from src import app_cache
+from src.artifacts import get_artifacts
+from src.jobs import get_jobs
+from src.sentiment import (
+    MODEL_DIR, JUMLAH_PRATINJAU, sidik_model, prediksi_batch,
+    id_job_csv, tugas_analisis_csv
+)
+from src.sentiment_pool import get_model
 
 def show(df_harian=None):
     # =============================
@@ -81,32 +88,110 @@ def show(df_harian=None):
     # =============================
     # 🧠 LOAD MODEL
     # =============================
-    model_dir = os.path.abspath("model_nlp")
+    # Model diunduh & diverifikasi di thread latar saat halaman ini pertama dibuka;
+    # halaman lain tidak ikut menunggu
+    artefak = get_artifacts()
+    if not artefak.siap():
+        artefak.mulai_latar()
 
-    if not os.path.exists(model_dir):
-        st.error("❌ Folder 'model_nlp' tidak ditemukan. Pastikan sudah ada di direktori utama aplikasi.")
-        st.stop()
-
-    required_files = ["model.safetensors", "config.json", "tokenizer_config.json", "vocab.txt"]
-    missing_files = [f for f in required_files if not os.path.exists(os.path.join(model_dir, f))]
+        @st.fragment(run_every=1.0)
+        def pantau_artefak():
+            if artefak.keadaan != "berjalan":
+                st.rerun()
+            st.progress(artefak.progress, text=f"📥 Menyiapkan model NLP... {artefak.pesan}")
 
-    if missing_files:
-        st.error(f"❌ File berikut hilang di folder model_nlp: {', '.join(missing_files)}")
+        if artefak.keadaan == "gagal":
+            st.error(f"❌ Model NLP tidak bisa disiapkan: {artefak.pesan}")
+            if st.button("🔁 Coba lagi"):
+                artefak.keadaan = "belum"
+                st.rerun()
+        else:
+            pantau_artefak()
         st.stop()
 
-    @st.cache_resource
-    def load_model():
-        tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
-        model = AutoModelForSequenceClassification.from_pretrained(model_dir, local_files_only=True)
-        model.eval()
-        return tokenizer, model
-
     try:
-        tokenizer, model = load_model()
+        # Sudah dimuat lebih dulu jika warm-up server aktif (APP_WARMUP=1)
+        tokenizer, model = get_model()
+        cache = app_cache.sentimen_cache()
+        pool = app_cache.sentimen_pool()
     except Exception as e:
         st.error(f"❌ Gagal memuat model lokal: {e}")
         st.stop()
 
+    # =============================
+    # ⏳ JOB ANALISIS MASSAL (LATAR BELAKANG)
+    # =============================
+    jobs = get_jobs()
+
+    def simpan_input(folder, isi):
+        path = folder / "input.csv"
+        if path.exists():
+            return
+        folder.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(isi)
+        os.replace(tmp, path)
+
+    def jalankan_job(job_id, kolom):
+        jobs.submit(
+            "sentimen", tugas_analisis_csv, tokenizer, model,
+            job_id=job_id, param={"kolom": kolom}, persist=True, cache=cache, pool=pool,
+        )
+        st.session_state["job_sentimen"] = job_id
+        st.query_params["job_sentimen"] = job_id
+
+    @st.fragment(run_every=1.0)
+    def pantau_job(job_id):
+        job = jobs.get(job_id)
+        if job is None or not job.aktif:
+            st.rerun()
+        st.progress(job.progress, text=f"Sedang menganalisis... {job.pesan}")
+        if st.button("⛔ Batalkan", use_container_width=True):
+            jobs.batal(job_id)
+
+    def tampilkan_job(job_id):
+        job = jobs.get(job_id)
+        if job is None:
+            return
+        if job.aktif:
+            pantau_job(job_id)
+            return
+
+        hasil_path = job.folder / "hasil.csv"
+        if job.status == "selesai" and hasil_path.exists():
+            hasil = job.hasil
+            st.success("✅ Analisis selesai!")
+            if hasil["detik"] > 0:
+                st.caption(
+                    f"{hasil['baris']} baris dalam {hasil['detik']:.1f} detik "
+                    f"({hasil['baris'] / hasil['detik']:.0f} baris/detik) · "
+                    f"{hasil['teks_unik']} teks unik, {hasil['dari_cache']} diambil dari cache"
+                )
+
+            st.dataframe(pd.read_csv(hasil_path, dtype=str, keep_default_na=False, nrows=JUMLAH_PRATINJAU))
+            # hasil.csv baru dibaca (dan masuk media store) setelah pengguna meminta,
+            # lalu dilepas lagi begitu diunduh; rerun biasa tidak menyentuh file
+            kunci = f"unduh_{job_id}"
+            if not st.session_state.get(kunci):
+                if st.button("📦 Siapkan Unduhan", use_container_width=True):
+                    st.session_state[kunci] = True
+                    st.rerun()
+            else:
+                st.download_button(
+                    "⬇️ Unduh Hasil Analisis", hasil_path.read_bytes(), "hasil_sentimen.csv", "text/csv",
+                    use_container_width=True, on_click=lambda: st.session_state.pop(kunci, None),
+                )
+            return
+
+        if job.status == "gagal":
+            st.error(f"❌ Terjadi kesalahan saat analisis: {job.error}")
+        else:
+            st.warning(f"⏸️ Analisis berhenti di {job.progress:.0%}. Hasil sementara tersimpan.")
+        if (job.folder / "input.csv").exists() and st.button("▶️ Lanjutkan Analisis", use_container_width=True):
+            jalankan_job(job_id, job.param["kolom"])
+            st.rerun()
+
     # =============================
     # 🧩 LAYOUT UTAMA
     # =============================
@@ -140,11 +225,7 @@ def show(df_harian=None):
             else:
                 with st.spinner("Sedang menganalisis..."):
                     try:
-                        inputs = tokenizer(user_input, return_tensors="pt", truncation=True, padding=True)
-                        with torch.no_grad():
-                            outputs = model(**inputs)
-                            probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                            pred = torch.argmax(probs, dim=1).item()
+                        pred = prediksi_batch(tokenizer, model, [user_input], cache=cache).pred[0]
 
                         label_map = {
                             0: ("Negatif 😠", "result-negative"),
@@ -187,7 +268,9 @@ def show(df_harian=None):
 
         if uploaded_file:
             try:
-                df = pd.read_csv(uploaded_file)
+                # Hanya beberapa baris untuk pratinjau; isi lengkap dibaca per chunk saat analisis
+                df = pd.read_csv(uploaded_file, nrows=JUMLAH_PRATINJAU)
+                uploaded_file.seek(0)
                 st.write("📄 Pratinjau data:")
                 st.dataframe(df.head())
             except Exception as e:
@@ -197,21 +280,12 @@ def show(df_harian=None):
             text_column = st.selectbox("Pilih kolom teks untuk dianalisis:", options=df.columns)
 
             if st.button("🚀 Jalankan Analisis", use_container_width=True):
-                with st.spinner("Sedang menganalisis seluruh teks..."):
-                    def analyze_text(text):
-                        try:
-                            inputs = tokenizer(str(text), return_tensors="pt", truncation=True, padding=True)
-                            with torch.no_grad():
-                                outputs = model(**inputs)
-                                probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                                pred = torch.argmax(probs, dim=1).item()
-                            return {0: "Negatif 😠", 1: "Netral 😐", 2: "Positif 😊"}.get(pred, "Tidak diketahui")
-                        except Exception:
-                            return "Error"
-
-                    df["Sentimen"] = df[text_column].apply(analyze_text)
-                    st.success("✅ Analisis selesai!")
-
-                    st.dataframe(df.head(10))
-                    csv = df.to_csv(index=False).encode("utf-8")
-                    st.download_button("⬇️ Unduh Hasil Analisis", csv, "hasil_sentimen.csv", "text/csv", use_container_width=True)
+                # File, kolom & model yang sama -> job yang sama (lanjut dari checkpoint bila terhenti)
+                job_id = id_job_csv(uploaded_file.getvalue(), text_column, sidik_model(MODEL_DIR))
+                simpan_input(jobs.folder(job_id), uploaded_file.getvalue())
+                jalankan_job(job_id, text_column)
+
+        # Job disimpan di session_state & URL agar tetap terpantau setelah rerun/refresh
+        job_id = st.session_state.get("job_sentimen") or st.query_params.get("job_sentimen")
+        if job_id:
+            tampilkan_job(job_id)
@@ -0,0 +1,139 @@
+"""
+Lapisan cache Streamlit untuk halaman-halaman aplikasi.
+
+- st.cache_data: produk data immutable (df_harian, kubus agregat, tabel & data grafik).
+  Streamlit menyimpan hasil ter-pickle dan memberi tiap pemanggil salinannya
+  sendiri, sehingga halaman tidak bisa merusak data sesi lain. Dibatasi TTL dan
+  jumlah entri agar memori tidak tumbuh tanpa batas.
+- st.cache_resource: objek bersama yang tidak boleh disalin (pool proses,
+  koneksi cache SQLite). Model prediksi/scaler (get_registry), model sentimen
+  (get_model), job (get_jobs) dan artefak (get_artifacts) sudah berupa instance
+  tunggal per proses karena juga dipakai di luar Streamlit (CLI, job, warm-up).
+- Prediksi di-cache oleh ForecastCache (LRU + Parquet, berkunci versi model),
+  bukan st.cache_data, agar model yang diganti di disk langsung dipakai.
+
+Tiap fungsi mencatat jumlah eksekusi sebenarnya (cache miss) di statistik().
+"""
+import os
+import threading
+from collections import Counter
+
+import pandas as pd
+import streamlit as st
+
+from src.kubus import load_kubus
+from src.preprocessing import load_and_prepare_data
+
+# ============================================================
+# 1. KONFIGURASI
+# ============================================================
+TTL_DATA = int(os.environ.get("APP_CACHE_TTL", "3600"))
+MAX_ENTRI_DATA = 16
+JUMLAH_TABEL = 10
+HARI_GRAFIK = 30
+
+_miss = Counter()
+_miss_lock = threading.Lock()
+
+
+def _catat_miss(nama):
+    with _miss_lock:
+        _miss[nama] += 1
+
+
+def statistik():
+    """Jumlah eksekusi (cache miss) per fungsi di proses ini."""
+    with _miss_lock:
+        return dict(_miss)
+
+
+# ============================================================
+# 2. PRODUK DATA (st.cache_data)
+# ============================================================
+def muat_df_harian(data_path):
+    """df_harian untuk path data; cache ikut berganti saat file sumber berubah."""
+    st_file = os.stat(data_path)
+    return _df_harian(str(data_path), st_file.st_size, st_file.st_mtime_ns)
+
+
+@st.cache_data(ttl=TTL_DATA, max_entries=MAX_ENTRI_DATA, show_spinner=False)
+def _df_harian(data_path, ukuran, mtime_ns):
+    # ukuran & mtime_ns hanya bagian dari kunci cache (nama berawalan _ tidak ikut di-hash Streamlit)
+    _catat_miss("df_harian")
+    return load_and_prepare_data(data_path)
+
+
+def muat_kubus(data_path):
+    """Kubus agregat (src.kubus) untuk path data, dengan kunci cache seperti muat_df_harian."""
+    st_file = os.stat(data_path)
+    return _kubus(str(data_path), st_file.st_size, st_file.st_mtime_ns)
+
+
+@st.cache_data(ttl=TTL_DATA, max_entries=MAX_ENTRI_DATA, show_spinner=False)
+def _kubus(data_path, ukuran, mtime_ns):
+    _catat_miss("kubus")
+    return load_kubus(data_path)
+
+
+@st.cache_data(ttl=TTL_DATA, max_entries=MAX_ENTRI_DATA, show_spinner=False)
+def tabel_historis(df_harian, n=JUMLAH_TABEL):
+    """n hari terakhir df_harian, diformat untuk tabel halaman analisis."""
+    _catat_miss("tabel_historis")
+    # Hanya n baris yang ditampilkan yang disalin & diformat, bukan seluruh riwayat
+    df_tampil = df_harian.tail(n).copy()
+    df_tampil["tahun"] = df_tampil["tahun"].astype(str)
+    df_tampil["tanggal"] = df_tampil["tanggal"].dt.strftime("%d %b %Y")
+    return df_tampil.rename(columns={
+        "tanggal": "Tanggal", "jumlah_permohonan": "Jumlah", "hari": "Hari", "bulan": "Bulan", "tahun": "Tahun",
+        "is_weekend": "Weekend?", "is_holiday": "Holiday?", "dayofweek": "Hari ke", "quarter": "Quarter",
+        "jumlah_permohonan_lag10": "Lag10", "jumlah_permohonan_lag20": "Lag20", "jumlah_permohonan_lag30": "Lag30",
+        "permohonan_mean10": "Mean10", "permohonan_std10": "Std10", "permohonan_mean20": "Mean20",
+        "permohonan_std20": "Std20", "permohonan_mean30": "Mean30", "permohonan_std30": "Std30",
+    })
+
+
+@st.cache_data(ttl=TTL_DATA, max_entries=MAX_ENTRI_DATA, show_spinner=False)
+def riwayat_grafik(df_harian, hari=HARI_GRAFIK, tahun=2025):
+    """
+    Data aktual untuk grafik prediksi: `hari` hari terakhir pada `tahun`
+    (atau ekor data jika tahun itu tidak ada), kolom tanggal & Jumlah.
+    """
+    _catat_miss("riwayat_grafik")
+    # Pilih baris dulu lewat mask pada kolom tanggal; hanya baris terpilih yang disalin
+    tanggal = df_harian["tanggal"]
+    di_tahun = tanggal.dt.year == tahun
+    if di_tahun.any():
+        baris = di_tahun & (tanggal >= tanggal[di_tahun].max() - pd.Timedelta(days=hari))
+        df = df_harian.loc[baris, ["tanggal", "jumlah_permohonan"]]
+    else:
+        df = df_harian.tail(hari)[["tanggal", "jumlah_permohonan"]]
+    return df.rename(columns={"jumlah_permohonan": "Jumlah"})
+
+
+# ============================================================
+# 3. RESOURCE BERSAMA (st.cache_resource)
+# ============================================================
+@st.cache_resource(show_spinner=False)
+def sentimen_pool():
+    """Worker analisis massal (dipakai bersama semua sesi); None = tanpa pool."""
+    from src.sentiment import MODEL_DIR
+    from src.sentiment_pool import SentimenPool, konfigurasi
+
+    _catat_miss("sentimen_pool")
+    cfg = konfigurasi()
+    if cfg["workers"] == 0:
+        return None
+    pool = SentimenPool(MODEL_DIR, n_workers=cfg["workers"], threads_per_worker=cfg["threads_per_worker"])
+    # Spawn worker & muat model sekarang, bukan saat job CSV pertama
+    pool.mulai_latar()
+    return pool
+
+
+@st.cache_resource(show_spinner=False)
+def sentimen_cache():
+    """Hasil per teks ternormalisasi, tersimpan lintas sesi & restart."""
+    from src.sentiment import MODEL_DIR, sidik_model
+    from src.sentiment_cache import SentimenCache
+
+    _catat_miss("sentimen_cache")
+    return SentimenCache(sidik_model(MODEL_DIR))
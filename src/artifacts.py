@@ -0,0 +1,317 @@
+"""
+Pengelola artefak model NLP (model_nlp/): unduh sekali, verifikasi, dan siapkan
+di latar belakang saat halaman sentimen pertama kali membutuhkannya.
+
+Contoh:
+    python -m src.artifacts                 # unduh/verifikasi, tampilkan status
+    python -m src.artifacts --mirror /mnt/model_nlp --offline
+    python -m src.artifacts --pin           # patok ukuran & SHA-256 salinan tepercaya ke manifest
+
+Selama manifest belum dipatok, file diterima apa adanya (folder yang sudah ada
+dipakai, file yang hilang diunduh) seperti sebelum ada manifest; begitu
+dipatok, hanya file yang ukuran & SHA-256-nya cocok yang dianggap valid.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# ============================================================
+# 1. KONFIGURASI
+# ============================================================
+MANIFEST_PATH = Path("models/model_nlp_manifest.json")
+
+# MODEL_NLP_MIRROR: folder lokal atau URL dasar (http/https) berisi file-file yang sama
+# MODEL_NLP_OFFLINE=1: jangan pernah mengunduh dari internet (hanya folder model/mirror)
+MIRROR = os.environ.get("MODEL_NLP_MIRROR") or None
+OFFLINE = os.environ.get("MODEL_NLP_OFFLINE", "").lower() in ("1", "true", "ya")
+
+# Catatan verifikasi di dalam folder model: file yang stat-nya tidak berubah tidak di-hash ulang.
+# Acuan selalu ukuran & SHA-256 di manifest; file yang belum dipatok cukup ada & tidak kosong.
+CATATAN = ".verifikasi.json"
+# Status file yang boleh dipakai halaman/warm-up
+STATUS_SIAP = ("ok", "belum dipatok")
+BLOK = 1 << 20
+
+
+# ============================================================
+# 2. PEMERIKSAAN FILE
+# ============================================================
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(BLOK), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+# ============================================================
+# 3. PENGELOLA ARTEFAK
+# ============================================================
+class ArtifactManager:
+    """
+    Menyiapkan folder model sesuai manifest (ukuran & SHA-256 per file).
+
+    File diunduh ke file sementara di folder yang sama, diverifikasi, lalu
+    di-rename; file setengah jadi tidak pernah muncul dengan nama aslinya.
+    Sumber dicoba berurutan: mirror (folder/URL), lalu Google Drive (kecuali offline).
+    """
+
+    def __init__(self, manifest_path=MANIFEST_PATH, folder=None, mirror=MIRROR, offline=OFFLINE):
+        self.manifest_path = Path(manifest_path)
+        self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        self.folder = Path(folder or self.manifest["folder"])
+        self.mirror = mirror
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._thread = None
+        self.keadaan = "belum"      # belum | berjalan | siap | gagal
+        self.progress = 0.0
+        self.pesan = ""
+
+    # --- Verifikasi ---
+    def _baca_catatan(self):
+        try:
+            return json.loads((self.folder / CATATAN).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _tulis_catatan(self, catatan):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.folder, prefix=".verifikasi-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(catatan, f, indent=1)
+        os.replace(tmp, self.folder / CATATAN)
+
+    def belum_dipatok(self):
+        """Nama file yang ukuran/SHA-256-nya belum tercatat di manifest."""
+        return [n for n, spek in self.manifest["files"].items() if not spek.get("size") or not spek.get("sha256")]
+
+    def _periksa(self, nama, path, catatan, hash_ulang=False):
+        """
+        Entri catatan untuk file di path jika ukuran & SHA-256 sesuai manifest,
+        None jika tidak. Untuk file yang belum dipatok cukup ada dan tidak
+        kosong (tanpa hash). File yang stat-nya sama dengan catatan tidak di-hash ulang.
+        """
+        spek = self.manifest["files"][nama]
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if not spek.get("size") or not spek.get("sha256"):
+            return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": None} if st.st_size else None
+        if st.st_size != spek["size"]:
+            return None
+
+        lama = catatan.get(nama)
+        # Catatan dari masa belum dipatok (sha256 None) tidak bisa dipakai: hash ulang
+        if not hash_ulang and lama and lama["sha256"] and (lama["size"], lama["mtime_ns"]) == (st.st_size, st.st_mtime_ns):
+            return lama if lama["sha256"] == spek["sha256"] else None
+
+        if sha256_file(path) != spek["sha256"]:
+            return None
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": spek["sha256"]}
+
+    def _tercatat(self, nama, path, catatan):
+        """True jika file sudah pernah diverifikasi dan stat-nya belum berubah (tanpa hash)."""
+        lama = catatan.get(nama)
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        return bool(lama) and (lama["size"], lama["mtime_ns"]) == (st.st_size, st.st_mtime_ns) \
+            and lama["sha256"] == self.manifest["files"][nama]["sha256"]
+
+    def status(self, hash=True):
+        """
+        Dict nama file -> 'ok' | 'hilang' | 'rusak' | 'belum dipatok' | 'belum diverifikasi'.
+        'belum dipatok' berarti file ada tetapi manifest belum memuat hash-nya
+        (diterima, lihat STATUS_SIAP). hash=False hanya memakai stat: file yang
+        belum tercatat di catatan verifikasi dilaporkan 'belum diverifikasi'
+        alih-alih di-hash di tempat.
+        """
+        catatan = self._baca_catatan()
+        belum = set(self.belum_dipatok())
+        hasil, berubah = {}, False
+        for nama in self.manifest["files"]:
+            path = self.folder / nama
+            if not hash and nama not in belum and path.exists() and not self._tercatat(nama, path, catatan):
+                hasil[nama] = "belum diverifikasi"
+                continue
+            entri = self._periksa(nama, path, catatan) if path.exists() else None
+            if entri:
+                hasil[nama] = "belum dipatok" if nama in belum else "ok"
+            else:
+                hasil[nama] = "rusak" if path.exists() else "hilang"
+            if entri and entri is not catatan.get(nama):
+                catatan[nama] = entri
+                berubah = True
+        if berubah:
+            # Simpan hasil hash agar pengecekan berikutnya cukup stat
+            try:
+                self._tulis_catatan(catatan)
+            except OSError:
+                pass
+        return hasil
+
+    def siap(self):
+        """
+        Cek cepat (hanya stat, tidak pernah hash) bahwa semua file sudah
+        terverifikasi; file yang belum diverifikasi di-hash oleh mulai_latar().
+        """
+        return all(s in STATUS_SIAP for s in self.status(hash=False).values())
+
+    # --- Pengambilan ---
+    def _ambil(self, nama, tujuan):
+        """Salin/unduh satu file ke path tujuan (file sementara)."""
+        spek = self.manifest["files"][nama]
+        if self.mirror and not self.mirror.startswith(("http://", "https://")):
+            sumber = Path(self.mirror) / nama
+            if sumber.exists():
+                shutil.copyfile(sumber, tujuan)
+                return
+        if self.mirror and self.mirror.startswith(("http://", "https://")):
+            from urllib.request import urlopen
+
+            with urlopen(f"{self.mirror.rstrip('/')}/{nama}", timeout=60) as r, open(tujuan, "wb") as f:
+                shutil.copyfileobj(r, f, BLOK)
+            return
+        if self.offline:
+            raise FileNotFoundError(f"{nama} tidak ada di folder model/mirror dan mode offline aktif")
+
+        import gdown
+
+        hasil = gdown.download(f"https://drive.google.com/uc?id={spek['gdrive_id']}", str(tujuan), quiet=True)
+        if hasil is None:
+            raise OSError(f"Gagal mengunduh {nama} dari Google Drive")
+
+    def pastikan(self):
+        """Unduh & verifikasi semua file yang belum valid (blocking). Mengembalikan folder model."""
+        with self._lock:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            catatan = self._baca_catatan()
+            nama_file = list(self.manifest["files"])
+            for i, nama in enumerate(nama_file):
+                self.progress = i / len(nama_file)
+                self.pesan = f"Memeriksa {nama}"
+                path = self.folder / nama
+                entri = self._periksa(nama, path, catatan) if path.exists() else None
+                if entri is None:
+                    self.pesan = f"Mengambil {nama}"
+                    fd, tmp = tempfile.mkstemp(dir=self.folder, prefix=f".{nama}-", suffix=".part")
+                    os.close(fd)
+                    try:
+                        self._ambil(nama, tmp)
+                        entri = self._periksa(nama, Path(tmp), catatan, hash_ulang=True)
+                        if entri is None:
+                            raise ValueError(f"{nama} hasil unduhan kosong atau tidak sesuai manifest (ukuran/SHA-256)")
+                        os.chmod(tmp, 0o644)
+                        os.replace(tmp, path)
+                        entri["mtime_ns"] = path.stat().st_mtime_ns
+                    finally:
+                        if os.path.exists(tmp):
+                            os.remove(tmp)
+                catatan[nama] = entri
+                self._tulis_catatan(catatan)
+
+            self.progress = 1.0
+            self.pesan = "Model siap"
+            return self.folder
+
+    # --- Latar belakang ---
+    def mulai_latar(self):
+        """
+        Jalankan pastikan() di thread latar; halaman bisa memantau keadaan/progress.
+        Setelah gagal tidak dicoba ulang otomatis sampai keadaan dikembalikan ke "belum".
+        """
+        with self._lock:
+            if self.keadaan in ("berjalan", "gagal") or (self._thread and self._thread.is_alive()):
+                return self.keadaan
+            self.keadaan = "berjalan"
+            self._thread = threading.Thread(target=self._latar, name="artefak-model", daemon=True)
+            self._thread.start()
+            return self.keadaan
+
+    def _latar(self):
+        try:
+            self.pastikan()
+        except Exception as e:
+            self.keadaan = "gagal"
+            self.pesan = str(e)
+        else:
+            self.keadaan = "siap"
+
+    # --- Patok hash ---
+    def pin(self):
+        """
+        Tulis ukuran & SHA-256 file yang ada sekarang di folder ke manifest.
+        Hanya untuk salinan yang sudah diketahui benar: isinya menjadi acuan.
+        """
+        hilang = [n for n in self.manifest["files"] if not (self.folder / n).exists()]
+        if hilang:
+            raise FileNotFoundError(f"Tidak bisa mematok, file tidak ada di {self.folder}: {', '.join(hilang)}")
+        for nama, spek in self.manifest["files"].items():
+            path = self.folder / nama
+            spek["size"] = path.stat().st_size
+            spek["sha256"] = sha256_file(path)
+        # Tulis atomik seperti catatan verifikasi: manifest tidak pernah setengah jadi
+        fd, tmp = tempfile.mkstemp(dir=self.manifest_path.parent, prefix=".manifest-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.manifest, indent=2) + "\n")
+            os.replace(tmp, self.manifest_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_artifacts():
+    """ArtifactManager bersama untuk proses ini."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ArtifactManager()
+        return _manager
+
+
+# ============================================================
+# 4. ENTRY POINT
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Unduh & verifikasi artefak model NLP.")
+    parser.add_argument("--manifest", default=str(MANIFEST_PATH))
+    parser.add_argument("--folder", default=None, help="Folder model (default: dari manifest)")
+    parser.add_argument("--mirror", default=MIRROR, help="Folder lokal atau URL dasar mirror")
+    parser.add_argument("--offline", action="store_true", default=OFFLINE, help="Jangan unduh dari internet")
+    parser.add_argument("--pin", action="store_true", help="Tulis ukuran & SHA-256 file saat ini ke manifest")
+    args = parser.parse_args(argv)
+
+    manager = ArtifactManager(args.manifest, args.folder, args.mirror, args.offline)
+    try:
+        if args.pin:
+            # Patok dulu dari salinan lokal yang tepercaya, baru verifikasi terhadap hasilnya
+            manager.pin()
+            print(f"📌 Hash dipatok di {args.manifest}")
+        manager.pastikan()
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    for nama, st in manager.status().items():
+        print(f"{'✅' if st == 'ok' else '⚠️' if st in STATUS_SIAP else '❌'} {nama}: {st}")
+    if manager.belum_dipatok():
+        print("⚠️ Manifest belum dipatok; file tidak diverifikasi. Jalankan --pin pada salinan tepercaya.",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
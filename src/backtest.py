@@ -0,0 +1,165 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.model_registry import get_registry
+from src.prediction import ENGINE, prediksi_rekursif_batch
+
+# ============================================================
+# 1. PREDIKSI REKURSIF TERVEKTORISASI (BANYAK ORIGIN SEKALIGUS)
+# ============================================================
+KAPASITAS = ENGINE.kapasitas
+
+
+def prediksi_batch(bundle, nilai, tanggal, origin_idx, horizon=7):
+    """
+    Jalankan prediksi rekursif untuk banyak origin secara serempak.
+    nilai/tanggal: seluruh riwayat; origin_idx: indeks baris terakhir yang
+    diketahui tiap origin (minimal KAPASITAS - 1). Mengembalikan array
+    (n_origin x horizon).
+    """
+    origin_idx = np.asarray(origin_idx)
+    offset = np.arange(-KAPASITAS + 1, 1)
+    riwayat = nilai[origin_idx[:, None] + offset]
+    return prediksi_rekursif_batch(bundle, riwayat, tanggal[origin_idx], horizon)
+
+
+# ============================================================
+# 2. WORKER PROSES (RIWAYAT DIBAGI LEWAT SHARED MEMORY)
+# ============================================================
+_worker = {}
+
+
+def _init_worker(shm_nilai, shm_tanggal, n, model_dir, backend):
+    # Riwayat hanya di-attach (read-only), tidak disalin ke tiap worker
+    for nama, shm_name, dtype in [("nilai", shm_nilai, np.float64), ("tanggal", shm_tanggal, "datetime64[ns]")]:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        arr = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+        arr.flags.writeable = False
+        _worker[nama] = arr
+        _worker[f"shm_{nama}"] = shm
+    _worker["bundle"] = get_registry(model_dir, backend).get()
+
+
+def _jalankan_blok(origin_idx, horizon):
+    return prediksi_batch(_worker["bundle"], _worker["nilai"], _worker["tanggal"], origin_idx, horizon)
+
+
+def _ke_shared(arr):
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    return shm
+
+
+# ============================================================
+# 3. BACKTEST ROLLING-ORIGIN
+# ============================================================
+def backtest(df_harian, horizon=7, step=1, n_jobs=None, model_dir="models", blok=256, backend=None, mulai=None):
+    """
+    Uji ulang forecaster dari banyak tanggal cut-off historis.
+
+    Untuk setiap origin (setiap `step` baris), model memprediksi `horizon` hari
+    ke depan hanya dari riwayat sampai origin tersebut, lalu dibandingkan dengan
+    data aktual. Tanggal tanpa permohonan (tidak ada di df_harian) dihitung 0.
+    backend: backend forecaster (default APP_FORECASTER); mulai: hanya origin
+    pada/setelah tanggal ini (mis. periode uji di luar data latih).
+
+    Mengembalikan (df_detail, df_ringkasan): detail per origin & horizon, dan
+    MAE / MAPE / RMSE per horizon. MAPE hanya dihitung pada nilai aktual > 0.
+    """
+    df_harian = df_harian.sort_values("tanggal")
+    nilai = df_harian["jumlah_permohonan"].ffill().to_numpy(dtype=np.float64)
+    tanggal = df_harian["tanggal"].to_numpy(dtype="datetime64[ns]")
+
+    # Origin valid: riwayat cukup untuk lag30 & seluruh horizon masih dalam data
+    batas = tanggal[-1] - np.timedelta64(horizon, "D")
+    origin_idx = np.arange(KAPASITAS - 1, len(nilai), step)
+    origin_idx = origin_idx[tanggal[origin_idx] <= batas]
+    if mulai is not None:
+        origin_idx = origin_idx[tanggal[origin_idx] >= np.datetime64(pd.Timestamp(mulai))]
+    if len(origin_idx) == 0:
+        raise ValueError("Riwayat terlalu pendek untuk backtest.")
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    bloks = np.array_split(origin_idx, max(1, int(np.ceil(len(origin_idx) / blok))))
+
+    if n_jobs == 1 or len(bloks) == 1:
+        bundle = get_registry(model_dir, backend).get()
+        prediksi = np.vstack([prediksi_batch(bundle, nilai, tanggal, b, horizon) for b in bloks])
+    else:
+        shm_nilai, shm_tanggal = _ke_shared(nilai), _ke_shared(tanggal)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(bloks)),
+                initializer=_init_worker,
+                initargs=(shm_nilai.name, shm_tanggal.name, len(nilai), model_dir, backend),
+            ) as pool:
+                prediksi = np.vstack(list(pool.map(_jalankan_blok, bloks, [horizon] * len(bloks))))
+        finally:
+            for shm in (shm_nilai, shm_tanggal):
+                shm.close()
+                shm.unlink()
+
+    # --- Data aktual per tanggal kalender (hari tanpa permohonan = 0) ---
+    aktual_harian = pd.Series(nilai, index=tanggal)
+    offsets = np.arange(1, horizon + 1).astype("timedelta64[D]")
+    tanggal_target = tanggal[origin_idx][:, None] + offsets
+    aktual = aktual_harian.reindex(tanggal_target.ravel(), fill_value=0).to_numpy().reshape(prediksi.shape)
+
+    df_detail = pd.DataFrame({
+        "tanggal_origin": np.repeat(tanggal[origin_idx], horizon),
+        "horizon": np.tile(np.arange(1, horizon + 1), len(origin_idx)),
+        "tanggal": tanggal_target.ravel(),
+        "aktual": aktual.ravel(),
+        "prediksi": prediksi.ravel(),
+    })
+    return df_detail, ringkas_error(df_detail)
+
+
+def ringkas_error(df_detail):
+    """MAE, MAPE (%), dan RMSE per horizon dari hasil backtest."""
+    err = df_detail["prediksi"] - df_detail["aktual"]
+    df = df_detail.assign(
+        abs_err=err.abs(),
+        sq_err=err ** 2,
+        ape=(err.abs() / df_detail["aktual"]).where(df_detail["aktual"] > 0) * 100,
+    )
+    ringkasan = df.groupby("horizon").agg(
+        n=("abs_err", "size"),
+        MAE=("abs_err", "mean"),
+        MAPE=("ape", "mean"),
+        RMSE=("sq_err", "mean"),
+    )
+    ringkasan["RMSE"] = np.sqrt(ringkasan["RMSE"])
+    return ringkasan.reset_index()
+
+
+# ============================================================
+# 4. MAIN UNTUK DIJALANKAN LANGSUNG
+# ============================================================
+if __name__ == "__main__":
+    from src.preprocessing import load_and_prepare_data
+
+    parser = argparse.ArgumentParser(description="Backtest rolling-origin forecaster.")
+    parser.add_argument("--data", default="data/tbl_permohonan_202507221101.csv")
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--step", type=int, default=1, help="Jarak antar origin (baris)")
+    parser.add_argument("--jobs", type=int, default=None, help="Jumlah proses (default: semua core)")
+    parser.add_argument("--backend", default=None, help="Backend forecaster (default: APP_FORECASTER / svr)")
+    parser.add_argument("--model-dir", default="models")
+    args = parser.parse_args()
+
+    df_harian = load_and_prepare_data(args.data)
+    mulai = time.perf_counter()
+    df_detail, df_ringkasan = backtest(
+        df_harian, args.horizon, args.step, args.jobs, model_dir=args.model_dir, backend=args.backend
+    )
+    durasi = time.perf_counter() - mulai
+
+    print(f"📊 Backtest {df_detail['tanggal_origin'].nunique()} origin x {args.horizon} hari ({durasi:.2f} s)")
+    print(df_ringkasan.to_string(index=False))
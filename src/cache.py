@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 1. LOKASI CACHE
+# ============================================================
+# Cache disimpan di disk agar bisa dipakai bersama oleh semua sesi
+# Streamlit dan tetap berlaku setelah proses di-restart.
+CACHE_DIR = Path(os.environ.get("PERMOHONAN_CACHE_DIR", "cache"))
+
+# Hash isi file hanya dihitung ulang jika ukuran/mtime berubah
+_hash_memo = {}
+
+
+# ============================================================
+# 2. SIDIK JARI FILE & KUNCI CACHE
+# ============================================================
+def file_fingerprint(file_path, chunk_size=1 << 20):
+    """Sidik jari file sumber: ukuran, mtime, dan hash SHA-256 isinya."""
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    memo_key = (file_path, stat.st_size, stat.st_mtime_ns)
+
+    sha256 = _hash_memo.get(memo_key)
+    if sha256 is None:
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for blok in iter(lambda: f.read(chunk_size), b""):
+                h.update(blok)
+        sha256 = h.hexdigest()
+        _hash_memo[memo_key] = sha256
+
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+
+
+def cache_key(*parts):
+    """Gabungkan beberapa komponen (sidik jari, versi kode, parameter) jadi satu kunci pendek."""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:24]
+
+
+# ============================================================
+# 3. BACA / TULIS DATAFRAME (PARQUET)
+# ============================================================
+def _frame_path(name, key, cache_dir=None):
+    return Path(cache_dir or CACHE_DIR) / f"{name}-{key}.parquet"
+
+
+def read_frame(name, key, cache_dir=None):
+    """Ambil DataFrame dari cache. Mengembalikan None jika belum ada atau rusak."""
+    path = _frame_path(name, key, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def write_frame(name, key, df, cache_dir=None, keep=1):
+    """
+    Simpan DataFrame ke cache secara atomik (file sementara + rename),
+    lalu hapus entri lama dengan nama yang sama (hanya `keep` file terbaru
+    yang dipertahankan).
+    """
+    return _tulis_atomik(_frame_path(name, key, cache_dir), name, lambda tmp: df.to_parquet(tmp, index=False), keep)
+
+
+# ============================================================
+# 4. BACA / TULIS ARRAY NUMPY (NPY)
+# ============================================================
+def _array_path(name, key, cache_dir=None):
+    return Path(cache_dir or CACHE_DIR) / f"{name}-{key}.npy"
+
+
+def read_array(name, key, cache_dir=None):
+    """Ambil array NumPy dari cache. Mengembalikan None jika belum ada atau rusak."""
+    path = _array_path(name, key, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        return np.load(path, allow_pickle=False)
+    except Exception:
+        return None
+
+
+def write_array(name, key, arr, cache_dir=None):
+    """Simpan array NumPy ke cache secara atomik."""
+    def tulis(tmp):
+        with open(tmp, "wb") as f:
+            np.save(f, arr, allow_pickle=False)
+
+    return _tulis_atomik(_array_path(name, key, cache_dir), name, tulis)
+
+
+def _tulis_atomik(path, name, tulis, keep=1):
+    """Tulis lewat file sementara + os.replace, lalu hapus entri lama bernama sama."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{name}-", suffix=".tmp")
+        os.close(fd)
+        tulis(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Cache hanya optimasi: kegagalan menulis tidak boleh menghentikan aplikasi
+        if "tmp_path" in locals() and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    _pangkas(path, name, keep)
+    return True
+
+
+def _pangkas(path, name, keep):
+    """Pertahankan `keep` file terbaru bernama `name` (termasuk path), hapus sisanya."""
+    lama = [p for p in path.parent.glob(f"{name}-*{path.suffix}") if p != path]
+    if len(lama) < keep:
+        return
+
+    def mtime(p):
+        try:
+            return p.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    for p in sorted(lama, key=mtime, reverse=True)[keep - 1:]:
+        try:
+            p.unlink()
+        except OSError:
+            pass
+
+
+# ============================================================
+# 5. FILE HASIL KONVERSI (FORMAT BEBAS)
+# ============================================================
+def file_path(name, key, suffix, cache_dir=None):
+    """Path entri cache berformat bebas (mis. model hasil konversi)."""
+    return Path(cache_dir or CACHE_DIR) / f"{name}-{key}{suffix}"
+
+
+def write_file(name, key, suffix, tulis, cache_dir=None, keep=1):
+    """
+    Buat entri cache lewat fungsi tulis(tmp_path) secara atomik.
+    Mengembalikan path entri, atau None jika penulisan gagal.
+    """
+    path = file_path(name, key, suffix, cache_dir)
+    return path if _tulis_atomik(path, name, tulis, keep) else None
@@ -0,0 +1,229 @@
+"""
+Prediksi batch tanpa UI untuk job terjadwal (cron).
+
+Contoh:
+    python -m src.cli --data data/tbl_permohonan_202507221101.csv --horizon 7 --format csv
+    python -m src.cli --per-layanan --format json --output -
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# ============================================================
+# 1. KODE KELUAR
+# ============================================================
+EXIT_OK = 0
+EXIT_ERROR = 1          # kesalahan tak terduga
+EXIT_USAGE = 2          # argumen salah (dipakai argparse)
+EXIT_DATA = 3           # file data tidak ada / tidak bisa dibaca
+EXIT_DATA_KURANG = 4    # riwayat tidak cukup untuk prediksi
+EXIT_OUTPUT = 5         # gagal menulis hasil atau --timing-log
+EXIT_MODEL = 6          # file model tidak ada / model per layanan belum dilatih (--tanpa-fallback)
+
+FORMAT = ("csv", "parquet", "json")
+
+
+# ============================================================
+# 2. PENCATAT WAKTU PER TAHAP
+# ============================================================
+class Stopwatch:
+    """
+    Catat durasi tiap tahap pipeline untuk ringkasan di akhir job.
+    Tahap bisa bersarang (mis. "fitur" di dalam "data"): waktu tahap dalam
+    tidak ikut dihitung ke induknya, sehingga totalnya tetap waktu nyata.
+    """
+
+    def __init__(self):
+        self.tahap = {}
+        self._tumpukan = []     # [nama, mulai] tahap yang sedang berjalan
+
+    def _tambah(self, nama, detik):
+        self.tahap[nama] = self.tahap.get(nama, 0.0) + detik
+
+    @contextmanager
+    def ukur(self, nama):
+        sekarang = time.perf_counter()
+        if self._tumpukan:
+            induk = self._tumpukan[-1]
+            self._tambah(induk[0], sekarang - induk[1])
+        self._tumpukan.append([nama, sekarang])
+        try:
+            yield
+        finally:
+            sekarang = time.perf_counter()
+            _, mulai = self._tumpukan.pop()
+            self._tambah(nama, sekarang - mulai)
+            if self._tumpukan:
+                self._tumpukan[-1][1] = sekarang
+
+    def ringkasan(self):
+        baris = [f"{nama:<10} {detik * 1000:>10.1f} ms" for nama, detik in self.tahap.items()]
+        baris.append(f"{'total':<10} {sum(self.tahap.values()) * 1000:>10.1f} ms")
+        return "\n".join(baris)
+
+
+# ============================================================
+# 3. PIPELINE
+# ============================================================
+def jalankan(args, sw):
+    """
+    Ingest -> fitur -> model -> prediksi. Mengembalikan (df_hasil, kode_keluar).
+    Tahap "fitur" mencakup pembuatan fitur saat data tidak diambil dari cache
+    dan vektor fitur tiap langkah prediksi (mode per layanan: hanya yang pertama,
+    langkah prediksinya bisa berjalan di proses lain).
+    """
+    import pandas as pd
+    from src.preprocessing import load_and_prepare_data, load_and_prepare_data_per_layanan
+
+    if not Path(args.data).exists():
+        print(f"❌ File data tidak ditemukan: {args.data}", file=sys.stderr)
+        return None, EXIT_DATA
+
+    try:
+        with sw.ukur("data"):
+            loader = load_and_prepare_data_per_layanan if args.per_layanan else load_and_prepare_data
+            df = loader(args.data, use_cache=not args.no_cache, chunksize=args.chunksize, ukur=sw.ukur)
+    except (ValueError, KeyError, pd.errors.ParserError) as e:
+        print(f"❌ Gagal membaca data: {e}", file=sys.stderr)
+        return None, EXIT_DATA
+
+    if args.per_layanan:
+        # Model per layanan dimuat malas di proses yang memprediksi
+        with sw.ukur("prediksi"):
+            from src.multiseries import SUMBER_FALLBACK, predict_future_per_layanan
+            try:
+                df_hasil = predict_future_per_layanan(
+                    df, args.horizon, n_jobs=args.jobs, model_root=args.model_dir, backend=args.backend,
+                    fallback=not args.tanpa_fallback,
+                )
+            except FileNotFoundError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                return None, EXIT_MODEL
+        fallback = df_hasil.loc[df_hasil["sumber"] == SUMBER_FALLBACK, "id_jenis_layanan"].unique()
+        if len(fallback):
+            print(f"⚠️  Layanan {', '.join(map(str, fallback))} belum punya model sendiri: memakai rata-rata "
+                  f"observasi terakhir (sumber={SUMBER_FALLBACK}; latih dengan: python -m src.multiseries --latih)",
+                  file=sys.stderr)
+        kurang = df_hasil.empty
+    else:
+        with sw.ukur("model"):
+            from src.model_registry import get_registry
+            try:
+                bundle = get_registry(args.model_dir, args.backend).get()
+            except FileNotFoundError as e:
+                print(f"❌ File model tidak ditemukan: {e}", file=sys.stderr)
+                return None, EXIT_MODEL
+
+        with sw.ukur("prediksi"):
+            from src.prediction import prediksi_rekursif
+            riwayat = df["jumlah_permohonan"].ffill().to_numpy(dtype=float)
+            hasil = prediksi_rekursif(
+                bundle.model, bundle.scaler_x, bundle.scaler_y, riwayat, df["tanggal"].max(), args.horizon,
+                ukur=sw.ukur,
+            )
+            df_hasil = pd.DataFrame(hasil, columns=["tanggal", "jumlah_permohonan_prediksi"])
+            df_hasil["versi_model"] = bundle.versi
+        kurang = len(df_hasil) < args.horizon
+
+    if kurang:
+        print("❌ Riwayat data tidak cukup untuk prediksi.", file=sys.stderr)
+        return df_hasil, EXIT_DATA_KURANG
+    return df_hasil, EXIT_OK
+
+
+def tulis_hasil(df_hasil, output, fmt):
+    """Tulis hasil ke file (atau stdout jika output '-')."""
+    if output == "-":
+        if fmt == "parquet":
+            raise ValueError("Format parquet tidak bisa ditulis ke stdout")
+        if fmt == "csv":
+            df_hasil.to_csv(sys.stdout, index=False)
+        else:
+            df_hasil.to_json(sys.stdout, orient="records", date_format="iso")
+            sys.stdout.write("\n")
+        return
+
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        df_hasil.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df_hasil.to_parquet(path, index=False)
+    else:
+        df_hasil.to_json(path, orient="records", date_format="iso")
+
+
+# ============================================================
+# 4. ENTRY POINT
+# ============================================================
+def buat_parser():
+    parser = argparse.ArgumentParser(description="Prediksi jumlah permohonan secara batch (tanpa UI).")
+    parser.add_argument("--data", default="data/tbl_permohonan_202507221101.csv", help="CSV ekspor tbl_permohonan")
+    parser.add_argument("--horizon", type=int, default=7, help="Jumlah hari yang diprediksi")
+    parser.add_argument("--per-layanan", action="store_true", help="Prediksi terpisah per jenis layanan")
+    parser.add_argument("--tanpa-fallback", action="store_true",
+                        help="Mode per layanan: gagal (kode 6) jika ada layanan tanpa model sendiri")
+    parser.add_argument("--format", choices=FORMAT, default="csv")
+    parser.add_argument("--output", default=None,
+                        help="Path hasil; '-' untuk stdout (default: output/prediksi_<horizon>hari.<format>)")
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--backend", default=None, help="Backend forecaster (default: APP_FORECASTER / svr)")
+    parser.add_argument("--jobs", type=int, default=None, help="Jumlah proses untuk mode per layanan")
+    parser.add_argument("--chunksize", type=int, default=None, help="Baca CSV per chunk (mode streaming)")
+    parser.add_argument("--no-cache", action="store_true", help="Abaikan cache df_harian di disk")
+    parser.add_argument("--timing-log", default=None, help="Tambahkan ringkasan waktu (JSON per baris) ke file ini")
+    return parser
+
+
+def main(argv=None):
+    args = buat_parser().parse_args(argv)
+    if args.horizon < 1:
+        print("❌ --horizon minimal 1", file=sys.stderr)
+        return EXIT_USAGE
+
+    output = args.output or f"output/prediksi_{args.horizon}hari.{args.format}"
+    sw = Stopwatch()
+    try:
+        df_hasil, kode = jalankan(args, sw)
+        if kode == EXIT_OK:
+            try:
+                with sw.ukur("output"):
+                    tulis_hasil(df_hasil, output, args.format)
+            except (OSError, ValueError, ImportError) as e:
+                print(f"❌ Gagal menulis hasil: {e}", file=sys.stderr)
+                kode = EXIT_OUTPUT
+    except Exception as e:
+        print(f"❌ Kesalahan tak terduga: {e!r}", file=sys.stderr)
+        kode = EXIT_ERROR
+
+    print("⏱️ Ringkasan waktu per tahap:", file=sys.stderr)
+    print(sw.ringkasan(), file=sys.stderr)
+    if kode == EXIT_OK and output != "-":
+        print(f"✅ Hasil disimpan di: {output}", file=sys.stderr)
+
+    if args.timing_log:
+        catatan = {
+            "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "data": args.data,
+            "horizon": args.horizon,
+            "per_layanan": args.per_layanan,
+            "kode_keluar": kode,
+            "tahap_ms": {k: round(v * 1000, 2) for k, v in sw.tahap.items()},
+        }
+        try:
+            Path(args.timing_log).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.timing_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(catatan) + "\n")
+        except OSError as e:
+            print(f"❌ Gagal menulis timing log: {e}", file=sys.stderr)
+            # Kode kesalahan yang lebih awal tetap diutamakan
+            kode = EXIT_OUTPUT if kode == EXIT_OK else kode
+
+    return kode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
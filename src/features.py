@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.kalender import hari_libur, is_libur, ke_nomor_hari
+
+# ============================================================
+# 1. SPESIFIKASI FITUR (SATU-SATUNYA SUMBER KEBENARAN)
+# ============================================================
+# Urutan kolom hasil mengikuti urutan di spesifikasi ini dan harus sama
+# dengan urutan fitur saat model SVR dilatih.
+SPEC = {
+    "target": "jumlah_permohonan",
+    "lags": [10, 20, 30],
+    "windows": [10, 20, 30],
+    "kalender": ["hari", "bulan", "tahun", "dayofweek", "quarter"],
+    "flags": ["is_holiday", "is_weekend"],
+}
+
+
+def nama_kolom(spec=SPEC):
+    """Daftar nama fitur sesuai urutan yang diharapkan model."""
+    kolom = [f"{spec['target']}_lag{lag}" for lag in spec["lags"]]
+    for w in spec["windows"]:
+        kolom += [f"permohonan_mean{w}", f"permohonan_std{w}"]
+    return kolom + spec["kalender"] + spec["flags"]
+
+
+def _rolling_mean_std(nilai, w):
+    """
+    Rata-rata & simpangan baku (ddof=1) tiap jendela sepanjang w di sepanjang
+    sumbu 0 (satu kolom per deret), O(n).
+    Memakai selisih cumsum terhadap titik acuan bulat (tetap eksak untuk data
+    bilangan bulat); jika ada NaN, jatuh ke sliding window agar pola NaN sama
+    dengan pandas rolling.
+    """
+    if np.isnan(nilai).any():
+        jendela = sliding_window_view(nilai, w, axis=0)
+        return jendela.mean(axis=-1), jendela.std(axis=-1, ddof=1)
+
+    acuan = np.round(nilai.mean(axis=0))
+    x = nilai - acuan
+    nol = np.zeros((1,) + x.shape[1:])
+    c1 = np.concatenate([nol, np.cumsum(x, axis=0)])
+    c2 = np.concatenate([nol, np.cumsum(x * x, axis=0)])
+    s1 = c1[w:] - c1[:-w]
+    s2 = c2[w:] - c2[:-w]
+    var = np.maximum(s2 - s1 * s1 / w, 0.0) / (w - 1)
+    return s1 / w + acuan, np.sqrt(var)
+
+
+# ============================================================
+# 2. MESIN FITUR TERVEKTORISASI
+# ============================================================
+class FeatureEngine:
+    """
+    Hasil kompilasi SPEC menjadi pipeline NumPy.
+
+    - batch(): seluruh riwayat sekaligus (satu baris fitur per baris data).
+    - langkah_berikut(): fitur untuk hari setelah observasi terakhir dari satu
+      atau banyak deret sekaligus (dipakai prediksi rekursif & backtest).
+    - online(): state ring buffer O(1) per langkah untuk prediksi satu deret.
+
+    rolling_shift menentukan posisi jendela rolling:
+      1 -> jendela x[t-w .. t-1] (fitur di df_harian hasil preprocessing)
+      0 -> jendela x[t-w+1 .. t] (fitur saat prediksi, baris baru di-ffill)
+
+    rentang_libur = (tahun_awal, tahun_akhir) menandai hari_libur sebagai hasil
+    src.kalender.hari_libur untuk rentang itu; tanggal di luar rentang membuat
+    indeks dibangun ulang lebih lebar, bukan diam-diam is_holiday=0. Tanpa
+    rentang_libur (daftar tanggal manual), indeks dipakai apa adanya.
+    """
+
+    def __init__(self, spec=SPEC, hari_libur=(), rentang_libur=None):
+        self.spec = spec
+        self.lags = list(spec["lags"])
+        self.windows = list(spec["windows"])
+        self.kolom = nama_kolom(spec)
+        self.kapasitas = max(self.lags + self.windows)
+        # Indeks libur: array int64 nomor hari terurut (lihat src.kalender)
+        hari_libur = np.asarray(hari_libur)
+        if hari_libur.dtype != np.int64:
+            hari_libur = ke_nomor_hari(hari_libur) if len(hari_libur) else hari_libur.astype(np.int64)
+        self.hari_libur = np.unique(hari_libur)
+        self.rentang_libur = rentang_libur
+
+    # --- Kalender & flag libur ---
+    def kalender(self, tanggal):
+        """Matriks (n x 7): hari, bulan, tahun, dayofweek, quarter, is_holiday, is_weekend."""
+        hari_ke = np.asarray(pd.DatetimeIndex(tanggal).values, dtype="datetime64[D]")
+        awal_bulan = hari_ke.astype("datetime64[M]")
+        awal_tahun = hari_ke.astype("datetime64[Y]")
+        bulan = (awal_bulan - awal_tahun).astype(np.int64) + 1
+        # 1970-01-01 adalah hari Kamis (dayofweek=3, Senin=0)
+        dayofweek = (hari_ke.astype(np.int64) + 3) % 7
+        tahun = awal_tahun.astype(np.int64) + 1970
+        nilai = {
+            "hari": (hari_ke - awal_bulan).astype(np.int64) + 1,
+            "bulan": bulan,
+            "tahun": tahun,
+            "dayofweek": dayofweek,
+            "quarter": (bulan - 1) // 3 + 1,
+            "is_holiday": is_libur(hari_ke.astype(np.int64), self._libur_untuk(tahun)),
+            "is_weekend": dayofweek >= 5,
+        }
+        return np.column_stack([nilai[k] for k in self.spec["kalender"] + self.spec["flags"]])
+
+    def _libur_untuk(self, tahun):
+        """Indeks libur yang mencakup semua tahun pada `tahun` (diperluas bila perlu)."""
+        if self.rentang_libur is None or len(tahun) == 0:
+            return self.hari_libur
+        awal, akhir = self.rentang_libur
+        if tahun.min() >= awal and tahun.max() <= akhir:
+            return self.hari_libur
+        awal, akhir = min(awal, int(tahun.min())), max(akhir, int(tahun.max()))
+        # Memo src.kalender membuat perluasan yang sama hanya dibangun sekali per proses
+        libur = hari_libur(awal, akhir)
+        self.hari_libur, self.rentang_libur = libur, (awal, akhir)
+        return libur
+
+    # --- Mode batch (seluruh riwayat) ---
+    def batch(self, nilai, tanggal, rolling_shift=1, dtype=np.float32):
+        """
+        Matriks fitur kontigu; baris tanpa riwayat cukup berisi NaN.
+
+        nilai 1-D (n,)          -> hasil (n x len(kolom))
+        nilai 2-D (n x n_deret) -> hasil (n_deret x n x len(kolom)), semua deret
+                                   dihitung sekaligus dengan tanggal yang sama.
+        """
+        nilai = np.asarray(nilai, dtype=np.float64)
+        satu_deret = nilai.ndim == 1
+        if satu_deret:
+            nilai = nilai[:, None]
+        n, n_deret = nilai.shape
+        out = np.full((n_deret, n, len(self.kolom)), np.nan, dtype=np.float64)
+
+        j = 0
+        for lag in self.lags:
+            # Deret lebih pendek dari lag: kolomnya tetap NaN (n - lag negatif bukan slice kosong)
+            if n > lag:
+                out[:, lag:, j] = nilai[:n - lag].T
+            j += 1
+
+        for w in self.windows:
+            # Jendela berakhir di baris t - rolling_shift
+            mulai = w - 1 + rolling_shift
+            if n > mulai:
+                mean, std = _rolling_mean_std(nilai[:n - rolling_shift], w)
+                out[:, mulai:, j], out[:, mulai:, j + 1] = mean.T, std.T
+            j += 2
+
+        out[:, :, j:] = self.kalender(tanggal)
+        return np.ascontiguousarray(out[0] if satu_deret else out, dtype=dtype)
+
+    # --- Mode langkah berikut (satu/banyak deret) ---
+    def langkah_berikut(self, buf, p, tanggal, dtype=np.float64):
+        """
+        Fitur untuk hari setelah kolom p pada setiap baris buf (n_deret x panjang).
+        Seperti loop prediksi lama, baris baru di-ffill sehingga jendela rolling
+        berisi (w - 1) observasi terakhir ditambah observasi terakhir sekali lagi.
+        """
+        terakhir = buf[:, p:p + 1]
+        kolom = [buf[:, p + 1 - lag] for lag in self.lags]
+        for w in self.windows:
+            jendela = np.hstack([buf[:, p - w + 2:p + 1], terakhir])
+            kolom += [jendela.mean(axis=1), jendela.std(axis=1, ddof=1)]
+        return np.ascontiguousarray(np.column_stack(kolom + [self.kalender(tanggal)]), dtype=dtype)
+
+    # --- Mode online (satu deret, O(1) per langkah) ---
+    def online(self, riwayat):
+        return RingBufferFitur(self, riwayat)
+
+
+# ============================================================
+# 3. STATE ONLINE (RING BUFFER)
+# ============================================================
+class RingBufferFitur:
+    """
+    Menyimpan `kapasitas` observasi terakhir beserta jumlah & jumlah kuadrat
+    berjalan, sehingga vektor fitur hari berikutnya dibuat dalam waktu konstan.
+    Hasilnya sama dengan FeatureEngine.langkah_berikut() untuk satu deret.
+    """
+
+    def __init__(self, engine, riwayat):
+        self.engine = engine
+        self.kapasitas = engine.kapasitas
+        riwayat = np.asarray(riwayat, dtype=float)[-self.kapasitas:]
+        self.buf = np.full(self.kapasitas, np.nan)
+        self.n = len(riwayat)
+        self.pos = self.n % self.kapasitas
+        self.buf[:self.n] = riwayat
+
+        # Jumlah berjalan untuk (w - 1) observasi terakhir tiap jendela
+        self.sum = {}
+        self.sumsq = {}
+        for w in engine.windows:
+            ekor = riwayat[-(w - 1):] if self.n >= w - 1 else np.array([np.nan])
+            self.sum[w] = float(ekor.sum())
+            self.sumsq[w] = float((ekor ** 2).sum())
+
+    def _ambil(self, k):
+        """Observasi ke-k dari belakang (k=1 -> terakhir)."""
+        if k > self.n:
+            return np.nan
+        return self.buf[(self.pos - k) % self.kapasitas]
+
+    def push(self, nilai):
+        """Masukkan observasi baru dan geser semua jumlah berjalan."""
+        nilai = float(nilai)
+        for w in self.engine.windows:
+            keluar = self._ambil(w - 1)
+            self.sum[w] += nilai - (keluar if self.n >= w - 1 else 0.0)
+            self.sumsq[w] += nilai ** 2 - (keluar ** 2 if self.n >= w - 1 else 0.0)
+        self.buf[self.pos] = nilai
+        self.pos = (self.pos + 1) % self.kapasitas
+        self.n = min(self.n + 1, self.kapasitas)
+
+    def fitur(self, tanggal):
+        """Vektor fitur (urutan engine.kolom) untuk tanggal setelah observasi terakhir."""
+        terakhir = self._ambil(1)
+        x = [self._ambil(lag) for lag in self.engine.lags]
+        for w in self.engine.windows:
+            s = self.sum[w] + terakhir
+            mean = s / w
+            var = (self.sumsq[w] + terakhir ** 2 - s * mean) / (w - 1)
+            x += [mean, np.sqrt(max(var, 0.0)) if not np.isnan(var) else np.nan]
+        x += list(self.engine.kalender([tanggal])[0])
+        return np.array(x, dtype=float)
+
+
+# ============================================================
+# 4. KONVERSI KE DATAFRAME
+# ============================================================
+# Skema ringkas: kalender & flag muat di int8 (tahun int16); lag & rolling
+# hanya ditampilkan/diekspor sehingga presisi float32 cukup
+DTYPE_RINGKAS = {
+    **{k: np.int8 for k in SPEC["kalender"] + SPEC["flags"]},
+    "tahun": np.int16,
+    "lainnya": np.float32,
+}
+
+
+def isi_frame(df, X, kolom, urutan=None, ringkas=False):
+    """
+    Tulis matriks fitur X (kolom sesuai `kolom`) ke df.
+
+    ringkas=False: dtype sama seperti fitur pandas sebelumnya (kalender int32,
+    flag int64, sisanya float64); dipakai jalur fitur model (buat_fitur).
+    ringkas=True: skema DTYPE_RINGKAS untuk frame yang disimpan di cache dan
+    dibagikan ke semua sesi (df_harian, df_layanan).
+    """
+    posisi = {k: i for i, k in enumerate(kolom)}
+    for k in urutan or kolom:
+        nilai = X[:, posisi[k]]
+        if ringkas:
+            df[k] = nilai.astype(DTYPE_RINGKAS.get(k, DTYPE_RINGKAS["lainnya"]))
+        elif k in SPEC["kalender"]:
+            df[k] = nilai.astype(np.int32)
+        elif k in SPEC["flags"]:
+            df[k] = nilai.astype(np.int64)
+        else:
+            df[k] = nilai.astype(np.float64)
+    return df
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from src import instrumen
+from src.cache import cache_key, read_frame, write_frame
+from src.model_registry import get_registry
+from src.prediction import ENGINE, HARI_LIBUR, prediksi_rekursif
+from src.preprocessing import FITUR_VERSION
+
+# ============================================================
+# 1. KONFIGURASI
+# ============================================================
+# Slider di halaman prediksi maksimal 7 hari: selalu hitung sampai sini,
+# horizon yang lebih pendek cukup diambil sebagai prefix.
+MAX_HORIZON = 7
+MAX_ENTRI = 128
+
+
+# ============================================================
+# 2. SIDIK JARI DATA
+# ============================================================
+def sidik_data(df_harian):
+    """
+    Sidik jari bagian data yang memengaruhi prediksi: observasi terakhir
+    (sebanyak kapasitas fitur) dan tanggalnya.
+    """
+    if not df_harian["tanggal"].is_monotonic_increasing:
+        df_harian = df_harian.sort_values("tanggal")
+    ekor = df_harian[["tanggal", "jumlah_permohonan"]].tail(ENGINE.kapasitas)
+    h = hashlib.sha256()
+    h.update(ekor["tanggal"].to_numpy(dtype="datetime64[ns]").tobytes())
+    h.update(ekor["jumlah_permohonan"].ffill().to_numpy(dtype=np.float64).tobytes())
+    return h.hexdigest()[:24]
+
+
+# ============================================================
+# 3. CACHE LRU + PERSISTENSI DISK
+# ============================================================
+class ForecastCache:
+    """
+    Cache hasil prediksi dengan kunci (sidik data, versi model, versi fitur).
+    Prediksi selalu dihitung sampai MAX_HORIZON sekali, lalu horizon yang
+    diminta dilayani dengan slicing. Entri di memori dibatasi (LRU) dan
+    bisa disimpan ke disk agar tetap berlaku lintas proses.
+    """
+
+    def __init__(self, max_entri=MAX_ENTRI, persist=True, model_dir="models"):
+        self.max_entri = max_entri
+        self.persist = persist
+        self.model_dir = model_dir
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _simpan_memori(self, key, df):
+        with self._lock:
+            self._data[key] = df
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entri:
+                self._data.popitem(last=False)
+
+    @instrumen.terukur("prediksi.forecast_cache")
+    def get(self, df_harian, n_forecast=MAX_HORIZON):
+        """Prediksi n_forecast hari (<= MAX_HORIZON) dari cache atau dihitung sekali."""
+        if not 1 <= n_forecast <= MAX_HORIZON:
+            raise ValueError(f"n_forecast harus antara 1 dan {MAX_HORIZON}")
+
+        bundle = get_registry(self.model_dir).get()
+        with instrumen.span("prediksi.kunci_cache"):
+            libur = hashlib.sha256(np.asarray(HARI_LIBUR).tobytes()).hexdigest()[:12]
+            key = cache_key(sidik_data(df_harian), bundle.versi, FITUR_VERSION, libur, MAX_HORIZON)
+
+        with self._lock:
+            df_penuh = self._data.get(key)
+            if df_penuh is not None:
+                self._data.move_to_end(key)
+
+        if df_penuh is None and self.persist:
+            with instrumen.span("prediksi.baca_cache"):
+                df_penuh = read_frame("prediksi", key)
+            if df_penuh is not None:
+                self._simpan_memori(key, df_penuh)
+
+        if df_penuh is None:
+            self.misses += 1
+            instrumen.hitung("prediksi.cache_miss")
+            with instrumen.span("prediksi.hitung"):
+                df_penuh = self._hitung(df_harian, bundle)
+            self._simpan_memori(key, df_penuh)
+            if self.persist:
+                with instrumen.span("prediksi.tulis_cache"):
+                    write_frame("prediksi", key, df_penuh, keep=self.max_entri)
+        else:
+            self.hits += 1
+            instrumen.hitung("prediksi.cache_hit")
+
+        df_hasil = df_penuh.head(n_forecast).copy()
+        df_hasil.attrs["versi_model"] = bundle.versi
+        return df_hasil
+
+    def _hitung(self, df_harian, bundle):
+        if not df_harian["tanggal"].is_monotonic_increasing:
+            df_harian = df_harian.sort_values("tanggal")
+        riwayat = df_harian["jumlah_permohonan"].ffill().to_numpy(dtype=float)
+        hasil_prediksi = prediksi_rekursif(
+            bundle.model, bundle.scaler_x, bundle.scaler_y, riwayat, df_harian["tanggal"].max(), MAX_HORIZON
+        )
+        return pd.DataFrame(hasil_prediksi, columns=["tanggal", "jumlah_permohonan_prediksi"])
+
+    def statistik(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entri": len(self._data),
+        }
+
+
+# ============================================================
+# 4. INSTANCE BERSAMA PER PROSES
+# ============================================================
+_cache = ForecastCache()
+
+
+def predict_future_cached(df_harian, n_forecast=7):
+    """Pengganti predict_future untuk UI: hasil sama, tanpa menulis CSV, dengan cache."""
+    return _cache.get(df_harian, n_forecast)
+
+
+# ============================================================
+# 5. TUGAS LATAR BELAKANG (JobManager)
+# ============================================================
+def id_job_prediksi(df_harian, n_forecast, model_dir="models"):
+    """
+    Job ID deterministik per (data, horizon, file model). File model diwakili
+    stat-nya, bukan versi hash isi: dipanggil di thread script saat tombol
+    diklik, jadi tidak boleh memuat model (itu tugas job, lihat tugas_prediksi).
+    """
+    return "prediksi-" + cache_key(sidik_data(df_harian), n_forecast, get_registry(model_dir).sidik_stat())
+
+
+def tugas_prediksi(job, df_harian, n_forecast):
+    """Tugas untuk JobManager: prediksi lewat cache bersama."""
+    job.lapor(0.0, "Memuat model & menghitung prediksi")
+    return predict_future_cached(df_harian, n_forecast)
@@ -0,0 +1,301 @@
+"""
+Backend forecaster yang bisa dipertukarkan, plus leaderboard latensi & akurasi.
+
+Semua backend memakai vektor fitur yang sama (FeatureEngine, urutan FEATURES)
+dan scaler yang sama (scaler_x.pkl & scaler_y.pkl): model menerima X yang sudah
+di-scale dan memprediksi y dalam skala scaler_y. Antarmukanya cukup protokol
+regresor scikit-learn, fit(X, y) dan predict(X), sehingga prediksi_rekursif,
+ForecastCache, backtest, multiseries & CLI tidak perlu tahu backend mana yang
+dipakai.
+
+File model per backend: <model_dir>/<backend>_model.pkl (svr_model.pkl = model
+produksi). Backend aktif dipilih dengan APP_FORECASTER, mis.:
+    APP_FORECASTER=ridge streamlit run main.py
+
+Leaderboard (latih di data sebelum periode uji, backtest di periode uji):
+    python -m src.forecaster
+    python -m src.forecaster --backend svr svr_nystroem ridge --uji-hari 120
+    python -m src.forecaster --backend ridge gbt --simpan models   # latih ulang di seluruh data & simpan
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import KAPASITAS, backtest
+from src.forecast_cache import MAX_HORIZON
+from src.model_registry import ARTEFAK, get_registry, nama_model
+from src.prediction import ENGINE, FEATURES, prediksi_rekursif
+
+# ============================================================
+# 1. BACKEND
+# ============================================================
+class NaifMusiman:
+    """
+    Baseline seasonal-naive dari vektor fitur yang sama: level rata-rata 10
+    hari terakhir (permohonan_mean10) dikali profil per hari dalam minggu
+    (hari libur punya profil sendiri) yang dipelajari saat fit. Vektor fitur
+    tidak memuat lag 7 hari, jadi y[t-7] klasik tidak tersedia.
+    """
+
+    def __init__(self, scaler_x, scaler_y, level="permohonan_mean10"):
+        self.scaler_x = scaler_x
+        self.scaler_y = scaler_y
+        self.level = level
+
+    def _level_kunci(self, X):
+        mentah = self.scaler_x.inverse_transform(np.asarray(X, dtype=np.float64))
+        kolom = list(getattr(self.scaler_x, "feature_names_in_", FEATURES))
+        dayofweek = np.rint(mentah[:, kolom.index("dayofweek")]).astype(np.int64)
+        libur = mentah[:, kolom.index("is_holiday")] > 0.5
+        return mentah[:, kolom.index(self.level)], np.where(libur, 7, dayofweek)
+
+    def fit(self, X, y):
+        level, kunci = self._level_kunci(X)
+        y = self.scaler_y.inverse_transform(np.asarray(y).reshape(-1, 1)).ravel()
+        self.profil_ = np.ones(8)
+        for k in range(8):
+            m = kunci == k
+            if level[m].sum() > 0:
+                self.profil_[k] = y[m].sum() / level[m].sum()
+        return self
+
+    def predict(self, X):
+        level, kunci = self._level_kunci(X)
+        return self.scaler_y.transform((level * self.profil_[kunci]).reshape(-1, 1)).ravel()
+
+
+def _svr():
+    from sklearn.svm import SVR
+
+    # Hiperparameter model produksi (svr_model.pkl)
+    return SVR(C=0.1, epsilon=0.01, gamma=0.5)
+
+
+def _svr_nystroem():
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVR
+
+    # Peta fitur RBF berdimensi tetap: biaya prediksi tidak tumbuh dengan jumlah support vector
+    return make_pipeline(
+        Nystroem(kernel="rbf", gamma=0.5, n_components=200, random_state=0),
+        LinearSVR(C=0.1, epsilon=0.01, dual=True, max_iter=20_000, random_state=0),
+    )
+
+
+def _ridge():
+    from sklearn.linear_model import Ridge
+
+    return Ridge(alpha=1.0)
+
+
+def _gbt():
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    return HistGradientBoostingRegressor(max_iter=300, learning_rate=0.05, max_leaf_nodes=15, random_state=0)
+
+
+# nama backend -> (keterangan, pembuat model(scaler_x, scaler_y))
+BACKEND = {
+    "svr": ("SVR RBF (model produksi)", lambda sx, sy: _svr()),
+    "svr_nystroem": ("SVR linear + aproksimasi kernel Nystroem", lambda sx, sy: _svr_nystroem()),
+    "ridge": ("Regresi linear ridge", lambda sx, sy: _ridge()),
+    "gbt": ("Gradient-boosted trees (HistGradientBoosting)", lambda sx, sy: _gbt()),
+    "naif_musiman": ("Baseline seasonal-naive (level x profil hari)", NaifMusiman),
+}
+
+
+def buat_model(backend, scaler_x, scaler_y):
+    """Model baru (belum dilatih) untuk backend."""
+    if backend not in BACKEND:
+        raise ValueError(f"Backend tidak dikenal: {backend} (pilihan: {', '.join(BACKEND)})")
+    return BACKEND[backend][1](scaler_x, scaler_y)
+
+
+# ============================================================
+# 2. DATA LATIH
+# ============================================================
+def data_latih(df_harian, sampai=None):
+    """
+    (X, y) untuk melatih backend: satu baris per origin, berisi fitur hari
+    berikutnya persis seperti saat prediksi (FeatureEngine.langkah_berikut) dan
+    nilai aktual hari itu (hari tanpa permohonan = 0, seperti backtest).
+    sampai: hanya target sampai tanggal ini (data sebelum periode uji).
+    """
+    df_harian = df_harian.sort_values("tanggal")
+    nilai = df_harian["jumlah_permohonan"].ffill().to_numpy(dtype=np.float64)
+    tanggal = df_harian["tanggal"].to_numpy(dtype="datetime64[ns]")
+
+    origin_idx = np.arange(KAPASITAS - 1, len(nilai))
+    target = tanggal[origin_idx] + np.timedelta64(1, "D")
+    batas = tanggal[-1] if sampai is None else min(tanggal[-1], np.datetime64(pd.Timestamp(sampai)))
+    pilih = target <= batas
+    origin_idx, target = origin_idx[pilih], target[pilih]
+    if len(origin_idx) == 0:
+        raise ValueError("Riwayat terlalu pendek untuk melatih model.")
+
+    riwayat = nilai[origin_idx[:, None] + np.arange(-KAPASITAS + 1, 1)]
+    X = pd.DataFrame(ENGINE.langkah_berikut(riwayat, KAPASITAS - 1, target), columns=FEATURES)
+    y = pd.Series(nilai, index=tanggal).reindex(target, fill_value=0).to_numpy()
+    return X, y
+
+
+def muat_scaler(model_dir="models"):
+    """(scaler_x, scaler_y) bersama semua backend."""
+    import joblib
+
+    return tuple(joblib.load(Path(model_dir) / ARTEFAK[k]) for k in ("scaler_x", "scaler_y"))
+
+
+def latih(backend, df_harian, scaler_x, scaler_y, sampai=None):
+    """Latih backend di data sampai tanggal `sampai`. Mengembalikan (model, detik)."""
+    X, y = data_latih(df_harian, sampai)
+    model = buat_model(backend, scaler_x, scaler_y)
+    mulai = time.perf_counter()
+    model.fit(scaler_x.transform(X), scaler_y.transform(y.reshape(-1, 1)).ravel())
+    return model, time.perf_counter() - mulai
+
+
+def simpan(model, folder, backend, model_dir="models"):
+    """Tulis <backend>_model.pkl ke folder; scaler disalin dari model_dir bila belum ada."""
+    import joblib
+
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    for kunci in ("scaler_x", "scaler_y"):
+        tujuan = folder / ARTEFAK[kunci]
+        if not tujuan.exists():
+            shutil.copy2(Path(model_dir) / ARTEFAK[kunci], tujuan)
+    # Tulis lewat file sementara agar registry tidak pernah membaca file setengah jadi
+    tmp = folder / f".{nama_model(backend)}.tmp"
+    joblib.dump(model, tmp)
+    tmp.replace(folder / nama_model(backend))
+
+
+# ============================================================
+# 3. LEADERBOARD
+# ============================================================
+def ukur_latensi(bundle, df_harian, ulang=50):
+    """Latensi prediksi rekursif MAX_HORIZON hari seperti di UI: (p50, p95) dalam ms."""
+    riwayat = df_harian["jumlah_permohonan"].ffill().to_numpy(dtype=float)
+    tanggal_terakhir = df_harian["tanggal"].max()
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        prediksi_rekursif(bundle.model, bundle.scaler_x, bundle.scaler_y, riwayat, tanggal_terakhir, MAX_HORIZON)
+        waktu.append((time.perf_counter() - mulai) * 1000)
+    return float(np.percentile(waktu, 50)), float(np.percentile(waktu, 95))
+
+
+def ukur_batch(model, X, ulang=3):
+    """Waktu predict per baris (µs) untuk satu batch besar (backtest, multi-series)."""
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        model.predict(X)
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik / len(X) * 1e6
+
+
+def leaderboard(df_harian, backends=None, uji_hari=180, horizon=7, step=1, n_jobs=None,
+                model_dir="models", folder=None, ulang=50):
+    """
+    Latih tiap backend di data sebelum `uji_hari` hari terakhir, lalu ukur:
+    waktu latih, ukuran file model, latensi prediksi 7 hari (p50/p95), biaya
+    predict per baris dalam batch, dan error backtest (MAE/MAPE/RMSE rata-rata
+    semua horizon) dengan origin di periode uji. Model ditulis ke `folder`
+    (default folder sementara). Mengembalikan DataFrame terurut MAE.
+    """
+    df_harian = df_harian.sort_values("tanggal").reset_index(drop=True)
+    scaler_x, scaler_y = muat_scaler(model_dir)
+    mulai_uji = df_harian["tanggal"].max() - pd.Timedelta(days=uji_hari)
+    X_uji = scaler_x.transform(data_latih(df_harian)[0].tail(uji_hari))
+
+    baris = []
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(folder or tmp)
+        for backend in backends or list(BACKEND):
+            model, detik_latih = latih(backend, df_harian, scaler_x, scaler_y, sampai=mulai_uji)
+            simpan(model, folder, backend, model_dir)
+            bundle = get_registry(folder, backend).get()
+            p50, p95 = ukur_latensi(bundle, df_harian, ulang)
+            _, ringkasan = backtest(df_harian, horizon, step, n_jobs, model_dir=str(folder), backend=backend,
+                                    mulai=mulai_uji)
+            baris.append({
+                "backend": backend,
+                "latih_s": detik_latih,
+                "ukuran_kb": (folder / nama_model(backend)).stat().st_size / 1024,
+                "latensi_p50_ms": p50,
+                "latensi_p95_ms": p95,
+                "batch_us_per_baris": ukur_batch(bundle.model, X_uji),
+                "MAE": ringkasan["MAE"].mean(),
+                "MAPE": ringkasan["MAPE"].mean(),
+                "RMSE": ringkasan["RMSE"].mean(),
+                "n_origin": int(ringkasan["n"].iloc[0]),
+            })
+    return pd.DataFrame(baris).sort_values("MAE").reset_index(drop=True)
+
+
+# ============================================================
+# 4. MAIN UNTUK DIJALANKAN LANGSUNG
+# ============================================================
+def main(argv=None):
+    from src.preprocessing import load_and_prepare_data
+
+    parser = argparse.ArgumentParser(
+        description="Leaderboard backend forecaster: latensi, waktu latih, error backtest.",
+        epilog="Backend:\n" + "\n".join(f"  {nama:<14} {ket}" for nama, (ket, _) in BACKEND.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--data", default="data/tbl_permohonan_202507221101.csv")
+    parser.add_argument("--backend", nargs="+", choices=list(BACKEND), default=None, help="Default: semua backend")
+    parser.add_argument("--uji-hari", type=int, default=180, help="Panjang periode uji (hari terakhir)")
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--step", type=int, default=1, help="Jarak antar origin backtest (baris)")
+    parser.add_argument("--jobs", type=int, default=None, help="Jumlah proses backtest")
+    parser.add_argument("--ulang", type=int, default=50, help="Jumlah pengukuran latensi per backend")
+    parser.add_argument("--model-dir", default="models", help="Folder scaler (dan model produksi)")
+    parser.add_argument("--simpan", default=None,
+                        help="Latih ulang di seluruh data lalu simpan <backend>_model.pkl ke folder ini")
+    parser.add_argument("--timpa", action="store_true", help="Izinkan --simpan menimpa file model yang sudah ada")
+    parser.add_argument("--output", default=None, help="Simpan leaderboard (CSV)")
+    args = parser.parse_args(argv)
+
+    df_harian = load_and_prepare_data(args.data)
+    backends = args.backend or list(BACKEND)
+    if args.simpan and not args.timpa:
+        ada = [b for b in backends if (Path(args.simpan) / nama_model(b)).exists()]
+        if ada:
+            print(f"❌ Sudah ada di {args.simpan}: {', '.join(nama_model(b) for b in ada)} (pakai --timpa)",
+                  file=sys.stderr)
+            return 1
+
+    df = leaderboard(df_harian, backends, args.uji_hari, args.horizon, args.step, args.jobs, args.model_dir,
+                     ulang=args.ulang)
+    print(f"🏁 Leaderboard forecaster (uji {args.uji_hari} hari terakhir, {df['n_origin'].iloc[0]} origin "
+          f"x {args.horizon} hari)")
+    print(df.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(args.output, index=False)
+
+    if args.simpan:
+        scaler_x, scaler_y = muat_scaler(args.model_dir)
+        for backend in backends:
+            model, _ = latih(backend, df_harian, scaler_x, scaler_y)
+            simpan(model, args.simpan, backend, args.model_dir)
+        print(f"✅ Model disimpan di {args.simpan}; pilih dengan APP_FORECASTER=<backend>")
+    return 0
+
+
+if __name__ == "__main__":
+    # Lewat modul src.forecaster (bukan __main__) agar NaifMusiman ter-pickle dengan nama modulnya
+    from src.forecaster import main as _main
+
+    sys.exit(_main())
@@ -0,0 +1,209 @@
+"""
+Instrumentasi tahap (span) ringan untuk mencari sumber lambat: baca CSV,
+fitur, joblib.load, tokenisasi, forward pass model, render Plotly/HTML, dst.
+
+Nonaktif secara bawaan; aktifkan dengan environment APP_PROFIL=1, mis.:
+    APP_PROFIL=1 streamlit run main.py
+
+Saat nonaktif, span() hanya memeriksa satu flag lalu mengembalikan konteks
+kosong bersama. Saat aktif:
+- span yang terjadi selama satu rerun dikumpulkan ke rekaman rerun itu dan
+  ditampilkan di panel "⏱️ Profil rerun" di bawah halaman;
+- span di luar rerun (job latar, warm-up, worker, CLI) menjadi rekaman
+  sendiri dengan span terluar sebagai akarnya;
+- tiap rekaman ditambahkan sebagai satu baris JSON ke LOG_PATH.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+
+# ============================================================
+# 1. KONFIGURASI
+# ============================================================
+AKTIF = os.environ.get("APP_PROFIL", "").lower() in ("1", "true", "ya")
+LOG_PATH = Path(os.environ.get("APP_PROFIL_LOG", "logs/profil.jsonl"))
+# Rekaman latar terakhir yang ikut ditampilkan di panel
+MAX_LATAR = 10
+
+_KOSONG = nullcontext()
+_rekaman = ContextVar("rekaman_profil", default=None)
+_latar = deque(maxlen=MAX_LATAR)
+_tulis_lock = threading.Lock()
+
+
+def aktifkan(aktif=True, log_path=None):
+    """Nyalakan/matikan instrumentasi saat runtime (mis. dari benchmark)."""
+    global AKTIF, LOG_PATH
+    AKTIF = aktif
+    if log_path is not None:
+        LOG_PATH = Path(log_path)
+
+
+# ============================================================
+# 2. REKAMAN
+# ============================================================
+class Rekaman:
+    """
+    Span satu rerun (atau satu pekerjaan latar), dikelompokkan per jalur
+    (nama span induk/anak) sehingga span berulang seperti per batch atau per
+    langkah prediksi menjadi satu baris dengan jumlah panggilan.
+    """
+
+    def __init__(self, jenis, nama):
+        self.jenis = jenis
+        self.nama = nama
+        self.waktu = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.thread = threading.current_thread().name
+        self.tahap = {}
+        self.penghitung = Counter()
+        self.total_ms = None
+        self._jalur = []
+        self._mulai = time.perf_counter()
+
+    def _masuk(self, nama):
+        self._jalur.append(nama)
+        jalur = "/".join(self._jalur)
+        if jalur not in self.tahap:
+            self.tahap[jalur] = {
+                "jalur": jalur, "kedalaman": len(self._jalur) - 1, "n": 0, "ms": 0.0,
+                "mulai_ms": (time.perf_counter() - self._mulai) * 1000,
+            }
+        return self.tahap[jalur]
+
+    def _keluar(self, entri, detik):
+        entri["n"] += 1
+        entri["ms"] += detik * 1000
+        self._jalur.pop()
+
+    def tutup(self):
+        self.total_ms = (time.perf_counter() - self._mulai) * 1000
+        _tulis(self.ke_dict())
+
+    def ke_dict(self):
+        return {
+            "waktu": self.waktu, "jenis": self.jenis, "nama": self.nama, "pid": os.getpid(),
+            "thread": self.thread, "total_ms": self.total_ms,
+            "tahap": list(self.tahap.values()), "penghitung": dict(self.penghitung),
+        }
+
+
+def _tulis(data):
+    try:
+        with _tulis_lock:
+            LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False) + "\n")
+    except OSError:
+        # Profil hanya alat bantu: gagal menulis log tidak boleh mengganggu aplikasi
+        pass
+
+
+# ============================================================
+# 3. SPAN & PENGHITUNG
+# ============================================================
+@contextmanager
+def _span(nama):
+    rek = _rekaman.get()
+    token = None
+    if rek is None:
+        rek = Rekaman("latar", nama)
+        token = _rekaman.set(rek)
+    entri = rek._masuk(nama)
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        rek._keluar(entri, time.perf_counter() - mulai)
+        if token is not None:
+            _rekaman.reset(token)
+            rek.tutup()
+            _latar.append(rek)
+
+
+def span(nama):
+    """Context manager pengukur satu tahap: `with instrumen.span("data.baca_csv"): ...`."""
+    if not AKTIF:
+        return _KOSONG
+    return _span(nama)
+
+
+def tanpa_ukur(nama):
+    """Pengganti Stopwatch.ukur (src.cli) bagi pemanggil yang tidak mencatat tahap."""
+    return _KOSONG
+
+
+def terukur(nama):
+    """Dekorator: seluruh pemanggilan fungsi diukur sebagai span `nama`."""
+    def dekor(fungsi):
+        @functools.wraps(fungsi)
+        def bungkus(*args, **kwargs):
+            if not AKTIF:
+                return fungsi(*args, **kwargs)
+            with _span(nama):
+                return fungsi(*args, **kwargs)
+        return bungkus
+    return dekor
+
+
+def hitung(nama, n=1):
+    """Tambah penghitung pada rekaman yang sedang berjalan (mis. jumlah teks, baris CSV)."""
+    if not AKTIF:
+        return
+    rek = _rekaman.get()
+    if rek is not None:
+        rek.penghitung[nama] += int(n)
+
+
+# ============================================================
+# 4. REKAMAN PER RERUN & PANEL
+# ============================================================
+def mulai_rerun(nama="main"):
+    """Awali rekaman rerun di thread skrip ini; None jika nonaktif."""
+    if not AKTIF:
+        return None
+    rek = Rekaman("rerun", nama)
+    _rekaman.set(rek)
+    return rek
+
+
+def selesai_rerun(rek, halaman=None):
+    """Tutup rekaman rerun, tulis ke log, dan tampilkan panel profil."""
+    if rek is None:
+        return
+    _rekaman.set(None)
+    if halaman:
+        rek.nama = halaman
+    rek.tutup()
+    panel(rek)
+
+
+def _tabel(rek):
+    baris = ["| Tahap | n | Mulai (ms) | Durasi (ms) | % |", "|---|---:|---:|---:|---:|"]
+    for t in rek.tahap.values():
+        nama = "&nbsp;&nbsp;&nbsp;&nbsp;" * t["kedalaman"] + t["jalur"].rsplit("/", 1)[-1]
+        persen = 100 * t["ms"] / rek.total_ms if rek.total_ms else 0
+        baris.append(f"| {nama} | {t['n']} | {t['mulai_ms']:.1f} | {t['ms']:.1f} | {persen:.0f} |")
+    return "\n".join(baris)
+
+
+def panel(rek):
+    """Rincian waktu rerun (dan rekaman latar terakhir) dalam expander yang tertutup."""
+    import streamlit as st
+
+    terukur_ms = sum(t["ms"] for t in rek.tahap.values() if t["kedalaman"] == 0)
+    with st.expander(f"⏱️ Profil rerun: {rek.total_ms:.0f} ms", expanded=False):
+        st.markdown(_tabel(rek))
+        st.caption(
+            f"Di luar span (kode halaman & pembuatan elemen Streamlit): {rek.total_ms - terukur_ms:.1f} ms"
+            + (" · " + ", ".join(f"{k}: {v}" for k, v in rek.penghitung.items()) if rek.penghitung else "")
+        )
+        for lama in reversed(_latar):
+            st.markdown(f"**Latar · {lama.nama}** ({lama.waktu}, thread {lama.thread}): {lama.total_ms:.0f} ms")
+            st.markdown(_tabel(lama))
+        st.caption(f"Log: {LOG_PATH}")
@@ -0,0 +1,230 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.cache import CACHE_DIR
+
+# ============================================================
+# 1. KONFIGURASI JOB LATAR BELAKANG
+# ============================================================
+# Tiap job punya folder sendiri (status.json, checkpoint, input & hasil)
+JOB_DIR = CACHE_DIR / "jobs"
+MAX_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Folder job yang sudah tidak aktif dipangkas sampai tersisa sebanyak ini
+MAX_FOLDER_JOB = 20
+# Job tidak aktif yang disimpan di memori
+MAX_JOB_MEMORI = 200
+
+# Job ID juga dipakai sebagai nama folder dan bisa datang dari URL: batasi karakternya
+ID_VALID = re.compile(r"^[a-z]+-[0-9a-f]+$")
+
+STATUS_AKTIF = ("antri", "berjalan")
+# Status dari proses sebelumnya yang berhenti di tengah jalan (mis. server restart)
+STATUS_TERPUTUS = "terputus"
+
+
+# ============================================================
+# 2. JOB
+# ============================================================
+class Job:
+    """
+    Satu pekerjaan latar belakang. Fungsi tugas menerima objek ini untuk
+    melaporkan progres (lapor) dan mengecek pembatalan (dibatalkan).
+    """
+
+    def __init__(self, job_id, jenis, folder, param=None):
+        self.id = job_id
+        self.jenis = jenis
+        self.folder = folder
+        self.param = dict(param or {})
+        self.status = "antri"
+        self.progress = 0.0
+        self.pesan = ""
+        self.hasil = None
+        self.error = None
+        self.dibuat = time.time()
+        self._batal = threading.Event()
+
+    @property
+    def aktif(self):
+        return self.status in STATUS_AKTIF
+
+    def lapor(self, progress, pesan=None):
+        self.progress = float(progress)
+        if pesan is not None:
+            self.pesan = pesan
+
+    def dibatalkan(self):
+        return self._batal.is_set()
+
+    def batal(self):
+        self._batal.set()
+
+    def ringkasan(self):
+        """Status job dalam bentuk JSON (hasil hanya disertakan jika bisa diserialisasi)."""
+        try:
+            hasil = json.loads(json.dumps(self.hasil))
+        except (TypeError, ValueError):
+            hasil = None
+        return {
+            "id": self.id, "jenis": self.jenis, "param": self.param, "status": self.status,
+            "progress": self.progress, "pesan": self.pesan, "hasil": hasil, "error": self.error,
+            "dibuat": self.dibuat,
+        }
+
+    def simpan_status(self):
+        if self.folder is None:
+            return
+        self.folder.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.folder, prefix=".status-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.ringkasan(), f)
+        os.replace(tmp, self.folder / "status.json")
+
+    @classmethod
+    def dari_folder(cls, folder):
+        """Muat status job dari disk (job dari proses sebelumnya)."""
+        try:
+            data = json.loads((folder / "status.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        job = cls(data["id"], data["jenis"], folder, data.get("param"))
+        job.status = STATUS_TERPUTUS if data["status"] in STATUS_AKTIF else data["status"]
+        job.progress = data.get("progress", 0.0)
+        job.pesan = data.get("pesan", "")
+        job.hasil = data.get("hasil")
+        job.error = data.get("error")
+        job.dibuat = data.get("dibuat", job.dibuat)
+        return job
+
+
+# ============================================================
+# 3. PENGELOLA JOB (SATU PER PROSES)
+# ============================================================
+class JobManager:
+    """
+    Antrean job berbasis thread yang dipakai bersama semua sesi Streamlit.
+
+    Job ID boleh ditentukan pemanggil (mis. hash input) sehingga rerun atau
+    sesi lain yang meminta pekerjaan yang sama mendapat job yang sama, bukan
+    menjalankannya ulang. Job dengan persist=True menulis status ke disk dan
+    bisa dilanjutkan setelah dibatalkan atau setelah server restart.
+    """
+
+    def __init__(self, job_dir=JOB_DIR, max_workers=MAX_WORKERS):
+        self.job_dir = Path(job_dir)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def folder(self, job_id):
+        if not ID_VALID.match(job_id):
+            raise ValueError(f"Job ID tidak valid: {job_id!r}")
+        return self.job_dir / job_id
+
+    def submit(self, jenis, fungsi, *args, job_id=None, param=None, persist=False, **kwargs):
+        """
+        Jadwalkan fungsi(job, *args, **kwargs). Jika job dengan ID sama sedang
+        berjalan atau sudah selesai, job itu yang dipakai (tidak dijalankan ulang).
+        """
+        job_id = job_id or f"{jenis}-{time.time_ns():x}"
+        with self._lock:
+            lama = self._jobs.get(job_id) or (self._dari_disk(job_id) if persist else None)
+            if lama is not None and (lama.aktif or lama.status == "selesai"):
+                self._jobs[job_id] = lama
+                return job_id
+
+            job = Job(job_id, jenis, self.folder(job_id) if persist else None, param)
+            self._jobs.pop(job_id, None)
+            self._jobs[job_id] = job
+            self._pangkas_memori()
+            job.simpan_status()
+
+        if persist:
+            self._pangkas_folder()
+        self._executor.submit(self._jalankan, job, fungsi, args, kwargs)
+        return job_id
+
+    def _jalankan(self, job, fungsi, args, kwargs):
+        if job.dibatalkan():
+            job.status = "dibatalkan"
+            job.simpan_status()
+            return
+
+        job.status = "berjalan"
+        job.simpan_status()
+        try:
+            hasil = fungsi(job, *args, **kwargs)
+        except Exception as e:
+            job.status = "gagal"
+            job.error = str(e)
+        else:
+            job.hasil = hasil
+            job.status = "dibatalkan" if job.dibatalkan() else "selesai"
+            if job.status == "selesai":
+                job.progress = 1.0
+        job.simpan_status()
+
+    def _dari_disk(self, job_id):
+        folder = self.folder(job_id)
+        return Job.dari_folder(folder) if folder.exists() else None
+
+    def get(self, job_id):
+        """Job di memori, atau status terakhirnya di disk; None jika tidak dikenal."""
+        if not ID_VALID.match(job_id or ""):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = self._dari_disk(job_id)
+                if job is not None:
+                    self._jobs[job_id] = job
+            return job
+
+    def batal(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.batal()
+            if job.status == "antri":
+                job.status = "dibatalkan"
+                job.simpan_status()
+
+    def _pangkas_memori(self):
+        # dict menjaga urutan sisip: yang paling awal dibuat dibuang lebih dulu
+        selesai = [j for j, job in self._jobs.items() if not job.aktif]
+        for j in selesai[:max(0, len(selesai) - MAX_JOB_MEMORI)]:
+            del self._jobs[j]
+
+    def _pangkas_folder(self):
+        """Hapus folder job lama (bukan yang sedang aktif) melebihi MAX_FOLDER_JOB."""
+        try:
+            folder = sorted(
+                (p for p in self.job_dir.iterdir() if p.is_dir()),
+                key=lambda p: p.stat().st_mtime, reverse=True,
+            )
+        except OSError:
+            return
+        with self._lock:
+            aktif = {j for j, job in self._jobs.items() if job.aktif}
+        for p in folder[MAX_FOLDER_JOB:]:
+            if p.name not in aktif:
+                shutil.rmtree(p, ignore_errors=True)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_jobs():
+    """JobManager bersama untuk proses ini (dibuat saat pertama dipakai)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
@@ -0,0 +1,86 @@
+import threading
+from importlib.metadata import version
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cache import file_fingerprint, cache_key, read_array, write_array
+
+# ============================================================
+# 1. KONFIGURASI KALENDER LIBUR
+# ============================================================
+# Rentang tahun default; cukup lebar untuk data historis dan horizon prediksi.
+TAHUN_AWAL = 2015
+TAHUN_AKHIR = 2035
+
+# "public" = libur nasional, "government" = cuti bersama
+KATEGORI = ("public", "government")
+
+# Penutupan lokal tambahan (kolom: tanggal, keterangan), opsional
+LIBUR_LOKAL_PATH = Path("data/libur_lokal.csv")
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+# ============================================================
+# 2. INDEKS HARI LIBUR (INT64, TERURUT)
+# ============================================================
+def hari_libur(tahun_awal=TAHUN_AWAL, tahun_akhir=TAHUN_AKHIR, libur_lokal=LIBUR_LOKAL_PATH):
+    """
+    Array int64 terurut berisi nomor hari (hari sejak 1970-01-01) untuk semua
+    libur nasional, cuti bersama, dan penutupan lokal pada rentang tahun.
+    Hasil di-cache di memori proses dan di disk (cache/kalender-*.npy).
+    """
+    libur_lokal = Path(libur_lokal) if libur_lokal else None
+    sidik_lokal = file_fingerprint(libur_lokal) if libur_lokal and libur_lokal.exists() else None
+    key = cache_key(tahun_awal, tahun_akhir, KATEGORI, version("holidays"), sidik_lokal)
+
+    with _memo_lock:
+        if key in _memo:
+            return _memo[key]
+
+        nama = f"kalender-{tahun_awal}-{tahun_akhir}"
+        hari = read_array(nama, key)
+        if hari is None:
+            hari = _bangun_indeks(tahun_awal, tahun_akhir, libur_lokal if sidik_lokal else None)
+            write_array(nama, key, hari)
+
+        hari.flags.writeable = False
+        _memo[key] = hari
+        return hari
+
+
+def _bangun_indeks(tahun_awal, tahun_akhir, libur_lokal):
+    # Diimpor di sini: hanya dibutuhkan saat indeks belum ada di cache disk
+    import holidays
+
+    indo = holidays.Indonesia(years=range(tahun_awal, tahun_akhir + 1), categories=KATEGORI)
+    tanggal = list(indo.keys())
+    if libur_lokal is not None:
+        lokal = pd.read_csv(libur_lokal, usecols=["tanggal"], dtype={"tanggal": "string"})
+        tanggal += list(pd.to_datetime(lokal["tanggal"]).dt.date)
+    hari = np.array(tanggal, dtype="datetime64[D]").astype(np.int64)
+    return np.unique(hari)
+
+
+# ============================================================
+# 3. CEK KEANGGOTAAN TERVEKTORISASI
+# ============================================================
+def ke_nomor_hari(tanggal):
+    """Konversi tanggal (Series/array/list) ke nomor hari int64."""
+    return np.asarray(pd.DatetimeIndex(tanggal).values, dtype="datetime64[D]").astype(np.int64)
+
+
+def is_libur(hari_ke, libur=None):
+    """
+    Array boolean: apakah tiap nomor hari (int64) termasuk hari libur.
+    Memakai searchsorted pada indeks terurut, O(n log m).
+    """
+    libur = hari_libur() if libur is None else libur
+    hari_ke = np.asarray(hari_ke, dtype=np.int64)
+    if len(libur) == 0:
+        return np.zeros(hari_ke.shape, dtype=bool)
+    posisi = np.searchsorted(libur, hari_ke)
+    return libur[np.minimum(posisi, len(libur) - 1)] == hari_ke
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src import instrumen
+from src.cache import file_fingerprint, cache_key, read_frame, write_frame
+from src.kalender import hari_libur, is_libur, ke_nomor_hari, TAHUN_AWAL, TAHUN_AKHIR
+from src.preprocessing import DEFAULT_CHUNKSIZE, STREAMING_THRESHOLD_BYTES, _agregasi_per_layanan
+
+# ============================================================
+# 1. KONFIGURASI KUBUS AGREGAT
+# ============================================================
+# Naikkan versi ini setiap kali struktur kubus di bawah berubah
+KUBUS_VERSION = "1"
+
+# Ukuran (measure) yang tersedia di setiap sel:
+# - jumlah_baris: banyaknya baris permohonan sebenarnya (ukuran utama halaman analisis)
+# - jumlah_permohonan: metrik lama, definisi yang sama dengan df_harian (jumlah
+#   id_jenis_layanan, jadi layanan 2 terhitung dua kali); dipertahankan agar total
+#   per bulan tetap bisa dicocokkan dengan deret yang dipakai model
+# - total_harga
+UKURAN = ["jumlah_permohonan", "jumlah_baris", "total_harga"]
+
+# Dua kuboid dasar; rollup apa pun atas dimensinya cukup groupby pada tabel kecil ini.
+# Minggu ISO bisa melintasi bulan/tahun kalender, jadi punya kuboid sendiri.
+DIMENSI_DASAR = ["tahun", "bulan", "dayofweek", "is_holiday", "id_jenis_layanan"]
+DIMENSI_MINGGU = ["tahun_iso", "minggu", "id_jenis_layanan"]
+
+NAMA_BULAN = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+NAMA_HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+
+# ============================================================
+# 2. KUBUS
+# ============================================================
+class Kubus:
+    """
+    Agregat permohonan yang sudah dimaterialisasi saat data dimuat.
+
+    Ukuran kubus bergantung pada jumlah tahun x bulan x hari x layanan, bukan
+    jumlah baris/hari di riwayat, sehingga slice & rollup untuk interaksi
+    halaman tetap murah berapa pun panjang datanya.
+    """
+
+    def __init__(self, dasar, mingguan):
+        self.dasar = dasar
+        self.mingguan = mingguan
+
+    def tahun(self):
+        return sorted(self.dasar["tahun"].unique().tolist())
+
+    def rollup(self, dimensi, **filter):
+        """
+        Total UKURAN per kombinasi `dimensi` (list nama kolom), setelah memfilter
+        dimensi lain dengan nilai tunggal, mis. rollup(["bulan"], tahun=2024).
+        Kolom label (bulan_nama, hari_nama, libur, layanan) ditambahkan bila relevan.
+        """
+        dimensi = list(dimensi)
+        perlu = set(dimensi) | set(filter)
+        if perlu <= set(DIMENSI_DASAR):
+            df = self.dasar
+        elif perlu <= set(DIMENSI_MINGGU):
+            df = self.mingguan
+        else:
+            raise ValueError(f"Kombinasi dimensi tidak tersedia di kubus: {sorted(perlu)}")
+
+        if filter:
+            masker = np.ones(len(df), dtype=bool)
+            for kolom, nilai in filter.items():
+                masker &= df[kolom].to_numpy() == nilai
+            df = df[masker]
+
+        hasil = df.groupby(dimensi, sort=True)[UKURAN].sum().reset_index() if dimensi else df[UKURAN].sum().to_frame().T
+        return _tambah_label(hasil)
+
+
+def _tambah_label(df):
+    if "bulan" in df:
+        df["bulan_nama"] = np.array(NAMA_BULAN)[df["bulan"].to_numpy() - 1]
+    if "dayofweek" in df:
+        df["hari_nama"] = np.array(NAMA_HARI)[df["dayofweek"].to_numpy()]
+    if "is_holiday" in df:
+        df["libur"] = np.where(df["is_holiday"].to_numpy(), "Libur", "Bukan libur")
+    if "id_jenis_layanan" in df:
+        df["layanan"] = "Layanan " + df["id_jenis_layanan"].astype(str)
+    return df
+
+
+# ============================================================
+# 3. PEMBANGUNAN & CACHE
+# ============================================================
+def bangun_kubus(agregat):
+    """
+    Kubus dari agregat per (tanggal, id_jenis_layanan) dengan kolom
+    jumlah_permohonan (= banyaknya baris) dan total_harga, seperti hasil
+    _agregasi_per_layanan.
+    """
+    df = agregat.reset_index().rename(columns={"jumlah_permohonan": "jumlah_baris"})
+    df["jumlah_baris"] = df["jumlah_baris"].astype("int64")
+    df["total_harga"] = df["total_harga"].astype("int64")
+    df["jumlah_permohonan"] = df["jumlah_baris"] * df["id_jenis_layanan"].astype("int64")
+
+    tanggal = pd.to_datetime(df["tanggal"])
+    tahun = tanggal.dt.year
+    libur = hari_libur(min(tahun.min(), TAHUN_AWAL), max(tahun.max(), TAHUN_AKHIR)) if len(df) else hari_libur()
+    iso = tanggal.dt.isocalendar()
+    df = df.assign(
+        tahun=tahun.astype("int16"),
+        bulan=tanggal.dt.month.astype("int8"),
+        dayofweek=tanggal.dt.dayofweek.astype("int8"),
+        is_holiday=is_libur(ke_nomor_hari(tanggal), libur),
+        tahun_iso=iso["year"].astype("int16"),
+        minggu=iso["week"].astype("int8"),
+    )
+
+    dasar = df.groupby(DIMENSI_DASAR, sort=True)[UKURAN].sum().reset_index()
+    mingguan = df.groupby(DIMENSI_MINGGU, sort=True)[UKURAN].sum().reset_index()
+    return Kubus(dasar, mingguan)
+
+
+@instrumen.terukur("data.load_kubus")
+def load_kubus(file_path: str, use_cache: bool = True, chunksize: int = None):
+    """
+    Kubus agregat untuk file data, dibangun sekali per versi file (cache Parquet
+    dengan kunci sidik jari file dan KUBUS_VERSION, seperti df_harian).
+    """
+    if chunksize is None and Path(file_path).stat().st_size > STREAMING_THRESHOLD_BYTES:
+        chunksize = DEFAULT_CHUNKSIZE
+
+    if not use_cache:
+        return bangun_kubus(_agregasi_per_layanan(file_path, chunksize))
+
+    stem = Path(file_path).stem
+    key = cache_key(file_fingerprint(file_path), KUBUS_VERSION)
+    dasar = read_frame(f"kubus_dasar-{stem}", key)
+    mingguan = read_frame(f"kubus_minggu-{stem}", key)
+    if dasar is None or mingguan is None:
+        kubus = bangun_kubus(_agregasi_per_layanan(file_path, chunksize))
+        write_frame(f"kubus_dasar-{stem}", key, kubus.dasar)
+        write_frame(f"kubus_minggu-{stem}", key, kubus.mingguan)
+        return kubus
+    return Kubus(dasar, mingguan)
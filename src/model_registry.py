@@ -0,0 +1,124 @@
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from src import instrumen
+
+# ============================================================
+# 1. REGISTRY MODEL FORECASTER & SCALER
+# ============================================================
+# Satu bundel = model + kedua scaler + versi (hash isi ketiga file)
+ModelBundle = namedtuple("ModelBundle", ["model", "scaler_x", "scaler_y", "versi"])
+
+ARTEFAK = {
+    "model": "svr_model.pkl",
+    "scaler_x": "scaler_x.pkl",
+    "scaler_y": "scaler_y.pkl",
+}
+
+# Backend forecaster aktif (lihat src.forecaster); file modelnya <backend>_model.pkl
+FORECASTER = os.environ.get("APP_FORECASTER", "svr")
+
+
+def nama_model(backend=None):
+    """Nama file model untuk backend (default: backend aktif)."""
+    return f"{backend or FORECASTER}_model.pkl"
+
+
+def artefak_backend(backend=None):
+    """Artefak registry untuk backend: file model backend + scaler bersama."""
+    return {**ARTEFAK, "model": nama_model(backend)}
+
+
+class ModelRegistry:
+    """
+    Memuat model & scaler sekali per proses dan membagikannya ke semua sesi/thread.
+
+    Setiap get() hanya melakukan os.stat pada ketiga file. Jika ukuran atau mtime
+    berubah, hash SHA-256 dihitung ulang; bila isinya memang berbeda, bundel baru
+    dimuat lalu ditukar secara atomik (tanpa restart). Pemanggil yang sedang
+    memakai bundel lama tetap aman karena bundel tidak pernah diubah di tempat.
+    """
+
+    def __init__(self, model_dir="models", artefak=None, mmap_mode="r"):
+        self.model_dir = Path(model_dir)
+        self.artefak = dict(artefak or ARTEFAK)
+        self.mmap_mode = mmap_mode
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._stat = None
+
+    def _stat_artefak(self):
+        return tuple(
+            (st.st_size, st.st_mtime_ns)
+            for st in (
+                (self.model_dir / nama).stat() for nama in self.artefak.values()
+            )
+        )
+
+    def sidik_stat(self):
+        """
+        Sidik murah artefak dari ukuran & mtime (tanpa membaca isi/memuat model),
+        untuk kunci yang cukup berubah saat file diganti; None jika ada file hilang.
+        """
+        try:
+            return hashlib.sha256(repr(self._stat_artefak()).encode()).hexdigest()[:12]
+        except OSError:
+            return None
+
+    def _hash_artefak(self):
+        h = hashlib.sha256()
+        for nama in self.artefak.values():
+            h.update((self.model_dir / nama).read_bytes())
+        return h.hexdigest()[:12]
+
+    def _muat(self, versi):
+        import joblib
+
+        objek = {}
+        for kunci, nama in self.artefak.items():
+            with instrumen.span("model.joblib_load"):
+                objek[kunci] = joblib.load(self.model_dir / nama, mmap_mode=self.mmap_mode)
+        return ModelBundle(versi=versi, **objek)
+
+    @instrumen.terukur("model.registry_get")
+    def get(self):
+        """Ambil bundel model terbaru; muat ulang hanya jika file di disk berubah."""
+        stat = self._stat_artefak()
+        bundle = self._bundle
+        if bundle is not None and stat == self._stat:
+            return bundle
+
+        with self._lock:
+            # Thread lain mungkin sudah memuat ulang saat kita menunggu lock
+            if self._bundle is not None and stat == self._stat:
+                return self._bundle
+
+            with instrumen.span("model.hash_artefak"):
+                versi = self._hash_artefak()
+            if self._bundle is None or versi != self._bundle.versi:
+                self._bundle = self._muat(versi)
+            self._stat = stat
+            return self._bundle
+
+    def versi(self):
+        return self.get().versi
+
+
+# ============================================================
+# 2. INSTANCE BERSAMA PER PROSES
+# ============================================================
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(model_dir="models", backend=None):
+    """Registry bersama untuk satu folder model & backend (dibuat sekali per proses)."""
+    backend = backend or FORECASTER
+    key = (str(Path(model_dir).resolve()), backend)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ModelRegistry(model_dir, artefak_backend(backend))
+        return _registries[key]
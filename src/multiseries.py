@@ -0,0 +1,182 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.model_registry import ARTEFAK, FORECASTER, get_registry, nama_model
+from src.prediction import ENGINE, prediksi_rekursif_batch
+
+# ============================================================
+# 1. MODEL PER JENIS LAYANAN
+# ============================================================
+# Model khusus layanan diletakkan di models/layanan/<id_jenis_layanan>/ dengan
+# nama file yang sama (<backend>_model.pkl, scaler_x.pkl, scaler_y.pkl), dilatih
+# dengan `python -m src.multiseries --latih`. Model gabungan di models/ dilatih
+# pada deret harian gabungan (skala berbeda), jadi tidak dipakai untuk deret
+# per layanan: layanan tanpa model memakai fallback rata-rata dan ditandai.
+MODEL_ROOT = Path("models")
+SUMBER_MODEL = "model_layanan"
+SUMBER_FALLBACK = "fallback_rata2"
+
+
+def model_dir_layanan(id_layanan, model_root=MODEL_ROOT, backend=None):
+    """Folder model untuk satu jenis layanan, atau None jika belum dilatih."""
+    folder = Path(model_root) / "layanan" / str(id_layanan)
+    return folder if (folder / nama_model(backend)).exists() else None
+
+
+# ============================================================
+# 2. PREDIKSI SEMUA DERET
+# ============================================================
+def _prediksi_grup(model_dir, backend, riwayat, tanggal_terakhir, n_forecast):
+    # Registry per proses: model dimuat saat pertama dibutuhkan lalu di-cache
+    bundle = get_registry(model_dir, backend).get()
+    return prediksi_rekursif_batch(bundle, riwayat, tanggal_terakhir, n_forecast), bundle.versi
+
+
+def predict_future_per_layanan(df_layanan, n_forecast=7, n_jobs=None, model_root=MODEL_ROOT, ukuran_grup=64,
+                               backend=None, fallback=True):
+    """
+    Prediksi n_forecast hari ke depan untuk setiap jenis layanan.
+
+    df_layanan: hasil load_and_prepare_data_per_layanan (long format).
+    Deret yang memakai model yang sama diprediksi serempak dalam satu batch;
+    grup-grup (per model, maksimal ukuran_grup deret) dibagi ke beberapa proses
+    bila n_jobs > 1. Mengembalikan long format: tanggal, id_jenis_layanan,
+    jumlah_permohonan_prediksi (dipotong di 0), versi_model, sumber.
+
+    Layanan tanpa model di models/layanan/<id>/ diprediksi dengan rata-rata
+    `kapasitas` observasi terakhirnya (sumber = SUMBER_FALLBACK, versi_model
+    kosong); dengan fallback=False, FileNotFoundError dilempar.
+    """
+    kapasitas = ENGINE.kapasitas
+    df_layanan = df_layanan.sort_values(["id_jenis_layanan", "tanggal"])
+
+    # --- Ambil observasi terakhir tiap deret ---
+    ekor = df_layanan.groupby("id_jenis_layanan", sort=True).tail(kapasitas)
+    ukuran = ekor.groupby("id_jenis_layanan").size()
+    kurang = ukuran[ukuran < kapasitas].index
+    if len(kurang):
+        print(f"❌ Data belum cukup untuk layanan: {', '.join(map(str, kurang))}", file=sys.stderr)
+        ekor = ekor[~ekor["id_jenis_layanan"].isin(kurang)]
+
+    layanan = ekor["id_jenis_layanan"].unique()
+    kolom_hasil = ["tanggal", "id_jenis_layanan", "jumlah_permohonan_prediksi", "versi_model", "sumber"]
+    if len(layanan) == 0:
+        return pd.DataFrame(columns=kolom_hasil)
+
+    riwayat = ekor["jumlah_permohonan"].to_numpy(dtype=float).reshape(len(layanan), kapasitas)
+    tanggal_terakhir = ekor.groupby("id_jenis_layanan", sort=True)["tanggal"].max().to_numpy()
+
+    # --- Kelompokkan deret per folder model, lalu potong per ukuran_grup ---
+    folder = np.array([str(model_dir_layanan(i, model_root, backend) or "") for i in layanan])
+    tanpa_model = folder == ""
+    if tanpa_model.any() and not fallback:
+        raise FileNotFoundError(
+            f"Model {nama_model(backend)} belum ada untuk layanan: {', '.join(map(str, layanan[tanpa_model]))} "
+            f"(latih dengan: python -m src.multiseries --latih)"
+        )
+    tugas = []
+    for f in np.unique(folder[~tanpa_model]):
+        idx = np.flatnonzero(folder == f)
+        for bagian in np.array_split(idx, max(1, int(np.ceil(len(idx) / ukuran_grup)))):
+            tugas.append((f, bagian))
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    args = [(f, backend, riwayat[b], tanggal_terakhir[b], n_forecast) for f, b in tugas]
+    if n_jobs == 1 or len(tugas) <= 1:
+        hasil = [_prediksi_grup(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tugas))) as pool:
+            hasil = list(pool.map(_prediksi_grup, *zip(*args)))
+
+    # --- Gabungkan ke long format ---
+    prediksi = np.empty((len(layanan), n_forecast))
+    versi = np.full(len(layanan), None, dtype=object)
+    prediksi[tanpa_model] = riwayat[tanpa_model].mean(axis=1, keepdims=True)
+    sumber = np.where(tanpa_model, SUMBER_FALLBACK, SUMBER_MODEL)
+    for (_, b), (y, v) in zip(tugas, hasil):
+        prediksi[b] = y
+        versi[b] = v
+    # Deret layanan kecil & sering nol: SVR bisa memberi nilai sedikit di bawah 0,
+    # padahal jumlah permohonan tidak mungkin negatif
+    np.maximum(prediksi, 0, out=prediksi)
+
+    offsets = np.arange(1, n_forecast + 1).astype("timedelta64[D]")
+    df_hasil = pd.DataFrame({
+        "tanggal": (tanggal_terakhir[:, None] + offsets).ravel(),
+        "id_jenis_layanan": np.repeat(layanan, n_forecast),
+        "jumlah_permohonan_prediksi": prediksi.ravel(),
+        "versi_model": np.repeat(versi, n_forecast),
+        "sumber": np.repeat(sumber, n_forecast),
+    })
+    return df_hasil.sort_values(["tanggal", "id_jenis_layanan"]).reset_index(drop=True)
+
+
+# ============================================================
+# 3. PELATIHAN MODEL PER LAYANAN
+# ============================================================
+def latih_model_layanan(df_layanan, backend=None, model_root=MODEL_ROOT, min_hari=90):
+    """
+    Latih satu model per jenis layanan (skala deret layanan itu sendiri) dan
+    simpan ke models/layanan/<id>/ beserta scaler_x & scaler_y miliknya.
+    Layanan dengan riwayat kurang dari min_hari dilewati.
+    Mengembalikan dict id_jenis_layanan -> folder.
+    """
+    import joblib
+    from sklearn.preprocessing import MinMaxScaler
+
+    from src.forecaster import buat_model, data_latih, simpan
+
+    backend = backend or FORECASTER
+    hasil = {}
+    for id_layanan, df in df_layanan.groupby("id_jenis_layanan", sort=True):
+        if len(df) < max(min_hari, ENGINE.kapasitas + 1):
+            print(f"⚠️  Layanan {id_layanan}: riwayat {len(df)} hari, dilewati")
+            continue
+        X, y = data_latih(df)
+        scaler_x = MinMaxScaler().fit(X)
+        scaler_y = MinMaxScaler().fit(y.reshape(-1, 1))
+        model = buat_model(backend, scaler_x, scaler_y)
+        model.fit(scaler_x.transform(X), scaler_y.transform(y.reshape(-1, 1)).ravel())
+
+        folder = Path(model_root) / "layanan" / str(id_layanan)
+        folder.mkdir(parents=True, exist_ok=True)
+        for kunci, scaler in (("scaler_x", scaler_x), ("scaler_y", scaler_y)):
+            tmp = folder / f".{ARTEFAK[kunci]}.tmp"
+            joblib.dump(scaler, tmp)
+            tmp.replace(folder / ARTEFAK[kunci])
+        simpan(model, folder, backend)
+        hasil[id_layanan] = folder
+        print(f"✅ Layanan {id_layanan}: {len(X)} baris latih -> {folder / nama_model(backend)}")
+    return hasil
+
+
+# ============================================================
+# 4. MAIN UNTUK DIJALANKAN LANGSUNG
+# ============================================================
+def main(argv=None):
+    from src.preprocessing import load_and_prepare_data_per_layanan
+
+    parser = argparse.ArgumentParser(description="Latih model forecaster per jenis layanan.")
+    parser.add_argument("--latih", action="store_true", help="Latih & simpan model ke <model-root>/layanan/<id>/")
+    parser.add_argument("--data", default="data/tbl_permohonan_202507221101.csv")
+    parser.add_argument("--backend", default=None, help="Backend forecaster (default: APP_FORECASTER / svr)")
+    parser.add_argument("--model-root", default=str(MODEL_ROOT))
+    parser.add_argument("--min-hari", type=int, default=90, help="Riwayat minimal agar layanan dilatih")
+    args = parser.parse_args(argv)
+    if not args.latih:
+        parser.print_help()
+        return 2
+
+    df_layanan = load_and_prepare_data_per_layanan(args.data)
+    hasil = latih_model_layanan(df_layanan, args.backend, args.model_root, args.min_hari)
+    return 0 if hasil else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,121 +1,142 @@
+import sys
 import pandas as pd
 import numpy as np
-import joblib
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from pathlib import Path
+from src import instrumen
+from src.model_registry import get_registry
+from src.features import SPEC, FeatureEngine, isi_frame
+from src.kalender import TAHUN_AKHIR, TAHUN_AWAL, hari_libur
 
 # ============================================================
 # 1. FUNGSI PEMBUATAN FITUR
 # ============================================================
+# Libur nasional, cuti bersama & penutupan lokal (nomor hari int64, lihat src.kalender).
+# Horizon yang melewati TAHUN_AKHIR membuat ENGINE memperluas indeksnya sendiri.
+HARI_LIBUR = hari_libur()
+
+ENGINE = FeatureEngine(SPEC, hari_libur=HARI_LIBUR, rentang_libur=(TAHUN_AWAL, TAHUN_AKHIR))
+
+# --- Fitur yang digunakan (harus sesuai training) ---
+FEATURES = ENGINE.kolom
+LAGS = ENGINE.lags
+WINDOWS = ENGINE.windows
+
+
 def buat_fitur(df):
     """Membuat fitur lag, rolling, dan kalender (sesuai fitur training)."""
-    for lag in [10, 20, 30]:
-        df[f"jumlah_permohonan_lag{lag}"] = df["jumlah_permohonan"].shift(lag)
-
-    for window in [10, 20, 30]:
-        df[f"permohonan_mean{window}"] = df["jumlah_permohonan"].rolling(window=window).mean()
-        df[f"permohonan_std{window}"] = df["jumlah_permohonan"].rolling(window=window).std()
-
-    df["hari"] = df["tanggal"].dt.day
-    df["bulan"] = df["tanggal"].dt.month
-    df["tahun"] = df["tanggal"].dt.year
-    df["dayofweek"] = df["tanggal"].dt.dayofweek
-    df["quarter"] = df["tanggal"].dt.quarter
-    df["is_weekend"] = df["dayofweek"].isin([5, 6]).astype(int)
-
-    # Hari libur nasional (contoh)
-    hari_libur = [
-        pd.Timestamp("2025-01-01"),
-        pd.Timestamp("2025-05-01"),
-        pd.Timestamp("2025-08-17"),
-        pd.Timestamp("2025-12-25")
-    ]
-    df["is_holiday"] = df["tanggal"].isin(hari_libur).astype(int)
-    return df
+    X = ENGINE.batch(df["jumlah_permohonan"], df["tanggal"], rolling_shift=0, dtype=np.float64)
+    urutan = FEATURES[:-2] + ["is_weekend", "is_holiday"]
+    return isi_frame(df, X, FEATURES, urutan)
 
 
 # ============================================================
-# 2. FUNGSI PREDIKSI KE DEPAN
+# 2. PREDIKSI REKURSIF (RING BUFFER O(1) PER LANGKAH)
 # ============================================================
-def predict_future(df_harian, n_forecast=7, output_path="output/prediksi_7hari.csv"):
+def prediksi_rekursif(model, scaler_x, scaler_y, riwayat, tanggal_terakhir, n_forecast=7, ukur=None):
     """
-    Melakukan prediksi jumlah permohonan beberapa hari ke depan menggunakan model SVR.
+    Prediksi rekursif n_forecast hari setelah tanggal_terakhir dari array riwayat
+    jumlah_permohonan. Mengembalikan list (tanggal, prediksi).
+    ukur: opsional, fungsi nama -> context manager untuk tahap "fitur" & "prediksi".
     """
-    # --- Load model & scaler ---
-    model_path = Path("models")
-    best_model = joblib.load(model_path / "svr_model.pkl")
-    scaler_x = joblib.load(model_path / "scaler_x.pkl")
-    scaler_y = joblib.load(model_path / "scaler_y.pkl")
-
-    # --- Fitur yang digunakan (harus sesuai training) ---
-    features = [
-        "jumlah_permohonan_lag10", "jumlah_permohonan_lag20", "jumlah_permohonan_lag30",
-        "permohonan_mean10", "permohonan_std10",
-        "permohonan_mean20", "permohonan_std20",
-        "permohonan_mean30", "permohonan_std30",
-        "hari", "bulan", "tahun", "dayofweek", "quarter",
-        "is_holiday", "is_weekend"
-    ]
-
-    # --- Urutkan data berdasarkan tanggal ---
-    df_harian = df_harian.sort_values("tanggal").reset_index(drop=True)
-
-    # --- Simulasi prediksi step-by-step ---
+    ukur = ukur or instrumen.tanpa_ukur
+    with ukur("fitur"):
+        state = ENGINE.online(riwayat)
     hasil_prediksi = []
-    df_pred = df_harian.copy()
+    tanggal_pred = pd.Timestamp(tanggal_terakhir)
 
     for i in range(1, n_forecast + 1):
-        tanggal_pred = df_pred["tanggal"].max() + pd.Timedelta(days=1)
+        tanggal_pred = tanggal_pred + pd.Timedelta(days=1)
+        with instrumen.span("prediksi.fitur"), ukur("fitur"):
+            X_new = pd.DataFrame([state.fitur(tanggal_pred)], columns=FEATURES)
+
+        kosong = X_new.columns[X_new.isna().any()]
+        if len(kosong):
+            # stderr: stdout bisa berisi hasil (python -m src.cli --output -)
+            print(f"❌ Data belum cukup untuk prediksi {tanggal_pred.date()} (fitur kosong: {', '.join(kosong)})",
+                  file=sys.stderr)
+            break
 
-        # Tambahkan baris kosong untuk tanggal baru
-        df_pred = pd.concat([
-            df_pred,
-            pd.DataFrame({"tanggal": [tanggal_pred], "jumlah_permohonan": [np.nan]})
-        ], ignore_index=True)
+        # Scaling dan prediksi
+        with instrumen.span("prediksi.model"), ukur("prediksi"):
+            X_new_scaled = scaler_x.transform(X_new)
+            y_pred_scaled = model.predict(X_new_scaled)
+            y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1)).ravel()[0]
 
-        # Siapkan data sementara untuk feature generation
-        df_temp = df_pred.copy()
-        df_temp["jumlah_permohonan"] = df_temp["jumlah_permohonan"].ffill()
-        df_temp = buat_fitur(df_temp)
+        hasil_prediksi.append((tanggal_pred, y_pred))
+        state.push(y_pred)
 
-        # Ambil baris fitur tanggal prediksi
-        X_new = df_temp.loc[df_temp["tanggal"] == tanggal_pred, features]
+    return hasil_prediksi
 
-        if X_new.isna().sum().sum() > 0:
-            print(f"❌ Data belum cukup untuk prediksi {tanggal_pred.date()}")
-            print(X_new.isna().sum())
-            break
 
-        # Scaling dan prediksi
-        X_new_scaled = scaler_x.transform(X_new)
-        y_pred_scaled = best_model.predict(X_new_scaled)
-        y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1)).ravel()[0]
+def prediksi_rekursif_batch(bundle, riwayat, tanggal_terakhir, n_forecast=7):
+    """
+    Prediksi rekursif untuk banyak deret sekaligus (satu panggilan model per langkah).
+    riwayat: array (n_deret x ENGINE.kapasitas) berisi observasi terakhir tiap deret;
+    tanggal_terakhir: array datetime64 per deret. Mengembalikan (n_deret x n_forecast).
+    """
+    kapasitas = ENGINE.kapasitas
+    buf = np.empty((len(riwayat), kapasitas + n_forecast))
+    buf[:, :kapasitas] = riwayat
+    tanggal_terakhir = np.asarray(tanggal_terakhir, dtype="datetime64[ns]")
 
-        # Simpan hasil
-        hasil_prediksi.append((tanggal_pred, y_pred))
+    for h in range(1, n_forecast + 1):
+        p = kapasitas + h - 2
+        with instrumen.span("prediksi.fitur"):
+            X = pd.DataFrame(ENGINE.langkah_berikut(buf, p, tanggal_terakhir + np.timedelta64(h, "D")), columns=FEATURES)
+        with instrumen.span("prediksi.model"):
+            y_scaled = bundle.model.predict(bundle.scaler_x.transform(X))
+            buf[:, p + 1] = bundle.scaler_y.inverse_transform(y_scaled.reshape(-1, 1)).ravel()
+
+    return buf[:, kapasitas:]
+
+
+# ============================================================
+# 3. FUNGSI PREDIKSI KE DEPAN
+# ============================================================
+@instrumen.terukur("prediksi.predict_future")
+def predict_future(df_harian, n_forecast=7, output_path="output/prediksi_7hari.csv"):
+    """
+    Melakukan prediksi jumlah permohonan beberapa hari ke depan menggunakan model
+    forecaster aktif (APP_FORECASTER, default SVR; lihat src.forecaster).
+    Versi model yang dipakai tersimpan di df_hasil.attrs["versi_model"].
+    """
+    # --- Ambil model & scaler dari registry (dimuat sekali per proses) ---
+    bundle = get_registry("models").get()
 
-        # Masukkan hasil prediksi ke df_pred untuk prediksi hari berikutnya
-        df_pred.loc[df_pred["tanggal"] == tanggal_pred, "jumlah_permohonan"] = y_pred
+    # --- Urutkan data berdasarkan tanggal ---
+    if not df_harian["tanggal"].is_monotonic_increasing:
+        df_harian = df_harian.sort_values("tanggal")
+
+    # --- Prediksi step-by-step (cukup 30 observasi terakhir) ---
+    riwayat = df_harian["jumlah_permohonan"].ffill().to_numpy(dtype=float)
+    hasil_prediksi = prediksi_rekursif(
+        bundle.model, bundle.scaler_x, bundle.scaler_y, riwayat, df_harian["tanggal"].max(), n_forecast
+    )
 
     # --- Hasil akhir ---
     df_hasil = pd.DataFrame(hasil_prediksi, columns=["tanggal", "jumlah_permohonan_prediksi"])
+    df_hasil.attrs["versi_model"] = bundle.versi
     print("📅 Hasil prediksi 7 hari ke depan:")
     print(df_hasil)
 
     # Simpan ke file CSV
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    df_hasil.to_csv(output_path, index=False)
+    with instrumen.span("prediksi.tulis_csv"):
+        df_hasil.to_csv(output_path, index=False)
     print(f"✅ Hasil disimpan di: {output_path}")
 
     return df_hasil
 
 
 # ============================================================
-# 3. VISUALISASI
+# 4. VISUALISASI
 # ============================================================
 def plot_prediction(df_harian, df_hasil):
     """Menampilkan grafik 30 hari terakhir + prediksi 7 hari ke depan."""
+    # matplotlib hanya diimpor di sini agar jalur headless (CLI/UI) tidak memuatnya
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
     df_harian = df_harian.sort_values("tanggal").reset_index(drop=True)
     df_recent = df_harian[df_harian["tanggal"] >= (df_harian["tanggal"].max() - pd.Timedelta(days=30))]
 
@@ -143,11 +164,14 @@ def plot_prediction(df_harian, df_hasil):
 
 
 # ============================================================
-# 4. MAIN UNTUK DIJALANKAN LANGSUNG
+# 5. MAIN UNTUK DIJALANKAN LANGSUNG
 # ============================================================
+# Untuk job terjadwal tanpa tampilan, gunakan: python -m src.cli
 if __name__ == "__main__":
+    from src.preprocessing import load_and_prepare_data
+
     # Load data historis
-    df_harian = pd.read_csv("data/df_harian.csv", parse_dates=["tanggal"])
+    df_harian = load_and_prepare_data("data/tbl_permohonan_202507221101.csv")
 
     # Jalankan prediksi
     df_hasil = predict_future(df_harian, n_forecast=7, output_path="output/prediksi_7hari.csv")
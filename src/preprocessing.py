@@ -1,12 +1,117 @@
 import pandas as pd
 import numpy as np
-import holidays
+from pathlib import Path
+from src import instrumen
+from src.cache import file_fingerprint, cache_key, read_frame, write_frame
+from src.features import SPEC, FeatureEngine, isi_frame
+from src.kalender import hari_libur, TAHUN_AWAL, TAHUN_AKHIR
+
+# Naikkan versi ini setiap kali logika pembuatan fitur di bawah berubah,
+# agar cache df_harian lama otomatis tidak dipakai lagi.
+FITUR_VERSION = "4"
+
+# Mode streaming: hanya kolom yang dipakai, dengan dtype ringkas
+KOLOM_INPUT = ["id_jenis_layanan", "tanggal_permohonan", "total_harga"]
+DTYPE_INPUT = {"id_jenis_layanan": "int16", "tanggal_permohonan": "string", "total_harga": "int32"}
+DEFAULT_CHUNKSIZE = 200_000
+# File di atas ukuran ini otomatis dibaca per chunk
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+# Skema ringkas df_harian/df_layanan (fitur: DTYPE_RINGKAS di src.features).
+# jumlah_permohonan harian muat di int32; total_harga tetap int64 karena
+# omzet harian data besar bisa melewati batas int32.
+DTYPE_HARIAN = {"jumlah_permohonan": "int32", "total_harga": "int64"}
+
+# Urutan kolom fitur di df_harian (kalender dulu, lalu lag & rolling)
+URUTAN_FITUR = SPEC["kalender"] + ["is_weekend", "is_holiday"] + [
+    k for k in FeatureEngine(SPEC).kolom if k not in SPEC["kalender"] + SPEC["flags"]
+]
+
+
+@instrumen.terukur("data.load_and_prepare_data")
+def load_and_prepare_data(file_path: str, use_cache: bool = True, chunksize: int = None, ukur=None):
+    """
+    Baca CSV dan buat semua fitur yang dibutuhkan untuk prediksi harian jumlah permohonan.
+
+    Hasil disimpan di cache disk (Parquet) dengan kunci sidik jari file sumber
+    (ukuran, mtime, SHA-256) dan FITUR_VERSION, sehingga pemanggilan berikutnya
+    cukup membaca file Parquet tanpa memproses ulang CSV.
+
+    chunksize: jika diisi, CSV dibaca per chunk (mode streaming) sehingga memori
+    tetap kecil berapa pun ukuran file. Jika None, mode streaming dipakai otomatis
+    untuk file yang lebih besar dari STREAMING_THRESHOLD_BYTES.
+
+    ukur: opsional, fungsi nama -> context manager (mis. Stopwatch.ukur di
+    src.cli) untuk mencatat tahap "fitur" terpisah dari pembacaan data.
+    """
+    if chunksize is None and Path(file_path).stat().st_size > STREAMING_THRESHOLD_BYTES:
+        chunksize = DEFAULT_CHUNKSIZE
+
+    if not use_cache:
+        return _build_df_harian(file_path, chunksize, ukur)
+
+    nama = f"df_harian-{Path(file_path).stem}"
+    key = cache_key(file_fingerprint(file_path), FITUR_VERSION)
+
+    with instrumen.span("data.baca_cache"):
+        df_harian = read_frame(nama, key)
+    if df_harian is None:
+        df_harian = _build_df_harian(file_path, chunksize, ukur)
+        with instrumen.span("data.tulis_cache"):
+            write_frame(nama, key, df_harian)
+    return df_harian
+
+
+def _build_df_harian(file_path: str, chunksize: int = None, ukur=None):
+    """Proses lengkap CSV mentah -> df_harian (tanpa cache)."""
+    ukur = ukur or instrumen.tanpa_ukur
+    with instrumen.span("data.baca_csv_agregasi"):
+        if chunksize:
+            df_harian = _agregasi_harian_streaming(file_path, chunksize)
+        else:
+            df_harian = _agregasi_harian(file_path)
+    with instrumen.span("data.fitur"), ukur("fitur"):
+        return _tambah_fitur(df_harian)
+
+
+def _agregasi_harian_streaming(file_path: str, chunksize: int):
+    """
+    Baca CSV per chunk dan lipat tiap chunk ke agregat harian berjalan
+    (jumlah_permohonan & total_harga), sehingga yang tersimpan di memori
+    hanya satu chunk + satu baris per tanggal.
+    """
+    agregat = None
+    reader = pd.read_csv(file_path, usecols=KOLOM_INPUT, dtype=DTYPE_INPUT, chunksize=chunksize)
+    for chunk in reader:
+        instrumen.hitung("data.baris_csv", len(chunk))
+        tanggal = pd.to_datetime(chunk["tanggal_permohonan"], format="ISO8601").dt.normalize()
+        parsial = (
+            chunk[["id_jenis_layanan", "total_harga"]]
+            .astype("int64")
+            .groupby(tanggal.values)
+            .sum()
+        )
+        agregat = parsial if agregat is None else agregat.add(parsial, fill_value=0).astype("int64")
+
+    if agregat is None:
+        agregat = pd.DataFrame(columns=["id_jenis_layanan", "total_harga"], dtype="int64")
+
+    df_harian = (
+        agregat.sort_index()
+               .rename(columns={"id_jenis_layanan": "jumlah_permohonan"})
+               .rename_axis("tanggal")
+               .reset_index()
+    )
+    df_harian["tanggal"] = pd.to_datetime(df_harian["tanggal"])
+    return df_harian
+
+
+def _agregasi_harian(file_path: str):
+    """Baca seluruh CSV sekaligus lalu agregasi per hari."""
 
-def load_and_prepare_data(file_path: str):
-    """Baca CSV dan buat semua fitur yang dibutuhkan untuk prediksi harian jumlah permohonan."""
-    
     # 1. Baca data
     df = pd.read_csv(file_path)
+    instrumen.hitung("data.baris_csv", len(df))
 
     # 2. Hapus kolom tidak relevan
     if "status" in df.columns:
@@ -28,28 +133,106 @@ def load_and_prepare_data(file_path: str):
           .rename(columns={"tanggal_permohonan": "tanggal"})
     )
     df_harian["tanggal"] = pd.to_datetime(df_harian["tanggal"])
+    return df_harian
 
-    # 6. Fitur waktu
-    df_harian["hari"] = df_harian["tanggal"].dt.day
-    df_harian["bulan"] = df_harian["tanggal"].dt.month
-    df_harian["tahun"] = df_harian["tanggal"].dt.year
-    df_harian["dayofweek"] = df_harian["tanggal"].dt.dayofweek
-    df_harian["quarter"] = df_harian["tanggal"].dt.quarter
-
-    # 7. Weekend & Holiday
-    indo_holidays = holidays.Indonesia(years=df_harian["tahun"].unique())
-    df_harian["is_weekend"] = df_harian["dayofweek"].isin([5, 6]).astype(int)
-    df_harian["is_holiday"] = df_harian["tanggal"].isin(indo_holidays).astype(int)
 
-    # 8. Fitur lag dan rolling
-    for lag in [10, 20, 30]:
-        df_harian[f"jumlah_permohonan_lag{lag}"] = df_harian["jumlah_permohonan"].shift(lag)
+def _tambah_fitur(df_harian):
+    """Tambahkan fitur waktu, libur, lag, dan rolling ke agregat harian."""
 
-    for window in [10, 20, 30]:
-        df_harian[f"permohonan_mean{window}"] = df_harian["jumlah_permohonan"].shift(1).rolling(window).mean()
-        df_harian[f"permohonan_std{window}"]  = df_harian["jumlah_permohonan"].shift(1).rolling(window).std()
+    # 6-8. Fitur waktu, weekend & holiday, lag dan rolling (dari satu spesifikasi fitur)
+    engine = _engine_untuk(df_harian["tanggal"])
+    X = engine.batch(df_harian["jumlah_permohonan"], df_harian["tanggal"], rolling_shift=1, dtype=np.float64)
+    df_harian = isi_frame(df_harian, X, engine.kolom, URUTAN_FITUR, ringkas=True)
 
     # 9. Drop baris kosong (karena lag)
     df_harian = df_harian.dropna().reset_index(drop=True)
+    df_harian = df_harian.astype(DTYPE_HARIAN)
 
     return df_harian
+
+
+def _engine_untuk(tanggal):
+    """FeatureEngine dengan indeks libur yang mencakup seluruh tahun pada data."""
+    tahun = tanggal.dt.year
+    rentang = (min(tahun.min(), TAHUN_AWAL), max(tahun.max(), TAHUN_AKHIR)) if len(tahun) else (TAHUN_AWAL, TAHUN_AKHIR)
+    return FeatureEngine(SPEC, hari_libur=hari_libur(*rentang), rentang_libur=rentang)
+
+
+# ============================================================
+# MULTI-SERIES: SATU DERET PER JENIS LAYANAN
+# ============================================================
+@instrumen.terukur("data.load_and_prepare_data_per_layanan")
+def load_and_prepare_data_per_layanan(file_path: str, use_cache: bool = True, chunksize: int = None, ukur=None):
+    """
+    Seperti load_and_prepare_data, tetapi menghitung jumlah permohonan per
+    (tanggal, id_jenis_layanan) sehingga setiap jenis layanan menjadi deret sendiri.
+
+    Semua deret memakai kalender hari yang sama (hari ketika ada permohonan
+    apa pun); jenis layanan tanpa permohonan pada hari itu bernilai 0.
+    Hasilnya long format: tanggal, id_jenis_layanan, jumlah_permohonan,
+    total_harga, lalu fitur dengan urutan yang sama seperti df_harian.
+    """
+    if chunksize is None and Path(file_path).stat().st_size > STREAMING_THRESHOLD_BYTES:
+        chunksize = DEFAULT_CHUNKSIZE
+
+    if not use_cache:
+        return _build_df_layanan(file_path, chunksize, ukur)
+
+    nama = f"df_layanan-{Path(file_path).stem}"
+    key = cache_key(file_fingerprint(file_path), FITUR_VERSION)
+
+    df_layanan = read_frame(nama, key)
+    if df_layanan is None:
+        df_layanan = _build_df_layanan(file_path, chunksize, ukur)
+        write_frame(nama, key, df_layanan)
+    return df_layanan
+
+
+def _agregasi_per_layanan(file_path: str, chunksize: int = None):
+    """Jumlah baris & total_harga per (tanggal, id_jenis_layanan), dilipat per chunk."""
+    if chunksize:
+        chunks = pd.read_csv(file_path, usecols=KOLOM_INPUT, dtype=DTYPE_INPUT, chunksize=chunksize)
+    else:
+        chunks = [pd.read_csv(file_path, usecols=KOLOM_INPUT, dtype=DTYPE_INPUT)]
+
+    agregat = None
+    for chunk in chunks:
+        tanggal = pd.to_datetime(chunk["tanggal_permohonan"], format="ISO8601").dt.normalize()
+        parsial = (
+            chunk.assign(tanggal=tanggal, total_harga=chunk["total_harga"].astype("int64"))
+                 .groupby(["tanggal", "id_jenis_layanan"])
+                 .agg(jumlah_permohonan=("total_harga", "size"), total_harga=("total_harga", "sum"))
+        )
+        agregat = parsial if agregat is None else agregat.add(parsial, fill_value=0).astype("int64")
+    return agregat
+
+
+def _build_df_layanan(file_path: str, chunksize: int = None, ukur=None):
+    """Proses lengkap CSV mentah -> df_layanan (tanpa cache)."""
+    agregat = _agregasi_per_layanan(file_path, chunksize)
+    with (ukur or instrumen.tanpa_ukur)("fitur"):
+        return _fitur_layanan(agregat)
+
+
+def _fitur_layanan(agregat):
+    """Agregat (tanggal, id_jenis_layanan) -> df_layanan long format dengan fitur."""
+    # Matriks (hari x layanan); fitur semua deret dihitung sekaligus
+    jumlah = agregat["jumlah_permohonan"].unstack(fill_value=0).sort_index()
+    harga = agregat["total_harga"].unstack(fill_value=0).reindex(index=jumlah.index, columns=jumlah.columns)
+    tanggal = pd.Series(pd.to_datetime(jumlah.index), name="tanggal")
+
+    engine = _engine_untuk(tanggal)
+    X = engine.batch(jumlah.to_numpy(), tanggal, rolling_shift=1, dtype=np.float64)
+
+    n_hari, n_layanan = jumlah.shape
+    df_layanan = pd.DataFrame({
+        "tanggal": np.tile(tanggal.to_numpy(), n_layanan),
+        "id_jenis_layanan": np.repeat(jumlah.columns.to_numpy(), n_hari),
+        "jumlah_permohonan": jumlah.to_numpy().T.ravel().astype(DTYPE_HARIAN["jumlah_permohonan"]),
+        "total_harga": harga.to_numpy().T.ravel().astype(DTYPE_HARIAN["total_harga"]),
+    })
+    # Ukuran kolom eksplisit: reshape(-1) gagal untuk data kosong (0 hari/layanan)
+    df_layanan = isi_frame(
+        df_layanan, X.reshape(n_layanan * n_hari, len(engine.kolom)), engine.kolom, URUTAN_FITUR, ringkas=True
+    )
+    return df_layanan.dropna().reset_index(drop=True)
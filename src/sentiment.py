@@ -0,0 +1,472 @@
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from collections import namedtuple
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from src import instrumen
+from src.cache import file_fingerprint, cache_key, file_path, write_file
+from src.sentiment_cache import normalisasi
+
+# ============================================================
+# 1. KONFIGURASI MODEL SENTIMEN
+# ============================================================
+MODEL_DIR = Path("model_nlp")
+FILE_WAJIB = ["model.safetensors", "config.json", "tokenizer_config.json", "vocab.txt"]
+
+LABEL = {0: "Negatif 😠", 1: "Netral 😐", 2: "Positif 😊"}
+LABEL_TIDAK_DIKETAHUI = "Tidak diketahui"
+LABEL_ERROR = "Error"
+PRED_ERROR = -1
+
+DEFAULT_BATCH_SIZE = 32
+
+# Backend inferensi CPU: "torch" (fp32, seperti semula), "int8" (kuantisasi
+# dinamis PyTorch), "onnx" (model hasil ekspor dijalankan ONNX Runtime)
+BACKEND = ("torch", "int8", "onnx")
+DEFAULT_BACKEND = os.environ.get("SENTIMEN_BACKEND", "torch")
+
+# Hasil konversi disimpan di samping bobot asli; naikkan versi bila cara konversi berubah
+KONVERSI_DIR = "konversi"
+KONVERSI_VERSION = "1"
+
+# pred: indeks kelas per baris (PRED_ERROR jika gagal), probs: (n, n_kelas) float32,
+# n_unik: jumlah teks unik setelah normalisasi, n_cache: teks unik yang diambil dari cache
+HasilSentimen = namedtuple(
+    "HasilSentimen", ["pred", "probs", "detik", "n_unik", "n_cache"], defaults=(0, 0)
+)
+
+
+def file_hilang(model_dir=MODEL_DIR):
+    """Daftar file model wajib yang belum ada di model_dir."""
+    model_dir = Path(model_dir)
+    return [f for f in FILE_WAJIB if not (model_dir / f).exists()]
+
+
+@instrumen.terukur("sentimen.muat_model")
+def muat_model(model_dir=MODEL_DIR, backend=DEFAULT_BACKEND):
+    """
+    Muat tokenizer & model dari folder lokal (torch/transformers diimpor di sini).
+
+    backend "int8" dan "onnx" memakai hasil konversi yang di-cache di
+    model_dir/konversi/; konversi hanya dilakukan sekali per versi bobot.
+    Objek model yang dikembalikan selalu bisa dipanggil model(**inputs).logits.
+    """
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    if backend not in BACKEND:
+        raise ValueError(f"Backend tidak dikenal: {backend} (pilih salah satu dari {', '.join(BACKEND)})")
+
+    model_dir = Path(model_dir).resolve()
+    tokenizer = AutoTokenizer.from_pretrained(str(model_dir), local_files_only=True)
+    if backend == "int8":
+        return tokenizer, _model_int8(model_dir)
+    if backend == "onnx":
+        return tokenizer, _model_onnx(model_dir, tokenizer)
+
+    model = AutoModelForSequenceClassification.from_pretrained(str(model_dir), local_files_only=True)
+    model.eval()
+    return tokenizer, model
+
+
+def sidik_model(model_dir=MODEL_DIR, backend=DEFAULT_BACKEND):
+    """Sidik jari model (isi file model & tokenizer + backend) untuk kunci cache hasil sentimen."""
+    model_dir = Path(model_dir)
+    return cache_key([file_fingerprint(model_dir / f)["sha256"] for f in FILE_WAJIB], backend, KONVERSI_VERSION)
+
+
+# ============================================================
+# 2. PREDIKSI SATU TEKS (JALUR LAMA, PER BARIS)
+# ============================================================
+def prediksi_teks(tokenizer, model, teks):
+    """Indeks kelas untuk satu teks; satu tokenisasi + satu forward pass."""
+    import torch
+
+    inputs = tokenizer(str(teks), return_tensors="pt", truncation=True, padding=True)
+    with torch.inference_mode():
+        logits = model(**inputs).logits
+    return int(torch.argmax(logits, dim=-1).item())
+
+
+def label_teks(pred):
+    """Ubah indeks kelas (skalar atau array) ke label tampilan."""
+    if np.ndim(pred) == 0:
+        pred = int(pred)
+        return LABEL_ERROR if pred == PRED_ERROR else LABEL.get(pred, LABEL_TIDAK_DIKETAHUI)
+    return np.array([label_teks(p) for p in pred], dtype=object)
+
+
+# ============================================================
+# 3. PREDIKSI BATCH DENGAN DEDUP & BUCKET PANJANG
+# ============================================================
+@instrumen.terukur("sentimen.prediksi_batch")
+def prediksi_batch(tokenizer, model, teks, batch_size=DEFAULT_BATCH_SIZE, max_length=None,
+                   progress=None, cache=None, pool=None):
+    """
+    Klasifikasi banyak teks sekaligus.
+
+    Teks lebih dulu dinormalisasi (spasi, huruf kecil bila tokenizer lowercase)
+    lalu diduplikasi, sehingga model hanya dijalankan sekali per teks unik.
+    Jika cache (SentimenCache) diberikan, teks unik yang sudah pernah dianalisis
+    dengan model yang sama diambil dari cache dan sisanya disimpan ke sana.
+
+    Teks yang perlu inferensi diurutkan menurut panjang token sehingga tiap
+    batch berisi teks dengan panjang mirip dan padding tetap kecil. Forward pass
+    berjalan di bawah torch.inference_mode, dan hasil dikembalikan ke urutan
+    baris semula.
+
+    max_length: batas token; None = batas bawaan tokenizer (sama dengan jalur per baris).
+    progress: callback opsional progress(selesai, total) atas teks yang diinferensi.
+    pool: SentimenPool opsional; bila teks yang perlu inferensi lebih dari satu
+    shard, inferensi dibagi ke proses worker (dedup & cache tetap di sini).
+    Batch yang gagal diulang per baris; baris yang tetap gagal diberi PRED_ERROR.
+    """
+    mulai = time.perf_counter()
+    n_kelas = model.config.num_labels
+    lower = getattr(tokenizer, "do_lower_case", False)
+
+    # --- Dedup: indeks teks unik untuk tiap baris ---
+    posisi = {}
+    kembali = np.fromiter(
+        (posisi.setdefault(normalisasi(t, lower), len(posisi)) for t in teks), dtype=np.int64, count=len(teks)
+    )
+    unik = list(posisi)
+    pred_u = np.full(len(unik), PRED_ERROR, dtype=np.int64)
+    probs_u = np.full((len(unik), n_kelas), np.nan, dtype=np.float32)
+
+    instrumen.hitung("sentimen.teks", len(teks))
+    instrumen.hitung("sentimen.teks_unik", len(unik))
+
+    # --- Ambil yang sudah ada di cache ---
+    with instrumen.span("sentimen.cache_ambil"):
+        tersimpan = cache.ambil(unik) if cache is not None else {}
+    instrumen.hitung("sentimen.dari_cache", len(tersimpan))
+    for i, k in enumerate(unik):
+        if k in tersimpan:
+            pred_u[i], probs_u[i] = tersimpan[k]
+
+    # --- Inferensi sisanya ---
+    perlu = np.array([i for i, k in enumerate(unik) if k not in tersimpan], dtype=np.int64)
+    if len(perlu):
+        teks_perlu = [unik[i] for i in perlu]
+        if pool is not None and len(perlu) > pool.ukuran_shard:
+            with instrumen.span("sentimen.pool"):
+                pred_u[perlu], probs_u[perlu] = pool.inferensi(teks_perlu, n_kelas, batch_size, max_length, progress)
+        else:
+            pred_u[perlu], probs_u[perlu] = _inferensi(tokenizer, model, teks_perlu, batch_size, max_length, progress)
+        if cache is not None:
+            # Hanya hasil lengkap yang disimpan: baris gagal / probs non-finite dianalisis ulang nanti
+            ok = perlu[(pred_u[perlu] != PRED_ERROR) & np.isfinite(probs_u[perlu]).all(axis=1)]
+            with instrumen.span("sentimen.cache_simpan"):
+                cache.simpan([unik[i] for i in ok], pred_u[ok], probs_u[ok])
+
+    return HasilSentimen(
+        pred_u[kembali], probs_u[kembali], time.perf_counter() - mulai,
+        n_unik=len(unik), n_cache=len(tersimpan),
+    )
+
+
+def _probs_teks(tokenizer, model, teks, max_length):
+    """Probabilitas kelas satu teks (jalur ulang per baris saat batch gagal)."""
+    import torch
+
+    inputs = tokenizer(teks, truncation=True, max_length=max_length, return_tensors="pt")
+    return torch.softmax(model(**inputs).logits, dim=-1)[0].float().numpy()
+
+
+def _inferensi(tokenizer, model, teks, batch_size, max_length, progress):
+    """Forward pass per batch (teks diurutkan menurut panjang token)."""
+    import torch
+
+    n = len(teks)
+    pred = np.full(n, PRED_ERROR, dtype=np.int64)
+    probs = np.full((n, model.config.num_labels), np.nan, dtype=np.float32)
+
+    with instrumen.span("sentimen.tokenisasi"):
+        panjang = tokenizer(teks, truncation=True, max_length=max_length, return_length=True)["length"]
+    urutan = np.argsort(np.asarray(panjang, dtype=np.int64), kind="stable")
+
+    with torch.inference_mode():
+        for awal in range(0, n, batch_size):
+            idx = urutan[awal:awal + batch_size]
+            try:
+                with instrumen.span("sentimen.tokenisasi"):
+                    batch = tokenizer(
+                        [teks[i] for i in idx], truncation=True, max_length=max_length,
+                        padding=True, return_tensors="pt",
+                    )
+                with instrumen.span("sentimen.forward"):
+                    p = torch.softmax(model(**batch).logits, dim=-1).float().numpy()
+                probs[idx] = p
+                pred[idx] = p.argmax(axis=1)
+            except Exception:
+                for i in idx:
+                    try:
+                        probs[i] = _probs_teks(tokenizer, model, teks[i], max_length)
+                        pred[i] = probs[i].argmax()
+                    except Exception:
+                        pred[i] = PRED_ERROR
+
+            if progress is not None:
+                progress(min(awal + batch_size, n), n)
+
+    return pred, probs
+
+
+# ============================================================
+# 4. MODE STREAMING UNTUK CSV BESAR
+# ============================================================
+DEFAULT_CHUNKSIZE = 5_000
+JUMLAH_PRATINJAU = 10
+
+
+@instrumen.terukur("sentimen.analisis_csv")
+def analisis_csv_streaming(tokenizer, model, sumber, kolom_teks, output_path,
+                           chunksize=DEFAULT_CHUNKSIZE, batch_size=DEFAULT_BATCH_SIZE, progress=None, cache=None,
+                           pool=None, checkpoint_path=None, batal=None):
+    """
+    Baca CSV per chunk, klasifikasi kolom_teks, lalu tulis tiap chunk (dengan
+    kolom Sentimen) langsung ke output_path. Memori tetap sebesar satu chunk
+    berapa pun jumlah barisnya.
+
+    Semua kolom dibaca sebagai teks apa adanya (tanpa konversi NaN), sehingga
+    nilai di file hasil sama dengan file unggahan.
+    sumber: path atau file-like (mis. UploadedFile Streamlit).
+    progress: callback opsional progress(fraksi) berdasarkan posisi byte sumber.
+    cache: SentimenCache opsional (teks berulang antar chunk juga ikut terlayani).
+    pool: SentimenPool opsional untuk membagi inferensi tiap chunk ke beberapa proses.
+    checkpoint_path: jika diisi, posisi terakhir (chunk selesai & ukuran output)
+    disimpan setelah tiap chunk. Bila checkpoint sudah ada, analisis dilanjutkan
+    dari chunk berikutnya dan sisa output yang belum tercatat dibuang.
+    batal: callable opsional; jika mengembalikan True, berhenti setelah chunk berjalan.
+    Mengembalikan dict: baris, detik, distribusi (label -> jumlah), pratinjau
+    (DataFrame), teks_unik, dari_cache (dijumlah per chunk) dan selesai (False
+    jika dibatalkan).
+    """
+    import pandas as pd
+
+    mulai = time.perf_counter()
+    cp = _baca_checkpoint(checkpoint_path, chunksize, kolom_teks) if checkpoint_path else None
+    if cp is not None and not Path(output_path).exists():
+        cp = None
+    status = cp or {"chunk": 0, "baris": 0, "detik": 0.0, "distribusi": {}, "teks_unik": 0, "dari_cache": 0}
+    detik_awal = status["detik"]
+    selesai = True
+
+    buka_sendiri = not hasattr(sumber, "read")
+    f = open(sumber, "rb") if buka_sendiri else sumber
+    try:
+        total_byte = _ukuran_sisa(f)
+        awal = f.tell()
+        reader = pd.read_csv(f, dtype=str, keep_default_na=False, chunksize=chunksize)
+        with open(output_path, "r+" if cp else "w", encoding="utf-8", newline="") as out:
+            if cp:
+                out.truncate(cp["byte_output"])
+                out.seek(0, os.SEEK_END)
+
+            for i, chunk in enumerate(reader):
+                if i < status["chunk"]:
+                    continue  # sudah selesai sebelum dilanjutkan
+                if batal is not None and batal():
+                    selesai = False
+                    break
+
+                hasil = prediksi_batch(
+                    tokenizer, model, chunk[kolom_teks].tolist(), batch_size=batch_size, cache=cache, pool=pool
+                )
+                chunk["Sentimen"] = label_teks(hasil.pred)
+                with instrumen.span("sentimen.tulis_chunk"):
+                    chunk.to_csv(out, index=False, header=(i == 0))
+                    out.flush()
+
+                for label, jumlah in chunk["Sentimen"].value_counts().items():
+                    status["distribusi"][label] = status["distribusi"].get(label, 0) + int(jumlah)
+                status["chunk"] = i + 1
+                status["baris"] += len(chunk)
+                status["teks_unik"] += hasil.n_unik
+                status["dari_cache"] += hasil.n_cache
+                status["detik"] = detik_awal + time.perf_counter() - mulai
+                if checkpoint_path:
+                    _tulis_checkpoint(checkpoint_path, {
+                        **status, "chunksize": chunksize, "kolom": kolom_teks,
+                        "byte_output": os.fstat(out.fileno()).st_size,
+                    })
+
+                if progress is not None and total_byte:
+                    progress(min((f.tell() - awal) / total_byte, 1.0))
+    finally:
+        if buka_sendiri:
+            f.close()
+
+    pratinjau = pd.read_csv(output_path, dtype=str, keep_default_na=False, nrows=JUMLAH_PRATINJAU) \
+        if status["baris"] else pd.DataFrame()
+    return {
+        "baris": status["baris"],
+        "detik": detik_awal + time.perf_counter() - mulai,
+        "distribusi": status["distribusi"],
+        "pratinjau": pratinjau,
+        "teks_unik": status["teks_unik"],
+        "dari_cache": status["dari_cache"],
+        "selesai": selesai,
+    }
+
+
+def _baca_checkpoint(path, chunksize, kolom_teks):
+    """Checkpoint yang masih cocok (chunksize & kolom sama), atau None."""
+    try:
+        cp = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cp.get("chunksize") != chunksize or cp.get("kolom") != kolom_teks:
+        return None
+    return cp
+
+
+def _tulis_checkpoint(path, data):
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".checkpoint-", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _ukuran_sisa(f):
+    """Jumlah byte dari posisi sekarang sampai akhir file (untuk progress)."""
+    posisi = f.tell()
+    f.seek(0, 2)
+    ukuran = f.tell() - posisi
+    f.seek(posisi)
+    return ukuran
+
+
+# ============================================================
+# 5. BACKEND HASIL KONVERSI (INT8 & ONNX)
+# ============================================================
+def _kunci_konversi(model_dir, backend):
+    """Kunci cache konversi: isi bobot & config, versi torch, versi konversi."""
+    import torch
+
+    sidik = [file_fingerprint(model_dir / f)["sha256"] for f in ("model.safetensors", "config.json")]
+    return cache_key(sidik, backend, torch.__version__, KONVERSI_VERSION)
+
+
+def _konversi(model_dir, backend, suffix, tulis):
+    """Jalankan konversi sekali lalu simpan atomik; kembalikan path hasilnya."""
+    key = _kunci_konversi(model_dir, backend)
+    cache_dir = model_dir / KONVERSI_DIR
+    path = file_path(backend, key, suffix, cache_dir)
+    if path.exists():
+        return path
+
+    galat = []
+
+    def tulis_aman(tmp):
+        try:
+            tulis(tmp)
+        except Exception as e:
+            galat.append(e)
+            raise
+
+    path = write_file(backend, key, suffix, tulis_aman, cache_dir)
+    if path is None:
+        raise RuntimeError(f"Konversi model ke {backend} gagal: {galat[0] if galat else 'file tidak bisa ditulis'}")
+    return path
+
+
+def _model_fp32(model_dir):
+    from transformers import AutoModelForSequenceClassification
+
+    model = AutoModelForSequenceClassification.from_pretrained(str(model_dir), local_files_only=True)
+    return model.eval()
+
+
+def _model_int8(model_dir):
+    """Model dengan layer Linear dikuantisasi dinamis ke int8."""
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+
+    def kuantisasi(model):
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    path = _konversi(model_dir, "int8", ".pt", lambda tmp: torch.save(kuantisasi(_model_fp32(model_dir)).state_dict(), tmp))
+
+    # Arsitektur dibangun dari config saja (tanpa membaca bobot fp32), lalu diisi bobot int8
+    config = AutoConfig.from_pretrained(str(model_dir), local_files_only=True)
+    model = kuantisasi(AutoModelForSequenceClassification.from_config(config).eval())
+    # state_dict int8 hanya berisi tensor (termasuk tensor terkuantisasi), dtype & tuple:
+    # cukup dimuat dengan unpickler weights_only, tanpa mengeksekusi objek arbitrer
+    model.load_state_dict(torch.load(path, weights_only=True))
+    return model.eval()
+
+
+def _model_onnx(model_dir, tokenizer):
+    """Model hasil ekspor ONNX, dijalankan dengan ONNX Runtime (CPU)."""
+    from transformers import AutoConfig
+
+    def ekspor(tmp):
+        import torch
+
+        model = _model_fp32(model_dir)
+        contoh = tokenizer(["contoh teks pendek", "teks"], padding=True, return_tensors="pt")
+        # input_names diberikan sesuai urutan argumen forward(), bukan urutan tokenizer
+        nama_input = [k for k in inspect.signature(model.forward).parameters if k in contoh]
+        sumbu = {k: {0: "batch", 1: "panjang"} for k in nama_input}
+        sumbu["logits"] = {0: "batch"}
+        torch.onnx.export(
+            model, (), tmp, kwargs={k: contoh[k] for k in nama_input},
+            input_names=nama_input, output_names=["logits"], dynamic_axes=sumbu,
+            opset_version=14, dynamo=False,
+        )
+
+    path = _konversi(model_dir, "onnx", ".onnx", ekspor)
+    config = AutoConfig.from_pretrained(str(model_dir), local_files_only=True)
+    return OnnxClassifier(path, config)
+
+
+class OnnxClassifier:
+    """Pembungkus sesi ONNX Runtime dengan antarmuka model(**inputs).logits seperti PyTorch."""
+
+    def __init__(self, path, config):
+        import onnxruntime as ort
+
+        self.config = config
+        self.path = Path(path)
+        self.session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def __call__(self, **inputs):
+        import torch
+
+        feed = {k: v.numpy() for k, v in inputs.items() if k in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+# ============================================================
+# 6. TUGAS LATAR BELAKANG (JobManager)
+# ============================================================
+def id_job_csv(isi, kolom_teks, sidik):
+    """Job ID deterministik: file, kolom, dan model yang sama -> job yang sama (bisa dilanjutkan)."""
+    return "sentimen-" + cache_key(hashlib.sha256(isi).hexdigest(), kolom_teks, sidik)
+
+
+def tugas_analisis_csv(job, tokenizer, model, cache=None, pool=None):
+    """
+    Tugas untuk JobManager: analisis job.folder/input.csv ke job.folder/hasil.csv
+    dengan checkpoint per chunk, sehingga job yang terhenti dilanjutkan dari
+    chunk terakhir yang selesai.
+    """
+    folder = job.folder
+    ringkasan = analisis_csv_streaming(
+        tokenizer, model, folder / "input.csv", job.param["kolom"], folder / "hasil.csv",
+        progress=lambda fraksi: job.lapor(fraksi, f"{fraksi:.0%}"),
+        cache=cache, pool=pool, checkpoint_path=folder / "checkpoint.json", batal=job.dibatalkan,
+    )
+    ringkasan.pop("pratinjau")
+    return ringkasan
@@ -0,0 +1,135 @@
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from src.cache import CACHE_DIR
+
+# ============================================================
+# 1. KONFIGURASI
+# ============================================================
+# Satu file SQLite dipakai bersama semua sesi/proses; entri dipisah per sidik model
+CACHE_PATH = CACHE_DIR / "sentimen.sqlite"
+MAX_ENTRI = 200_000
+# Saat melewati MAX_ENTRI, entri paling lama tidak dipakai dihapus sampai tersisa fraksi ini
+SISA_SETELAH_PANGKAS = 0.9
+# Batas parameter per query (SQLite lama membatasi 999)
+UKURAN_QUERY = 500
+
+_SPASI = re.compile(r"\s+")
+
+
+# ============================================================
+# 2. NORMALISASI TEKS
+# ============================================================
+def normalisasi(teks, lower=True):
+    """
+    Kunci cache untuk satu teks: spasi dirapikan dan (jika tokenizer model
+    memang lowercase) huruf kecil. Teks dengan kunci sama menghasilkan token
+    yang sama, sehingga labelnya dijamin sama.
+    """
+    teks = _SPASI.sub(" ", str(teks)).strip()
+    return teks.lower() if lower else teks
+
+
+# ============================================================
+# 3. CACHE SQLITE (TEKS -> LABEL & PROBABILITAS)
+# ============================================================
+class SentimenCache:
+    """
+    Cache hasil sentimen persisten dengan kunci (sidik model, teks ternormalisasi).
+
+    Koneksi dibuka per operasi sehingga aman dipakai dari banyak thread
+    Streamlit maupun proses worker. Jumlah entri dibatasi max_entri; yang
+    dihapus lebih dulu adalah entri yang paling lama tidak diakses.
+    """
+
+    def __init__(self, sidik_model, path=CACHE_PATH, max_entri=MAX_ENTRI):
+        self.sidik_model = sidik_model
+        self.path = Path(path)
+        self.max_entri = max_entri
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS sentimen ("
+                " model TEXT NOT NULL, teks TEXT NOT NULL, pred INTEGER NOT NULL,"
+                " probs BLOB NOT NULL, akses REAL NOT NULL, PRIMARY KEY (model, teks))"
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS idx_sentimen_akses ON sentimen (akses)")
+
+    @contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def ambil(self, kunci):
+        """Dict kunci -> (pred, probs) untuk kunci yang sudah ada di cache."""
+        hasil = {}
+        with self._connect() as con:
+            for awal in range(0, len(kunci), UKURAN_QUERY):
+                bagian = kunci[awal:awal + UKURAN_QUERY]
+                tanda = ",".join("?" * len(bagian))
+                for teks, pred, probs in con.execute(
+                    f"SELECT teks, pred, probs FROM sentimen WHERE model = ? AND teks IN ({tanda})",
+                    [self.sidik_model, *bagian],
+                ):
+                    hasil[teks] = (pred, np.frombuffer(probs, dtype=np.float32))
+            if hasil:
+                sekarang = time.time()
+                con.executemany(
+                    "UPDATE sentimen SET akses = ? WHERE model = ? AND teks = ?",
+                    [(sekarang, self.sidik_model, k) for k in hasil],
+                )
+
+        with self._lock:
+            self.hits += len(hasil)
+            self.misses += len(kunci) - len(hasil)
+        return hasil
+
+    def simpan(self, kunci, pred, probs):
+        """Simpan hasil inferensi baru, lalu pangkas bila melebihi max_entri."""
+        if len(kunci) == 0:
+            return
+        sekarang = time.time()
+        baris = [
+            (self.sidik_model, k, int(p), np.asarray(pr, dtype=np.float32).tobytes(), sekarang)
+            for k, p, pr in zip(kunci, pred, probs)
+        ]
+        with self._connect() as con:
+            con.executemany("INSERT OR REPLACE INTO sentimen VALUES (?, ?, ?, ?, ?)", baris)
+            self._pangkas(con)
+
+    def _pangkas(self, con):
+        (jumlah,) = con.execute("SELECT COUNT(*) FROM sentimen").fetchone()
+        if jumlah <= self.max_entri:
+            return
+        buang = jumlah - int(self.max_entri * SISA_SETELAH_PANGKAS)
+        con.execute(
+            "DELETE FROM sentimen WHERE rowid IN (SELECT rowid FROM sentimen ORDER BY akses LIMIT ?)",
+            (buang,),
+        )
+
+    def statistik(self):
+        total = self.hits + self.misses
+        with self._connect() as con:
+            (entri,) = con.execute(
+                "SELECT COUNT(*) FROM sentimen WHERE model = ?", (self.sidik_model,)
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entri": entri,
+        }
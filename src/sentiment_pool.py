@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.sentiment import MODEL_DIR, DEFAULT_BACKEND, DEFAULT_BATCH_SIZE, muat_model, prediksi_batch
+
+# ============================================================
+# 1. KONFIGURASI EKSEKUSI
+# ============================================================
+# SENTIMEN_WORKERS: jumlah proses worker untuk analisis massal
+#   tidak diisi = jumlah core / SENTIMEN_THREADS (maks. MAX_WORKERS_AUTO; tanpa pool
+#   bila hasilnya < 2), 0 = selalu tanpa pool
+# SENTIMEN_THREADS: thread PyTorch per worker
+# SENTIMEN_THREADS_LATENSI: thread PyTorch di proses utama (teks tunggal), agar
+#   satu pengguna tidak memakai semua core dan sesi lain tetap responsif
+MAX_WORKERS_AUTO = 4
+UKURAN_SHARD = 1_000
+
+
+def jumlah_core():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _env_int(nama, default):
+    nilai = os.environ.get(nama, "").strip()
+    return int(nilai) if nilai.lstrip("-").isdigit() else default
+
+
+def konfigurasi():
+    """Konfigurasi efektif (workers, threads_per_worker, threads_latensi) dari environment."""
+    threads = max(1, _env_int("SENTIMEN_THREADS", 1))
+    auto = jumlah_core() // threads
+    workers = _env_int("SENTIMEN_WORKERS", min(auto, MAX_WORKERS_AUTO) if auto >= 2 else 0)
+    threads_latensi = max(1, _env_int("SENTIMEN_THREADS_LATENSI", min(2, jumlah_core())))
+    return {"workers": max(0, workers), "threads_per_worker": threads, "threads_latensi": threads_latensi}
+
+
+def atur_thread(n_threads):
+    """Batasi thread intra-op PyTorch di proses ini."""
+    import torch
+
+    torch.set_num_threads(n_threads)
+    try:
+        # Hanya bisa diatur sebelum operasi paralel pertama
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+# ============================================================
+# 2. WORKER (SATU MODEL PER PROSES)
+# ============================================================
+_worker = {}
+
+
+def _init_worker(model_dir, backend, n_threads):
+    atur_thread(n_threads)
+    _worker["model"] = muat_model(model_dir, backend)
+
+
+def _siap():
+    return os.getpid()
+
+
+def _proses_shard(teks, batch_size, max_length):
+    tokenizer, model = _worker["model"]
+    hasil = prediksi_batch(tokenizer, model, teks, batch_size=batch_size, max_length=max_length)
+    return hasil.pred, hasil.probs
+
+
+# ============================================================
+# 3. POOL SHARDING
+# ============================================================
+class SentimenPool:
+    """
+    Pool proses untuk analisis sentimen massal.
+
+    Tiap worker memuat model sekali (saat mulai()/mulai_latar(), atau saat pool
+    pertama dipakai) dengan jumlah thread PyTorch yang dipatok, lalu menerima
+    potongan (shard) teks. Pool
+    memakai start method "spawn" agar worker tidak mewarisi state thread
+    PyTorch/OpenMP dari proses Streamlit.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, backend=DEFAULT_BACKEND, n_workers=2, threads_per_worker=1,
+                 ukuran_shard=UKURAN_SHARD):
+        self.model_dir = str(model_dir)
+        self.backend = backend
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+        self.ukuran_shard = ukuran_shard
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_dir, self.backend, self.threads_per_worker),
+                )
+            return self._pool
+
+    def mulai(self):
+        """Jalankan semua worker sekarang (model dimuat) agar permintaan pertama tidak menunggu."""
+        pool = self._executor()
+        return sorted({f.result() for f in [pool.submit(_siap) for _ in range(self.n_workers)]})
+
+    def mulai_latar(self):
+        """
+        mulai() di thread latar: worker di-spawn dan memuat model tanpa menahan
+        pemanggil. Kegagalan diabaikan di sini; job pertama akan melaporkannya.
+        """
+        def jalankan():
+            try:
+                self.mulai()
+            except Exception:
+                pass
+
+        threading.Thread(target=jalankan, name="sentimen-pool", daemon=True).start()
+
+    def inferensi(self, teks, n_kelas, batch_size=DEFAULT_BATCH_SIZE, max_length=None, progress=None):
+        """(pred, probs) untuk daftar teks, dibagi per shard ke semua worker."""
+        n = len(teks)
+        pred = np.empty(n, dtype=np.int64)
+        probs = np.empty((n, n_kelas), dtype=np.float32)
+
+        pool = self._executor()
+        tugas = {
+            pool.submit(_proses_shard, teks[awal:awal + self.ukuran_shard], batch_size, max_length): awal
+            for awal in range(0, n, self.ukuran_shard)
+        }
+        selesai = 0
+        for fut in as_completed(tugas):
+            awal = tugas[fut]
+            p, pr = fut.result()
+            pred[awal:awal + len(p)] = p
+            probs[awal:awal + len(p)] = pr
+            selesai += len(p)
+            if progress is not None:
+                progress(selesai, n)
+        return pred, probs
+
+    def tutup(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+
+# ============================================================
+# 4. MODEL PROSES UTAMA (BERSAMA)
+# ============================================================
+_model = {}
+_model_lock = threading.Lock()
+
+
+def get_model(model_dir=MODEL_DIR, backend=DEFAULT_BACKEND):
+    """
+    (tokenizer, model) untuk proses utama (teks tunggal & analisis tanpa pool),
+    dimuat sekali per proses dan dipakai semua sesi serta warm-up.
+    """
+    key = (str(model_dir), backend)
+    with _model_lock:
+        if key not in _model:
+            # Thread dibatasi agar satu pengguna tidak memakai semua core
+            atur_thread(konfigurasi()["threads_latensi"])
+            _model[key] = muat_model(model_dir, backend)
+        return _model[key]
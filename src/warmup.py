@@ -0,0 +1,83 @@
+"""
+Warm-up opsional saat server start: siapkan prediksi default dan model NLP di
+thread latar sebelum pengguna pertama membutuhkannya.
+
+Aktifkan dengan environment APP_WARMUP=1, mis.:
+    APP_WARMUP=1 streamlit run main.py
+"""
+import os
+import threading
+import time
+
+# ============================================================
+# 1. KONFIGURASI
+# ============================================================
+WARMUP = os.environ.get("APP_WARMUP", "").lower() in ("1", "true", "ya")
+
+# Teks dummy untuk satu inferensi pertama (alokasi buffer & JIT kernel PyTorch)
+TEKS_DUMMY = ["pelayanan cepat dan ramah"]
+
+_status = {"keadaan": "mati", "langkah": {}, "error": None}
+_lock = threading.Lock()
+
+
+# ============================================================
+# 2. LANGKAH WARM-UP
+# ============================================================
+def _prediksi_default(df_harian):
+    from src.forecast_cache import MAX_HORIZON, predict_future_cached
+
+    # Cache menyimpan horizon maksimum: semua pilihan slider ikut hangat
+    predict_future_cached(df_harian, MAX_HORIZON)
+
+
+def _model_nlp():
+    from src.artifacts import get_artifacts
+
+    artefak = get_artifacts()
+    if not artefak.siap():
+        artefak.pastikan()
+
+
+def _inferensi_dummy():
+    from src.sentiment import prediksi_batch
+    from src.sentiment_pool import get_model
+
+    tokenizer, model = get_model()
+    prediksi_batch(tokenizer, model, TEKS_DUMMY)
+
+
+def _jalankan(df_harian):
+    langkah = [
+        ("prediksi_default", lambda: _prediksi_default(df_harian)),
+        ("model_nlp", _model_nlp),
+        ("inferensi_dummy", _inferensi_dummy),
+    ]
+    for nama, fungsi in langkah:
+        mulai = time.perf_counter()
+        try:
+            fungsi()
+        except Exception as e:
+            # Warm-up hanya mempercepat; halaman tetap menangani kegagalannya sendiri
+            _status["keadaan"] = "gagal"
+            _status["error"] = f"{nama}: {e}"
+            return
+        _status["langkah"][nama] = time.perf_counter() - mulai
+    _status["keadaan"] = "selesai"
+
+
+# ============================================================
+# 3. API
+# ============================================================
+def mulai(df_harian, aktif=WARMUP):
+    """Mulai warm-up di thread latar (sekali per proses) jika aktif."""
+    with _lock:
+        if not aktif or _status["keadaan"] != "mati":
+            return
+        _status["keadaan"] = "berjalan"
+    threading.Thread(target=_jalankan, args=(df_harian,), name="warmup", daemon=True).start()
+
+
+def status():
+    """Keadaan warm-up dan durasi (detik) tiap langkah yang sudah selesai."""
+    return {**_status, "langkah": dict(_status["langkah"])}
@@ -0,0 +1,47 @@
+"""
+Konfigurasi bersama tes: semua cache disk (Parquet, kalender, job, SQLite
+sentimen) diarahkan ke folder sementara agar tes tidak memakai atau mengotori
+cache/ milik aplikasi. Harus diatur sebelum modul src diimpor.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+CACHE_TES = tempfile.mkdtemp(prefix="permohonan-tes-")
+os.environ["PERMOHONAN_CACHE_DIR"] = CACHE_TES
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _hapus_cache_tes():
+    yield
+    shutil.rmtree(CACHE_TES, ignore_errors=True)
+
+
+# Kosakata kecil: kata utuh ulasan + huruf tunggal agar teks apa pun tetap bisa ditokenisasi
+KOSAKATA = (
+    ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    + "pelayanan sangat bagus buruk lambat cepat ramah petugas puas kecewa antri lama tidak".split()
+    + list("abcdefghijklmnopqrstuvwxyz") + [f"##{c}" for c in "abcdefghijklmnopqrstuvwxyz"]
+)
+
+
+@pytest.fixture(scope="session")
+def model_nlp(tmp_path_factory):
+    """
+    Folder model sentimen mini (BERT 2 lapis, bobot acak dengan seed tetap) yang
+    bisa dimuat src.sentiment.muat_model, pengganti model_nlp/ asli di tes.
+    """
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    folder = tmp_path_factory.mktemp("model_nlp")
+    (folder / "vocab.txt").write_text("\n".join(KOSAKATA) + "\n", encoding="utf-8")
+    BertTokenizerFast(str(folder / "vocab.txt"), do_lower_case=True, model_max_length=512).save_pretrained(folder)
+    torch.manual_seed(0)
+    # initializer_range besar: bobot acak default (0.02) memberi kelas yang sama untuk semua teks
+    config = BertConfig(vocab_size=len(KOSAKATA), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                        intermediate_size=64, num_labels=3, initializer_range=0.5)
+    BertForSequenceClassification(config).save_pretrained(folder)
+    return folder
@@ -0,0 +1,87 @@
+"""
+Membuat ulang fixture acuan fitur dari kode baseline (commit BASELINE), bukan
+dari kode saat ini, agar tes paritas membandingkan dengan perilaku lama yang
+dibekukan.
+
+File yang ditulis ke tests/fixtures/:
+- permohonan_sampel.csv    : potongan data mentah (RENTANG)
+- df_harian_baseline.csv   : load_and_prepare_data baseline atas sampel
+- libur_baseline.csv       : kalender holidays.Indonesia yang dipakai baseline
+- buat_fitur_baseline.csv  : buat_fitur baseline atas deret harian + 1 hari
+                             prediksi yang di-ffill (seperti predict_future lama)
+- prediksi_baseline.csv    : predict_future baseline HORIZON hari dengan model
+                             SVR & scaler dari commit BASELINE
+
+Jalankan dari root repo (butuh git & pustaka holidays):
+    python -m tests.fixtures.buat_acuan
+"""
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+BASELINE = "4295c7f"
+DATA_PATH = "data/tbl_permohonan_202507221101.csv"
+RENTANG = ("2024-10-01", "2025-06-01")
+# Cukup panjang untuk melewati libur tetap buat_fitur baseline (2025-08-17)
+HORIZON = 90
+FOLDER = Path(__file__).parent
+
+
+def git_show(path):
+    return subprocess.run(["git", "show", f"{BASELINE}:{path}"], capture_output=True, check=True).stdout
+
+
+def modul_baseline(path):
+    """Namespace hasil eksekusi file sumber pada commit BASELINE."""
+    kode = git_show(path).decode("utf-8")
+    ns = {"__name__": f"baseline_{Path(path).stem}"}
+    exec(compile(kode, f"{BASELINE}:{path}", "exec"), ns)
+    return ns
+
+
+def prediksi_baseline(df_harian):
+    """predict_future baseline, dijalankan di folder sementara berisi models/ dari BASELINE."""
+    predict_future = modul_baseline("src/prediction.py")["predict_future"]
+    asal = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        (Path(folder) / "models").mkdir()
+        for nama in ("svr_model.pkl", "scaler_x.pkl", "scaler_y.pkl"):
+            (Path(folder) / "models" / nama).write_bytes(git_show(f"models/{nama}"))
+        os.chdir(folder)
+        try:
+            return predict_future(df_harian, n_forecast=HORIZON, output_path="prediksi.csv")
+        finally:
+            os.chdir(asal)
+
+
+def main():
+    import holidays
+
+    mentah = pd.read_csv(DATA_PATH, dtype=str)
+    tanggal = pd.to_datetime(mentah["tanggal_permohonan"])
+    sampel = mentah[(tanggal >= RENTANG[0]) & (tanggal < RENTANG[1])]
+    sampel_path = FOLDER / "permohonan_sampel.csv"
+    sampel.to_csv(sampel_path, index=False)
+
+    df_harian = modul_baseline("src/preprocessing.py")["load_and_prepare_data"](str(sampel_path))
+    df_harian.to_csv(FOLDER / "df_harian_baseline.csv", index=False)
+
+    libur = holidays.Indonesia(years=df_harian["tahun"].unique())
+    pd.DataFrame({"tanggal": sorted(libur.keys())}).to_csv(FOLDER / "libur_baseline.csv", index=False)
+
+    df_pred = df_harian[["tanggal", "jumlah_permohonan"]].astype({"jumlah_permohonan": "float64"})
+    besok = df_pred["tanggal"].max() + pd.Timedelta(days=1)
+    df_pred = pd.concat([df_pred, pd.DataFrame({"tanggal": [besok], "jumlah_permohonan": [float("nan")]})],
+                        ignore_index=True)
+    df_pred["jumlah_permohonan"] = df_pred["jumlah_permohonan"].ffill()
+    modul_baseline("src/prediction.py")["buat_fitur"](df_pred).to_csv(FOLDER / "buat_fitur_baseline.csv", index=False)
+
+    prediksi_baseline(df_harian).to_csv(FOLDER / "prediksi_baseline.csv", index=False)
+    print(f"Fixture ditulis ke {FOLDER} ({len(sampel)} baris mentah, {len(df_harian)} hari)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Lapisan cache Streamlit (src.app_cache): rerun halaman tidak menghitung ulang
+produk data, df_harian di cache tidak diubah halaman, dan perubahan ukuran/
+mtime file data memberi cache miss baru.
+"""
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from src import app_cache
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = "data/tbl_permohonan_202507221101.csv"
+SAMPEL = Path(__file__).parent / "fixtures" / "permohonan_sampel.csv"
+
+
+def sidik_frame(df):
+    return int(pd.util.hash_pandas_object(df, index=True).sum())
+
+
+def miss_df_harian(data_path):
+    """Jumlah cache miss df_harian yang dipicu satu panggilan muat_df_harian."""
+    awal = app_cache.statistik().get("df_harian", 0)
+    app_cache.muat_df_harian(data_path)
+    return app_cache.statistik().get("df_harian", 0) - awal
+
+
+def tunggu(at, selesai, batas=60):
+    """Rerun sampai kondisi selesai(at) terpenuhi (job latar/fragment)."""
+    akhir = time.time() + batas
+    while not selesai(at):
+        if time.time() > akhir:
+            raise TimeoutError("Halaman tidak selesai dalam batas waktu")
+        time.sleep(0.3)
+        at.run()
+
+
+def test_df_harian_miss_baru_saat_ukuran_atau_mtime_berubah(tmp_path):
+    salinan = tmp_path / SAMPEL.name
+    shutil.copyfile(SAMPEL, salinan)
+    assert miss_df_harian(salinan) == 1
+    assert miss_df_harian(salinan) == 0
+
+    st_file = salinan.stat()
+    os.utime(salinan, ns=(st_file.st_atime_ns, st_file.st_mtime_ns + 10**9))
+    assert miss_df_harian(salinan) == 1
+
+    st_file = salinan.stat()
+    with open(salinan, "a", encoding="utf-8") as f:
+        f.write("\n")  # baris kosong: isi data sama, hanya ukuran yang berubah
+    os.utime(salinan, ns=(st_file.st_atime_ns, st_file.st_mtime_ns))
+    assert miss_df_harian(salinan) == 1
+    assert miss_df_harian(salinan) == 0
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # main.py memakai path data & model relatif terhadap root repo
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(str(ROOT / "main.py"), default_timeout=120)
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def test_rerun_analisis_tidak_menghitung_ulang(app):
+    app.radio[0].set_value("Analisis Data Historis").run()
+    tahun = app.selectbox[0].options
+    awal = app_cache.statistik()
+    for i in range(4):
+        # Ganti tahun: hanya slice kubus, tidak ada produk data yang dihitung ulang
+        app.selectbox[0].set_value(tahun[i % len(tahun)]).run()
+        assert not app.exception, app.exception
+    assert app_cache.statistik() == awal
+
+
+def test_rerun_prediksi_tidak_menghitung_ulang_dan_tidak_mengubah_df_harian(app):
+    sidik_awal = sidik_frame(app_cache.muat_df_harian(DATA_PATH))
+    app.radio[0].set_value("Prediksi Jumlah Permohonan").run()
+    # Jalankan prediksi sekali agar grafik (riwayat_grafik) ikut dirender
+    app.button[0].click().run()
+    tunggu(app, lambda a: a.get("plotly_chart"))
+
+    awal = app_cache.statistik()
+    for _ in range(3):
+        app.run()
+        assert not app.exception, app.exception
+    assert app_cache.statistik() == awal
+    assert sidik_frame(app_cache.muat_df_harian(DATA_PATH)) == sidik_awal
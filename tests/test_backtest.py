@@ -0,0 +1,31 @@
+"""
+Backtest rolling-origin (src.backtest): hasil paralel per blok identik dengan
+jalur satu proses.
+"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.backtest import backtest
+from src.preprocessing import load_and_prepare_data
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPEL = ROOT / "tests" / "fixtures" / "permohonan_sampel.csv"
+
+
+@pytest.fixture(scope="module")
+def df_harian():
+    return load_and_prepare_data(str(SAMPEL), use_cache=False)
+
+
+@pytest.mark.parametrize("step", [1, 3])
+def test_jobs_1_dan_jobs_n_identik(df_harian, step):
+    # blok kecil agar origin terbagi ke beberapa blok dan jalur pool benar-benar dipakai
+    argumen = dict(horizon=7, step=step, model_dir=str(ROOT / "models"), blok=16)
+    detail_1, ringkas_1 = backtest(df_harian, n_jobs=1, **argumen)
+    detail_n, ringkas_n = backtest(df_harian, n_jobs=3, **argumen)
+
+    assert detail_1["tanggal_origin"].nunique() > 16
+    pd.testing.assert_frame_equal(detail_n, detail_1, check_exact=True)
+    pd.testing.assert_frame_equal(ringkas_n, ringkas_1, check_exact=True)
@@ -0,0 +1,71 @@
+"""
+CLI prediksi batch (src.cli): stdout hanya berisi hasil, kode keluar sesuai
+dokumentasi, dan ringkasan waktu memisahkan tahap fitur.
+"""
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import cli
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPEL = ROOT / "tests" / "fixtures" / "permohonan_sampel.csv"
+
+
+@pytest.fixture
+def data_pendek(tmp_path):
+    """Sekitar sebulan data: df_harian-nya hanya beberapa hari, kurang untuk lag 30."""
+    path = tmp_path / "pendek.csv"
+    path.write_text("".join(SAMPEL.read_text(encoding="utf-8").splitlines(keepends=True)[:330]), encoding="utf-8")
+    return path
+
+
+def jalankan(capsys, *argv):
+    kode = cli.main(["--model-dir", str(ROOT / "models"), *argv])
+    keluaran = capsys.readouterr()
+    return kode, keluaran.out, keluaran.err
+
+
+def test_stdout_hanya_berisi_hasil(capsys):
+    kode, out, err = jalankan(capsys, "--data", str(SAMPEL), "--output", "-", "--horizon", "3")
+    assert kode == cli.EXIT_OK
+    hasil = pd.read_csv(io.StringIO(out))
+    assert list(hasil.columns) == ["tanggal", "jumlah_permohonan_prediksi", "versi_model"]
+    assert len(hasil) == 3
+    assert "⏱️" in err
+
+
+def test_data_kurang_tidak_mengotori_stdout(capsys, data_pendek):
+    kode, out, err = jalankan(capsys, "--data", str(data_pendek), "--output", "-", "--no-cache")
+    assert kode == cli.EXIT_DATA_KURANG
+    assert out == ""
+    assert "Data belum cukup" in err
+
+
+def test_file_model_hilang(capsys, tmp_path):
+    # --model-dir terakhir yang berlaku: folder kosong tanpa svr_model.pkl
+    kode, out, err = jalankan(capsys, "--data", str(SAMPEL), "--output", "-", "--model-dir", str(tmp_path))
+    assert kode == cli.EXIT_MODEL
+    assert out == ""
+    assert "File model tidak ditemukan" in err
+
+
+def test_timing_log_gagal_ditulis(capsys, tmp_path):
+    bukan_folder = tmp_path / "berkas"
+    bukan_folder.write_text("")
+    kode, _, err = jalankan(capsys, "--data", str(SAMPEL), "--output", str(tmp_path / "hasil.csv"),
+                            "--timing-log", str(bukan_folder / "waktu.jsonl"))
+    assert kode == cli.EXIT_OUTPUT
+    assert "timing log" in err
+
+
+def test_tahap_fitur_dicatat_terpisah(capsys, tmp_path):
+    log = tmp_path / "waktu.jsonl"
+    kode, _, _ = jalankan(capsys, "--data", str(SAMPEL), "--output", str(tmp_path / "hasil.csv"), "--no-cache",
+                          "--timing-log", str(log))
+    assert kode == cli.EXIT_OK
+    tahap = json.loads(log.read_text(encoding="utf-8"))["tahap_ms"]
+    assert {"data", "fitur", "model", "prediksi", "output"} <= set(tahap)
@@ -0,0 +1,100 @@
+"""
+Paritas FeatureEngine dan prediksi rekursif terhadap keluaran kode baseline
+yang dibekukan di tests/fixtures (dibuat ulang dengan
+`python -m tests.fixtures.buat_acuan`).
+
+Kalender libur baseline ikut dibekukan (holidays.Indonesia untuk
+preprocessing, daftar tanggal tetap untuk buat_fitur), sehingga tes ini hanya
+menguji rumus fitur & loop prediksi; perubahan kalender (src.kalender) di luar
+cakupannya.
+"""
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import prediction, preprocessing
+from src.features import SPEC, FeatureEngine
+from src.kalender import ke_nomor_hari
+from src.prediction import FEATURES
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURE = ROOT / "tests" / "fixtures"
+# Daftar hari libur yang tertulis langsung di buat_fitur baseline
+LIBUR_BUAT_FITUR = ["2025-01-01", "2025-05-01", "2025-08-17", "2025-12-25"]
+
+
+def baca_acuan(nama):
+    return pd.read_csv(FIXTURE / nama, parse_dates=["tanggal"])
+
+
+def sama(hasil, acuan, rtol=1e-12):
+    """Nilai sama per kolom (NaN di posisi yang sama); dtype boleh berbeda."""
+    assert list(hasil.columns) == list(acuan.columns)
+    for kolom in acuan.columns:
+        if kolom == "tanggal":
+            assert (hasil[kolom].to_numpy() == acuan[kolom].to_numpy()).all()
+        else:
+            np.testing.assert_allclose(hasil[kolom].to_numpy(np.float64), acuan[kolom].to_numpy(np.float64),
+                                       rtol=rtol, atol=0, equal_nan=True, err_msg=kolom)
+
+
+@pytest.fixture
+def libur_baseline(monkeypatch):
+    libur = ke_nomor_hari(baca_acuan("libur_baseline.csv")["tanggal"])
+    monkeypatch.setattr(preprocessing, "hari_libur", lambda *args, **kwargs: libur)
+    return libur
+
+
+@pytest.mark.parametrize("chunksize", [None, 250])
+def test_df_harian_sama_dengan_baseline(libur_baseline, chunksize):
+    hasil = preprocessing.load_and_prepare_data(str(FIXTURE / "permohonan_sampel.csv"), use_cache=False,
+                                                chunksize=chunksize)
+    # Fitur df_harian disimpan float32 (skema ringkas), jadi toleransinya presisi float32
+    sama(hasil, baca_acuan("df_harian_baseline.csv"), rtol=1e-6)
+
+
+def test_batch_sama_dengan_buat_fitur_baseline():
+    acuan = baca_acuan("buat_fitur_baseline.csv")
+    engine = FeatureEngine(SPEC, hari_libur=LIBUR_BUAT_FITUR)
+    assert engine.kolom == FEATURES
+
+    X = engine.batch(acuan["jumlah_permohonan"], acuan["tanggal"], rolling_shift=0, dtype=np.float64)
+    assert X.flags["C_CONTIGUOUS"]
+    sama(pd.DataFrame(X, columns=FEATURES), acuan[FEATURES])
+
+
+def test_langkah_berikut_dan_online_sama_dengan_baris_prediksi_baseline():
+    # Baris terakhir acuan adalah hari prediksi yang di-ffill, seperti predict_future lama
+    acuan = baca_acuan("buat_fitur_baseline.csv")
+    engine = FeatureEngine(SPEC, hari_libur=LIBUR_BUAT_FITUR)
+    riwayat = acuan["jumlah_permohonan"].to_numpy(np.float64)[:-1]
+    besok = acuan["tanggal"].iloc[-1]
+    ref = acuan[FEATURES].iloc[-1].to_numpy(np.float64)
+
+    np.testing.assert_allclose(engine.online(riwayat).fitur(besok), ref, rtol=1e-12)
+    np.testing.assert_allclose(engine.langkah_berikut(riwayat[None, :], len(riwayat) - 1, [besok])[0], ref,
+                               rtol=1e-12)
+
+
+def test_prediksi_rekursif_sama_dengan_predict_future_baseline(monkeypatch):
+    # Model SVR & scaler di models/ masih sama dengan yang dipakai saat fixture dibuat
+    model, scaler_x, scaler_y = (joblib.load(ROOT / "models" / f"{n}.pkl") for n in ("svr_model", "scaler_x", "scaler_y"))
+    monkeypatch.setattr(prediction, "ENGINE", FeatureEngine(SPEC, hari_libur=LIBUR_BUAT_FITUR))
+    acuan = baca_acuan("prediksi_baseline.csv")
+    df_harian = baca_acuan("df_harian_baseline.csv")
+
+    hasil = prediction.prediksi_rekursif(model, scaler_x, scaler_y, df_harian["jumlah_permohonan"].to_numpy(float),
+                                         df_harian["tanggal"].max(), n_forecast=len(acuan))
+    sama(pd.DataFrame(hasil, columns=acuan.columns), acuan, rtol=1e-9)
+
+
+@pytest.mark.parametrize("n", [0, 5, 10, 25])
+def test_batch_deret_lebih_pendek_dari_lag_sama_dengan_baseline(n):
+    # Baseline (shift/rolling pandas) memberi NaN, bukan error, untuk deret pendek
+    acuan = baca_acuan("buat_fitur_baseline.csv")
+    engine = FeatureEngine(SPEC, hari_libur=LIBUR_BUAT_FITUR)
+    X = engine.batch(acuan["jumlah_permohonan"][:n], acuan["tanggal"][:n], rolling_shift=0, dtype=np.float64)
+    sama(pd.DataFrame(X, columns=FEATURES), acuan[FEATURES][:n].reset_index(drop=True))
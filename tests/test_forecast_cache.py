@@ -0,0 +1,102 @@
+"""
+Cache prediksi UI (src.forecast_cache): horizon pendek dilayani dari prefix
+horizon penuh, dan job ID prediksi.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import cache, forecast_cache
+from src.model_registry import ARTEFAK, ModelRegistry, get_registry
+from src.prediction import prediksi_rekursif
+from src.preprocessing import load_and_prepare_data
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPEL = ROOT / "tests" / "fixtures" / "permohonan_sampel.csv"
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """Salinan models/ di folder sendiri, jadi registry-nya baru dan belum memuat apa pun."""
+    folder = tmp_path / "models"
+    folder.mkdir()
+    for nama in ARTEFAK.values():
+        shutil.copy2(ROOT / "models" / nama, folder / nama)
+    return folder
+
+
+@pytest.fixture(scope="module")
+def df_harian():
+    return load_and_prepare_data(str(SAMPEL), use_cache=False)
+
+
+def test_id_job_tidak_memuat_model(model_dir, df_harian, monkeypatch):
+    def jangan_muat(self, versi):
+        raise AssertionError("id_job_prediksi memuat model di thread script")
+
+    monkeypatch.setattr(ModelRegistry, "_muat", jangan_muat)
+    forecast_cache.id_job_prediksi(df_harian, 7, model_dir)
+    assert get_registry(model_dir)._bundle is None
+
+
+def test_id_job_berubah_saat_file_model_diganti(model_dir, df_harian):
+    awal = forecast_cache.id_job_prediksi(df_harian, 7, model_dir)
+    assert forecast_cache.id_job_prediksi(df_harian, 7, model_dir) == awal
+    assert forecast_cache.id_job_prediksi(df_harian, 3, model_dir) != awal
+
+    path = model_dir / ARTEFAK["model"]
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert forecast_cache.id_job_prediksi(df_harian, 7, model_dir) != awal
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Cache disk kosong khusus tes ini (CLI & tes lain bisa sudah menyimpan prediksi sampel)."""
+    folder = tmp_path / "cache"
+    monkeypatch.setattr(cache, "CACHE_DIR", folder)
+    return folder
+
+
+def test_horizon_pendek_diambil_dari_prefix(model_dir, df_harian, cache_dir):
+    fc = forecast_cache.ForecastCache(model_dir=model_dir)
+    penuh = fc.get(df_harian, forecast_cache.MAX_HORIZON)
+    assert (fc.hits, fc.misses) == (0, 1)
+
+    for n in (3, 1, forecast_cache.MAX_HORIZON):
+        hasil = fc.get(df_harian, n)
+        pd.testing.assert_frame_equal(hasil, penuh.head(n))
+        assert hasil.attrs["versi_model"] == penuh.attrs["versi_model"]
+    assert (fc.hits, fc.misses) == (3, 1)
+
+    # Prefix sama dengan prediksi langsung untuk horizon itu
+    bundle = get_registry(model_dir).get()
+    langsung = prediksi_rekursif(bundle.model, bundle.scaler_x, bundle.scaler_y,
+                                 df_harian["jumlah_permohonan"].to_numpy(float), df_harian["tanggal"].max(), 3)
+    np.testing.assert_allclose(fc.get(df_harian, 3)["jumlah_permohonan_prediksi"], [p for _, p in langsung])
+
+
+def test_horizon_pendek_pertama_tetap_mengisi_horizon_penuh(model_dir, df_harian, cache_dir):
+    fc = forecast_cache.ForecastCache(model_dir=model_dir)
+    assert len(fc.get(df_harian, 2)) == 2
+    assert len(fc.get(df_harian, forecast_cache.MAX_HORIZON)) == forecast_cache.MAX_HORIZON
+    assert (fc.hits, fc.misses) == (1, 1)
+
+    # Proses baru (instance baru) membaca entri yang sama dari disk
+    lain = forecast_cache.ForecastCache(model_dir=model_dir)
+    lain.get(df_harian, 5)
+    assert (lain.hits, lain.misses) == (1, 0)
+
+
+def test_hasil_tidak_mengubah_isi_cache(model_dir, df_harian, cache_dir):
+    fc = forecast_cache.ForecastCache(persist=False, model_dir=model_dir)
+    hasil = fc.get(df_harian, 3)
+    awal = hasil["jumlah_permohonan_prediksi"].to_numpy().copy()
+    hasil["jumlah_permohonan_prediksi"] = -1.0
+    np.testing.assert_array_equal(fc.get(df_harian, 3)["jumlah_permohonan_prediksi"], awal)
+    with pytest.raises(ValueError):
+        fc.get(df_harian, forecast_cache.MAX_HORIZON + 1)
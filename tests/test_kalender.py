@@ -0,0 +1,71 @@
+"""
+Indeks hari libur (src.kalender) dan flag is_holiday di FeatureEngine: cuti
+bersama ikut terhitung, batas rentang tahun, lookup searchsorted, dan
+perluasan indeks untuk horizon di luar rentang default.
+"""
+import numpy as np
+import pandas as pd
+
+from src import prediction
+from src.features import SPEC, FeatureEngine
+from src.kalender import TAHUN_AKHIR, TAHUN_AWAL, hari_libur, is_libur, ke_nomor_hari
+
+
+def libur_pada(tanggal, libur):
+    return is_libur(ke_nomor_hari(tanggal), libur).tolist()
+
+
+def kolom_libur(engine, tanggal):
+    kolom = engine.spec["kalender"] + engine.spec["flags"]
+    return engine.kalender(pd.to_datetime(tanggal))[:, kolom.index("is_holiday")].tolist()
+
+
+def test_cuti_bersama_termasuk_libur():
+    libur = hari_libur(2025, 2025)
+    # 2025-12-26 & 2025-04-02: cuti bersama (kategori "government"), bukan libur nasional
+    assert libur_pada(["2025-12-26", "2025-04-02", "2025-12-25", "2025-12-24"], libur) == [True, True, True, False]
+
+
+def test_batas_rentang_tahun():
+    libur = hari_libur(2020, 2021)
+    assert libur_pada(["2020-01-01", "2021-12-25"], libur) == [True, True]
+    assert libur_pada(["2019-12-25", "2022-01-01"], libur) == [False, False]
+
+
+def test_penutupan_lokal(tmp_path):
+    lokal = tmp_path / "libur_lokal.csv"
+    lokal.write_text("tanggal,keterangan\n2025-07-14,Penutupan kantor\n", encoding="utf-8")
+    assert libur_pada(["2025-07-14"], hari_libur(2025, 2025, libur_lokal=lokal)) == [True]
+    assert libur_pada(["2025-07-14"], hari_libur(2025, 2025, libur_lokal=None)) == [False]
+
+
+def test_lookup_searchsorted():
+    libur = np.array([10, 20, 30], dtype=np.int64)
+    # Sebelum elemen pertama, tepat di elemen, di sela, dan setelah elemen terakhir
+    hasil = is_libur(np.array([5, 10, 15, 20, 30, 31]), libur)
+    assert hasil.tolist() == [False, True, False, True, True, False]
+    assert is_libur(np.array([10, 20]), np.array([], dtype=np.int64)).tolist() == [False, False]
+
+
+def test_engine_memperluas_indeks_di_luar_rentang():
+    engine = FeatureEngine(SPEC, hari_libur=hari_libur(2020, 2021), rentang_libur=(2020, 2021))
+    assert kolom_libur(engine, ["2040-08-17", "2040-08-16"]) == [1, 0]
+    assert engine.rentang_libur == (2020, 2040)
+    assert kolom_libur(engine, ["2010-01-01"]) == [1]
+    assert engine.rentang_libur == (2010, 2040)
+
+
+def test_engine_tanpa_rentang_memakai_daftar_apa_adanya():
+    engine = FeatureEngine(SPEC, hari_libur=["2025-08-17"])
+    assert kolom_libur(engine, ["2025-08-17", "2040-08-17"]) == [1, 0]
+    assert engine.rentang_libur is None
+
+
+def test_prediksi_melewati_tahun_akhir_tetap_mengenali_libur():
+    assert prediction.ENGINE.rentang_libur[1] >= TAHUN_AKHIR
+    # Salinan konfigurasi ENGINE agar perluasan rentang tidak terbawa ke tes lain
+    engine = FeatureEngine(SPEC, hari_libur=prediction.HARI_LIBUR, rentang_libur=(TAHUN_AWAL, TAHUN_AKHIR))
+    besok = pd.Timestamp(f"{TAHUN_AKHIR + 1}-01-01")
+    fitur = engine.online(np.ones(engine.kapasitas)).fitur(besok)
+    assert fitur[prediction.FEATURES.index("is_holiday")] == 1
+    assert engine.rentang_libur == (TAHUN_AWAL, TAHUN_AKHIR + 1)
@@ -0,0 +1,71 @@
+"""
+Registry model (src.model_registry): bundel dipakai bersama selama file tidak
+berubah, dan dimuat ulang tanpa restart saat file model diganti.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import joblib
+import pytest
+
+from src.model_registry import ARTEFAK, ModelRegistry
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    for nama in ARTEFAK.values():
+        shutil.copy2(ROOT / "models" / nama, tmp_path / nama)
+    registry = ModelRegistry(tmp_path)
+
+    # Catat tiap pemuatan bundel
+    registry.dimuat = []
+    asli = registry._muat
+
+    def muat(versi):
+        registry.dimuat.append(versi)
+        return asli(versi)
+
+    monkeypatch.setattr(registry, "_muat", muat)
+    return registry
+
+
+def ganti_file(path, objek):
+    """Tulis file baru lalu tukar atomik, seperti deploy model."""
+    tmp = path.with_suffix(".tmp")
+    joblib.dump(objek, tmp)
+    os.replace(tmp, path)
+
+
+def test_bundel_dipakai_bersama_selama_file_sama(registry):
+    awal = registry.get()
+    assert registry.get() is awal
+    assert len(registry.dimuat) == 1
+
+
+def test_mtime_berubah_tanpa_isi_berubah_tidak_memuat_ulang(registry):
+    awal = registry.get()
+    path = registry.model_dir / ARTEFAK["model"]
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert registry.get() is awal
+    assert len(registry.dimuat) == 1
+
+
+def test_file_model_diganti_dimuat_ulang(registry):
+    awal = registry.get()
+    path = registry.model_dir / ARTEFAK["model"]
+    epsilon_awal = awal.model.epsilon
+    model = joblib.load(path)
+    model.epsilon = epsilon_awal * 2
+    ganti_file(path, model)
+
+    baru = registry.get()
+    assert baru.versi != awal.versi
+    assert baru.model.epsilon == epsilon_awal * 2
+    assert registry.dimuat == [awal.versi, baru.versi]
+    # Bundel lama tidak diubah di tempat: pemanggil yang masih memegangnya aman
+    assert awal.model.epsilon == epsilon_awal
+    assert registry.get() is baru
@@ -0,0 +1,65 @@
+"""
+Prediksi per jenis layanan (src.multiseries): hasil tidak negatif, tanggal &
+id layanan sejajar dengan riwayat tiap deret, dan sama untuk n_jobs berapa pun.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model_registry import get_registry
+from src.multiseries import SUMBER_FALLBACK, SUMBER_MODEL, predict_future_per_layanan
+from src.prediction import ENGINE, prediksi_rekursif_batch
+from src.preprocessing import load_and_prepare_data_per_layanan
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPEL = ROOT / "tests" / "fixtures" / "permohonan_sampel.csv"
+MODEL_ROOT = ROOT / "models"
+# Cukup panjang sehingga SVR per layanan pada sampel sempat memberi nilai < 0 sebelum dipotong
+HORIZON = 30
+
+
+@pytest.fixture(scope="module")
+def df_layanan():
+    return load_and_prepare_data_per_layanan(str(SAMPEL), use_cache=False)
+
+
+def test_prediksi_tidak_negatif(df_layanan):
+    hasil = predict_future_per_layanan(df_layanan, HORIZON, n_jobs=1, model_root=MODEL_ROOT)
+    assert (hasil["sumber"] == SUMBER_MODEL).all()
+    assert (hasil["jumlah_permohonan_prediksi"] >= 0).all()
+
+
+def test_tanggal_dan_layanan_sejajar(df_layanan):
+    # Layanan 2 berhenti 3 hari lebih awal: prediksinya mulai 3 hari lebih awal juga
+    terakhir = df_layanan["tanggal"].max()
+    df = df_layanan[(df_layanan["id_jenis_layanan"] != 2) | (df_layanan["tanggal"] <= terakhir - pd.Timedelta(days=3))]
+    hasil = predict_future_per_layanan(df, HORIZON, n_jobs=1, model_root=MODEL_ROOT)
+
+    assert hasil.equals(hasil.sort_values(["tanggal", "id_jenis_layanan"]).reset_index(drop=True))
+    for id_layanan, grup in hasil.groupby("id_jenis_layanan"):
+        ekor = df[df["id_jenis_layanan"] == id_layanan].sort_values("tanggal").tail(ENGINE.kapasitas)
+        awal = ekor["tanggal"].max() + pd.Timedelta(days=1)
+        assert grup["tanggal"].tolist() == list(pd.date_range(awal, periods=HORIZON))
+
+        # Nilai baris layanan ini = prediksi deret itu sendiri dengan modelnya sendiri
+        bundle = get_registry(MODEL_ROOT / "layanan" / str(id_layanan)).get()
+        acuan = prediksi_rekursif_batch(bundle, ekor["jumlah_permohonan"].to_numpy(float)[None, :],
+                                        ekor["tanggal"].to_numpy()[-1:], HORIZON)[0]
+        np.testing.assert_allclose(grup["jumlah_permohonan_prediksi"], np.maximum(acuan, 0))
+        assert (grup["versi_model"] == bundle.versi).all()
+
+
+def test_n_jobs_tidak_mengubah_hasil(df_layanan):
+    satu = predict_future_per_layanan(df_layanan, HORIZON, n_jobs=1, model_root=MODEL_ROOT, ukuran_grup=1)
+    banyak = predict_future_per_layanan(df_layanan, HORIZON, n_jobs=2, model_root=MODEL_ROOT, ukuran_grup=1)
+    pd.testing.assert_frame_equal(banyak, satu, check_exact=True)
+
+
+def test_layanan_tanpa_model_memakai_fallback(df_layanan, tmp_path):
+    hasil = predict_future_per_layanan(df_layanan, 7, n_jobs=1, model_root=tmp_path)
+    assert (hasil["sumber"] == SUMBER_FALLBACK).all()
+    assert hasil["versi_model"].isna().all()
+    with pytest.raises(FileNotFoundError):
+        predict_future_per_layanan(df_layanan, 7, n_jobs=1, model_root=tmp_path, fallback=False)
@@ -0,0 +1,59 @@
+"""
+Cache disk df_harian (src.preprocessing): hasil dibaca ulang dari Parquet
+selama data & FITUR_VERSION sama, dan dibangun ulang bila salah satunya berubah.
+"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import preprocessing
+
+SAMPEL = Path(__file__).parent / "fixtures" / "permohonan_sampel.csv"
+
+
+@pytest.fixture
+def hitung_build(monkeypatch):
+    """Daftar pemanggilan _build_df_harian (satu entri per cache miss)."""
+    panggilan = []
+    asli = preprocessing._build_df_harian
+
+    def build(file_path, *args, **kwargs):
+        panggilan.append(file_path)
+        return asli(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(preprocessing, "_build_df_harian", build)
+    return panggilan
+
+
+@pytest.fixture
+def data(tmp_path):
+    path = tmp_path / "permohonan.csv"
+    path.write_bytes(SAMPEL.read_bytes())
+    return path
+
+
+def test_cache_dipakai_selama_data_sama(data, hitung_build):
+    awal = preprocessing.load_and_prepare_data(str(data))
+    lagi = preprocessing.load_and_prepare_data(str(data))
+    assert len(hitung_build) == 1
+    pd.testing.assert_frame_equal(lagi, awal)
+
+
+def test_cache_invalid_saat_data_berubah(data, hitung_build):
+    awal = preprocessing.load_and_prepare_data(str(data))
+    baris = SAMPEL.read_text(encoding="utf-8").splitlines(keepends=True)
+    data.write_text("".join(baris[:-200]), encoding="utf-8")
+
+    baru = preprocessing.load_and_prepare_data(str(data))
+    assert len(hitung_build) == 2
+    assert baru["jumlah_permohonan"].sum() < awal["jumlah_permohonan"].sum()
+    pd.testing.assert_frame_equal(baru, preprocessing.load_and_prepare_data(str(data), use_cache=False))
+
+
+def test_cache_invalid_saat_fitur_version_berubah(data, hitung_build, monkeypatch):
+    preprocessing.load_and_prepare_data(str(data))
+    monkeypatch.setattr(preprocessing, "FITUR_VERSION", preprocessing.FITUR_VERSION + "-tes")
+    preprocessing.load_and_prepare_data(str(data))
+    preprocessing.load_and_prepare_data(str(data))
+    assert len(hitung_build) == 2
@@ -0,0 +1,149 @@
+"""
+Analisis sentimen batch (src.sentiment) dengan model mini dari conftest:
+paritas dengan jalur per baris, penanganan batch yang gagal, dan mode
+streaming CSV beserta checkpoint-nya.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sentiment import (PRED_ERROR, analisis_csv_streaming, label_teks, muat_model, prediksi_batch,
+                           prediksi_teks)
+from src.sentiment_cache import SentimenCache, normalisasi
+
+TEKS = ["Pelayanan sangat bagus", "petugas ramah", "antri lama sekali", "tidak puas", "cepat"]
+
+
+@pytest.fixture(scope="module")
+def model(model_nlp):
+    return muat_model(model_nlp, "torch")
+
+
+class GagalSaatBatch:
+    """Model yang menolak batch > 1 baris, agar jalur ulang per baris terpakai."""
+
+    def __init__(self, model):
+        self.model = model
+        self.config = model.config
+
+    def __call__(self, **inputs):
+        if inputs["input_ids"].shape[0] > 1:
+            raise RuntimeError("batch gagal")
+        return self.model(**inputs)
+
+
+def test_ulang_per_baris_mengisi_probs_dan_cache(model, tmp_path):
+    tokenizer, asli = model
+    cache = SentimenCache("model-mini", path=tmp_path / "sentimen.sqlite")
+
+    hasil = prediksi_batch(tokenizer, GagalSaatBatch(asli), TEKS, batch_size=4, cache=cache)
+    assert (hasil.pred != PRED_ERROR).all()
+    assert np.isfinite(hasil.probs).all()
+    np.testing.assert_array_equal(hasil.pred, hasil.probs.argmax(axis=1))
+
+    acuan = prediksi_batch(tokenizer, asli, TEKS, batch_size=4)
+    np.testing.assert_array_equal(hasil.pred, acuan.pred)
+    np.testing.assert_allclose(hasil.probs, acuan.probs, atol=1e-5)
+
+    dari_cache = prediksi_batch(tokenizer, asli, TEKS, cache=cache)
+    assert dari_cache.n_cache == len(TEKS)
+    assert np.isfinite(dari_cache.probs).all()
+
+
+def test_baris_gagal_tidak_disimpan_ke_cache(model, tmp_path):
+    tokenizer, asli = model
+    cache = SentimenCache("model-mini", path=tmp_path / "sentimen.sqlite")
+
+    class SelaluGagal(GagalSaatBatch):
+        def __call__(self, **inputs):
+            raise RuntimeError("model rusak")
+
+    hasil = prediksi_batch(tokenizer, SelaluGagal(asli), TEKS, cache=cache)
+    assert (hasil.pred == PRED_ERROR).all()
+    assert cache.ambil([normalisasi(t) for t in TEKS]) == {}
+
+
+# Panjang beragam, duplikat (beda huruf/spasi) dan teks kosong: menguji bucket, dedup & urutan baris
+TEKS_CAMPUR = [
+    "cepat", "Pelayanan   sangat bagus dan petugas ramah sekali", "", "tidak puas, antri lama",
+    "CEPAT", "petugas ramah", "pelayanan lambat buruk kecewa tidak puas antri lama sekali sekali", "cepat ",
+    "oke", "pelayanan sangat bagus dan petugas ramah sekali",
+]
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 32])
+def test_batch_sama_dengan_jalur_per_baris(model, batch_size):
+    tokenizer, asli = model
+    progres = []
+    hasil = prediksi_batch(tokenizer, asli, TEKS_CAMPUR, batch_size=batch_size,
+                           progress=lambda selesai, total: progres.append((selesai, total)))
+
+    per_baris = [prediksi_teks(tokenizer, asli, t) for t in TEKS_CAMPUR]
+    assert len(set(per_baris)) > 1  # model mini harus membedakan teks agar paritas bermakna
+    assert hasil.pred.tolist() == per_baris
+    assert hasil.n_unik == 7
+    assert progres[-1] == (7, 7)
+    # Baris duplikat mendapat hasil yang persis sama
+    np.testing.assert_array_equal(hasil.probs[0], hasil.probs[4])
+    np.testing.assert_array_equal(hasil.probs[1], hasil.probs[9])
+    np.testing.assert_allclose(hasil.probs.sum(axis=1), 1, rtol=1e-5)
+
+
+@pytest.fixture
+def csv_ulasan(tmp_path):
+    # Kolom lain berisi nilai yang akan berubah bila dibaca dengan konversi NaN/angka
+    baris = [{"id": f"{i:03d}", "catatan": "NA" if i % 4 == 0 else "", "ulasan": TEKS_CAMPUR[i % len(TEKS_CAMPUR)]}
+             for i in range(23)]
+    path = tmp_path / "ulasan.csv"
+    pd.DataFrame(baris).to_csv(path, index=False)
+    return path
+
+
+def analisis(model, sumber, output, **kwargs):
+    tokenizer, asli = model
+    return analisis_csv_streaming(tokenizer, asli, sumber, "ulasan", output, chunksize=5, batch_size=4, **kwargs)
+
+
+def test_streaming_sama_dengan_analisis_sekaligus(model, csv_ulasan, tmp_path):
+    hasil = analisis(model, csv_ulasan, tmp_path / "hasil.csv")
+    assert hasil["baris"] == 23 and hasil["selesai"]
+
+    keluaran = pd.read_csv(tmp_path / "hasil.csv", dtype=str, keep_default_na=False)
+    asal = pd.read_csv(csv_ulasan, dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(keluaran.drop(columns="Sentimen"), asal)
+    tokenizer, asli = model
+    sekaligus = label_teks(prediksi_batch(tokenizer, asli, asal["ulasan"].tolist()).pred)
+    assert keluaran["Sentimen"].tolist() == sekaligus.tolist()
+    assert hasil["distribusi"] == keluaran["Sentimen"].value_counts().to_dict()
+
+
+def test_checkpoint_melanjutkan_setelah_dibatalkan(model, csv_ulasan, tmp_path):
+    acuan = tmp_path / "acuan.csv"
+    analisis(model, csv_ulasan, acuan)
+
+    output, checkpoint = tmp_path / "hasil.csv", tmp_path / "checkpoint.json"
+    dicek = []
+    sebagian = analisis(model, csv_ulasan, output, checkpoint_path=checkpoint,
+                        batal=lambda: dicek.append(1) or len(dicek) > 2)
+    assert not sebagian["selesai"] and sebagian["baris"] == 10
+
+    # Sisa tulisan chunk yang belum tercatat di checkpoint (mis. proses mati) harus dibuang
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("999,,setengah baris")
+
+    lanjut = analisis(model, csv_ulasan, output, checkpoint_path=checkpoint)
+    assert lanjut["selesai"] and lanjut["baris"] == 23
+    assert output.read_bytes() == acuan.read_bytes()
+    assert sum(lanjut["distribusi"].values()) == 23
+
+
+def test_checkpoint_tidak_cocok_mulai_dari_awal(model, csv_ulasan, tmp_path):
+    output, checkpoint = tmp_path / "hasil.csv", tmp_path / "checkpoint.json"
+    dicek = []
+    analisis(model, csv_ulasan, output, checkpoint_path=checkpoint, batal=lambda: dicek.append(1) or len(dicek) > 1)
+
+    tokenizer, asli = model
+    ulang = analisis_csv_streaming(tokenizer, asli, csv_ulasan, "ulasan", output, chunksize=7,
+                                   checkpoint_path=checkpoint)
+    assert ulang["baris"] == 23
+    assert len(pd.read_csv(output, dtype=str, keep_default_na=False)) == 23